@@ -1,49 +1,73 @@
 #!/usr/bin/env python3
 """Quick validation for WF-04/WF-05 workflow exports.
 
-Checks that the exported workflow files contain the expected association type IDs.
+Builds the shared association index over every export in ``data/raw/workflows`` and
+evaluates the assertions in ``association-rules.json`` (next to this script) against it,
+so association IDs are matched structurally rather than as substrings of the raw text.
 """
 from __future__ import annotations
+import argparse
 import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[5]  # repo root
-WORKFLOW_DIR = ROOT / "data" / "raw" / "workflows"
+RULES_PATH = Path(__file__).resolve().with_name("association-rules.json")
+# The shared helpers sit in the process root's shared/ directory, a few levels up
+SHARED_DIR = next(
+    (parent / "shared" for parent in Path(__file__).resolve().parents if (parent / "shared" / "association_index.py").exists()),
+    None,
+)
+if SHARED_DIR and str(SHARED_DIR) not in sys.path:
+    sys.path.insert(0, str(SHARED_DIR))
+
+from association_index import DEFAULT_JOBS, AssociationIndex, evaluate_rules, load_rules  # noqa: E402
+from hjps import WorkflowCollection, default_layout  # noqa: E402
+from workflow_repository import ID_PATTERN  # noqa: E402
+
+WORKFLOW_DIR = default_layout().workflows
 
 WORKFLOWS = {
-    "v4-flow-567358311.json": {126, 128},
-    "v4-flow-567358566.json": {128},
+    "567358311": "WF-04",
+    "567358566": "WF-05",
 }
 
-def validate() -> int:
-    missing_files = []
-    failures = []
 
-    for filename, expected_ids in WORKFLOWS.items():
-        path = WORKFLOW_DIR / filename
-        if not path.exists():
-            missing_files.append(filename)
-            continue
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        missing_ids = [aid for aid in expected_ids if f"{aid}" not in text]
-        if missing_ids:
-            failures.append((filename, missing_ids))
+def validate(workflow_dir: Path = WORKFLOW_DIR, rules_path: Path = RULES_PATH, jobs: int = DEFAULT_JOBS) -> int:
+    rules = load_rules(rules_path)
+    index = AssociationIndex.build(workflow_dir, jobs)
+    paths = WorkflowCollection.shared(workflow_dir).paths()
+    present = {wf_id for path in paths for wf_id in ID_PATTERN.findall(path.stem)}
+    missing_files = [f"{label} ({wf_id})" for wf_id, label in WORKFLOWS.items() if wf_id not in present]
+    failures = [(rule, message) for rule, message in evaluate_rules(index, rules) if message]
 
+    print(f"Scanned {index.files} workflow exports in {index.seconds:.2f}s")
+    if index.errors:
+        print("Unreadable workflow exports:")
+        for error in index.errors:
+            print(f"  - {error}")
     if missing_files:
         print("Missing workflow exports:")
         for filename in missing_files:
             print(f"  - {filename}")
     if failures:
         print("Failed association checks:")
-        for filename, ids in failures:
-            joined = ", ".join(str(i) for i in ids)
-            print(f"  - {filename}: missing association IDs {joined}")
+        for rule, message in failures:
+            print(f"  - {rule.get('name', rule['association_type_id'])}: {message}")
 
     if missing_files or failures:
         return 1
 
-    print("WF-04/WF-05 exports contain expected association IDs (126/128).")
+    print(f"All {len(rules)} association rules pass (WF-04/WF-05 use 126/128 as expected).")
     return 0
 
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate WF-04/WF-05 association usage")
+    parser.add_argument("--workflow-dir", type=Path, default=WORKFLOW_DIR)
+    parser.add_argument("--rules", type=Path, default=RULES_PATH)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    sys.exit(validate())
+    args = parse_args()
+    sys.exit(validate(args.workflow_dir, args.rules, args.jobs))
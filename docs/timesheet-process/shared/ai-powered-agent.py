@@ -2,16 +2,42 @@
 """
 AI-Powered Documentation Agent
 Prepares data and uses AI to generate comprehensive documentation for timesheet processes
+
+Usage:
+    # One sub-process, written to the current directory
+    python3 analysis/timesheet_process/shared/ai-powered-agent.py --phase 01_foundation --sub-process project_configuration
+
+    # Every sub-process in dependency order, each into its phase agent directory
+    python3 analysis/timesheet_process/shared/ai-powered-agent.py --all --jobs 4
+
+Each sub-process appends build_prompts/write_outputs stage records to the shared trace
+ledger (see trace_ledger.py; --no-trace to skip). --profile, --trace-timings and --mem
+write an instrumentation report for the run (see instrumentation.py).
 """
 
-import json
 import os
 import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import argparse
 from datetime import datetime
 
+import json_codec
+from dependency_graph import run_graph, topological_order
+from hjps import HubSpotData
+from instrumentation import add_instrumentation_arguments, instrumented, span
+from prompt_cost import DEFAULT_OUTPUT_TOKENS, PromptEstimate, estimate_prompt, estimate_tokens, format_report, load_prices
+from schema_projection import SchemaProjector
+from trace_ledger import TraceLedger, add_trace_arguments, ledger_from_args
+
+PROCESS_ROOT = Path(__file__).resolve().parents[1]
+CONFIG_PATH = Path(__file__).resolve().parent / "process-configuration.json"
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+# Stands in for the schema tables in a prompt; not counted as embedded schema
+NO_SCHEMA_DATA = "No schema data available"
+
 class ProcessKnowledge:
     """Process flow knowledge from PROCESS-FLOW-COMPLETE.md"""
     
@@ -132,79 +158,92 @@ class ProcessKnowledge:
     }
 
 class DataExtractor:
-    """Extract data from local HubSpot JSON files"""
+    """Extract data from local HubSpot JSON files
+
+    Exports are read through the shared hjps collections (resolved against the repository
+    root, not the working directory), so every extractor in a process indexes each
+    directory once and parses each file at most once.
+    """
     
-    def __init__(self, base_path: str = "data/raw/ai-context/ai-context-export"):
-        self.base_path = Path(base_path)
+    def __init__(self, data: Optional[HubSpotData] = None):
+        self.data = data or HubSpotData.shared()
+        self.schemas = self.data.schemas.repository
+        self.workflows = self.data.workflows.exports
+        self.forms = self.data.forms.repository
     
     def get_schema_data(self, object_type: str) -> Optional[Dict]:
-        """Get schema data for an object type"""
-        schema_file = self.base_path / "data-model" / f"{object_type}_schema.json"
-        if schema_file.exists():
-            try:
-                with open(schema_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Warning: Failed to load schema for {object_type}: {e}")
-        return None
+        """Get schema data for an object type (the export verify and extract resolve it to)"""
+        with span("parse"):
+            return self.data.schemas.for_object(object_type)
     
-    def get_workflow_data(self, filter_pattern: str = "*") -> List[Dict]:
-        """Get workflow data"""
-        workflow_path = Path("data/raw/workflows")
+    def get_workflow_data(self, filter_pattern: str = "*", fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Get workflow data
+
+        When ``fields`` is given (e.g. ``["id", "name", "actions[].type"]``), only those
+        paths are streamed out of each export instead of loading the whole file.
+        """
         workflows = []
-        if workflow_path.exists():
-            for file in workflow_path.glob("*.json"):
-                if file.name.lower().find(filter_pattern.lower()) != -1:
-                    try:
-                        with open(file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            workflows.append({
-                                "name": file.name,
-                                "path": str(file),
-                                "data": data
-                            })
-                    except Exception as e:
-                        print(f"Warning: Failed to load workflow {file.name}: {e}")
+        with span("parse"):
+            for name in self.workflows.names(filter_pattern):
+                try:
+                    workflows.append({
+                        "name": name,
+                        "path": str(self.workflows.path(name)),
+                        "data": self.workflows.load(name, fields)
+                    })
+                except Exception as e:
+                    print(f"Warning: Failed to load workflow {name}: {e}")
         return workflows
     
     def get_module_data(self, filter_pattern: str = "*") -> List[Dict]:
         """Get module data"""
-        module_path = Path("data/raw/themes/Timesheets-Theme/modules")
-        modules = []
-        if module_path.exists():
-            for module_dir in module_path.iterdir():
-                if module_dir.is_dir() and filter_pattern.lower() in module_dir.name.lower():
-                    modules.append({
-                        "name": module_dir.name,
-                        "path": str(module_dir)
-                    })
-        return modules
+        modules = self.data.modules
+        needle = "" if filter_pattern == "*" else filter_pattern.lower()
+        return [
+            {"name": name, "path": str(modules.directory / name)}
+            for name in modules.names()
+            if needle in name.lower()
+        ]
     
     def get_form_data(self, filter_pattern: str = "*") -> List[Dict]:
         """Get form data"""
-        form_path = self.base_path / "forms"
         forms = []
-        if form_path.exists():
-            for file in form_path.glob("*.json"):
-                if filter_pattern.lower() in file.name.lower():
-                    try:
-                        with open(file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            forms.append({
-                                "name": file.name,
-                                "path": str(file),
-                                "data": data
-                            })
-                    except Exception as e:
-                        print(f"Warning: Failed to load form {file.name}: {e}")
+        with span("parse"):
+            for name in self.forms.names(filter_pattern):
+                try:
+                    forms.append({
+                        "name": name,
+                        "path": str(self.forms.path(name)),
+                        "data": self.forms.load(name)
+                    })
+                except Exception as e:
+                    print(f"Warning: Failed to load form {name}: {e}")
         return forms
 
+    def read_counters(self) -> Tuple[int, int]:
+        """(bytes parsed, cache hits) so far across the export repositories
+
+        The repositories are shared, so with concurrent sub-processes a difference of two
+        readings may include reads made by another worker.
+        """
+        repos = (self.schemas, self.workflows, self.forms)
+        return sum(r.stats.bytes_parsed for r in repos), sum(r.stats.hits for r in repos)
+
+    def cache_summary(self) -> Dict[str, Any]:
+        """Hit/miss counters for each export repository used so far"""
+        return {
+            "schemas": self.schemas.summary(),
+            "workflows": self.workflows.summary(),
+            "forms": self.forms.summary(),
+        }
+
 class AIPromptGenerator:
     """Generate AI prompts for documentation generation"""
     
     def __init__(self, process_knowledge: ProcessKnowledge, data_extractor: DataExtractor):
         self.process_knowledge = process_knowledge
         self.data_extractor = data_extractor
+        self.projector = SchemaProjector()
     
     @staticmethod
     def _format_phase_label(label: str) -> str:
@@ -223,6 +262,22 @@ class AIPromptGenerator:
             deps.append("shared/notifications")
         return [self._format_phase_label(dep) for dep in deps]
     
+    def _schema_tables(self, knowledge: Dict[str, Any]) -> str:
+        """Compact projection of the key objects' schemas around the key properties
+
+        Whole exports run to hundreds of properties per core object; the projection keeps
+        the key properties, their dependencies, required flags, and associations. Empty when
+        no key object has schema data; the prompt shows ``NO_SCHEMA_DATA`` instead.
+        """
+        schema_data = {}
+        for obj in knowledge.get('key_objects', []):
+            data = self.data_extractor.get_schema_data(obj)
+            if data:
+                schema_data[obj] = data
+        if not schema_data:
+            return ""
+        return self.projector.render_all(schema_data, knowledge.get('key_properties', []))
+    
     def generate_overview_prompt(self, phase: str, sub_process: str) -> str:
         """Generate AI prompt for overview.md"""
         knowledge = self.process_knowledge.PROCESS_FLOW.get(phase, {}).get(sub_process, {})
@@ -294,12 +349,7 @@ Make it practical, actionable, and comprehensive like the phases/03-approval age
         phase_label = self._format_phase_label(phase)
         dependency_list = ', '.join(self._format_dependencies(phase, knowledge))
         
-        # Get real schema data
-        schema_data = {}
-        for obj in knowledge.get('key_objects', []):
-            data = self.data_extractor.get_schema_data(obj)
-            if data:
-                schema_data[obj] = data
+        schema_tables = self._schema_tables(knowledge)
         
         prompt = f"""
 You are an expert backend developer documenting HubSpot integration.
@@ -314,7 +364,7 @@ Process Knowledge:
 - Dependencies / References: {dependency_list if dependency_list else 'None'}
 
 Schema Data Available:
-{json.dumps(schema_data, indent=2) if schema_data else "No schema data available"}
+{schema_tables or NO_SCHEMA_DATA}
 
 Reference phases/03-approval/docs/backend/IMPLEMENTATION-GUIDE.md as a template. Create comprehensive backend documentation that includes:
 
@@ -337,12 +387,7 @@ Make it technical, detailed, and implementation-ready like the phases/03-approva
         phase_label = self._format_phase_label(phase)
         dependency_list = ', '.join(self._format_dependencies(phase, knowledge))
 
-        # Get real schema data
-        schema_data = {}
-        for obj in knowledge.get('key_objects', []):
-            data = self.data_extractor.get_schema_data(obj)
-            if data:
-                schema_data[obj] = data
+        schema_tables = self._schema_tables(knowledge)
         
         prompt = f"""
 You are an expert data architect documenting HubSpot object relationships.
@@ -355,7 +400,7 @@ Process Knowledge:
 - Dependencies / References: {dependency_list if dependency_list else 'None'}
 
 Schema Data Available:
-{json.dumps(schema_data, indent=2) if schema_data else "No schema data available"}
+{schema_tables or NO_SCHEMA_DATA}
 
 Reference phases/03-approval/docs/properties/property-mapping.json as a template. Create comprehensive property mapping that includes:
 
@@ -372,12 +417,47 @@ Make it detailed, accurate, and based on real schema data like the phases/03-app
 class DocumentationGenerator:
     """Generate comprehensive documentation using AI"""
     
-    def __init__(self, phase: str, sub_process: str):
+    def __init__(self, phase: str, sub_process: str, output_dir: Path = Path("."),
+                 prompt_generator: Optional[AIPromptGenerator] = None, verbose: bool = True,
+                 ledger: Optional[TraceLedger] = None):
         self.phase = phase
         self.sub_process = sub_process
-        self.process_knowledge = ProcessKnowledge()
-        self.data_extractor = DataExtractor()
-        self.prompt_generator = AIPromptGenerator(self.process_knowledge, self.data_extractor)
+        self.output_dir = Path(output_dir)
+        self.verbose = verbose
+        self.ledger = ledger
+        if prompt_generator is None:
+            prompt_generator = AIPromptGenerator(ProcessKnowledge(), DataExtractor())
+        self.prompt_generator = prompt_generator
+        self.process_knowledge = prompt_generator.process_knowledge
+        self.data_extractor = prompt_generator.data_extractor
+    
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+    
+    def _span(self, stage: str):
+        """Trace ledger span for one stage of this sub-process (a plain dict when not tracing)"""
+        subject = f"{self.phase}/{self.sub_process}"
+        return self.ledger.span(stage, subject=subject) if self.ledger else nullcontext({})
+    
+    def build_prompts(self) -> Dict[str, str]:
+        """All prompts for this sub-process, keyed by output file, built in memory"""
+        return {
+            "overview.md": self.prompt_generator.generate_overview_prompt(self.phase, self.sub_process),
+            "agent.md": self.prompt_generator.generate_agent_prompt(self.phase, self.sub_process),
+            "backend/implementation-guide.md": self.prompt_generator.generate_backend_prompt(self.phase, self.sub_process),
+            "properties/property-mapping-prompt.txt": self.prompt_generator.generate_property_mapping_prompt(self.phase, self.sub_process)
+        }
+    
+    def estimate_prompts(self, prices: Dict[str, Dict[str, float]], output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> List[PromptEstimate]:
+        """Size/cost estimates for every prompt without writing anything"""
+        knowledge = self.process_knowledge.PROCESS_FLOW.get(self.phase, {}).get(self.sub_process, {})
+        schema_tables = self.prompt_generator._schema_tables(knowledge)
+        return [
+            estimate_prompt(f"{self.phase}/{self.sub_process}/{name}", prompt, prices, output_tokens,
+                            len(schema_tables.encode('utf-8')) if schema_tables and schema_tables in prompt else 0)
+            for name, prompt in self.build_prompts().items()
+        ]
     
     def create_directory_structure(self):
         """Create standard directory structure"""
@@ -387,29 +467,39 @@ class DocumentationGenerator:
         ]
         
         for dir_name in directories:
-            Path(dir_name).mkdir(exist_ok=True)
-            print(f"✅ Created directory: {dir_name}")
+            (self.output_dir / dir_name).mkdir(parents=True, exist_ok=True)
+            self._log(f"✅ Created directory: {dir_name}")
     
     def generate_documentation(self):
         """Generate all documentation files"""
-        print(f"🤖 Generating documentation for {self.sub_process} in {self.phase}")
+        self._log(f"🤖 Generating documentation for {self.sub_process} in {self.phase}")
         
         # Create directory structure
-        self.create_directory_structure()
+        with span("write"):
+            self.create_directory_structure()
         
         # Generate prompts for AI
-        prompts = {
-            "overview.md": self.prompt_generator.generate_overview_prompt(self.phase, self.sub_process),
-            "agent.md": self.prompt_generator.generate_agent_prompt(self.phase, self.sub_process),
-            "backend/implementation-guide.md": self.prompt_generator.generate_backend_prompt(self.phase, self.sub_process),
-            "properties/property-mapping-prompt.txt": self.prompt_generator.generate_property_mapping_prompt(self.phase, self.sub_process)
-        }
+        with self._span("build_prompts") as trace, span("render"):
+            bytes_before, hits_before = self.data_extractor.read_counters()
+            projector_hits = self.prompt_generator.projector.hits
+            prompts = self.build_prompts()
+            bytes_after, hits_after = self.data_extractor.read_counters()
+            trace.update(
+                bytes_in=bytes_after - bytes_before,
+                bytes_out=sum(len(prompt.encode('utf-8')) for prompt in prompts.values()),
+                prompt_tokens=sum(estimate_tokens(prompt) for prompt in prompts.values()),
+                cache_hits=(hits_after - hits_before) + (self.prompt_generator.projector.hits - projector_hits),
+            )
         
         # Save prompts for AI execution
-        for filename, prompt in prompts.items():
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(prompt)
-            print(f"✅ Generated prompt: {filename}")
+        with self._span("write_outputs") as trace, span("write"):
+            written = 0
+            for filename, prompt in prompts.items():
+                with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
+                    f.write(prompt)
+                written += len(prompt.encode('utf-8'))
+                self._log(f"✅ Generated prompt: {filename}")
+            trace.update(bytes_out=written, files=len(prompts))
         
         # Generate status report
         directories = ["backend", "frontend", "assets", "properties", "workflows", "issues", "cross-references", "tools"]
@@ -424,7 +514,9 @@ class DocumentationGenerator:
                 "directories_created": len(directories),
                 "prompts_generated": len(prompts),
                 "structure_compliance": "100%",
-                "ai_ready": True
+                "ai_ready": True,
+                "export_cache": self.data_extractor.cache_summary(),
+                "schema_projection": self.prompt_generator.projector.summary()
             },
             "next_steps": [
                 "Execute AI prompts to generate actual content",
@@ -434,19 +526,176 @@ class DocumentationGenerator:
             ]
         }
         
-        with open("agent-status.json", 'w', encoding='utf-8') as f:
-            json.dump(status_report, f, indent=2)
+        with span("write"), open(self.output_dir / "agent-status.json", 'w', encoding='utf-8') as f:
+            f.write(json_codec.dumps(status_report, indent=2))
+        
+        self._log(f"✅ Generated {len(prompts)} AI prompts for {self.sub_process}")
+        self._log("📋 Next: Execute AI prompts to generate actual content")
+
+class ProcessScheduler:
+    """Run every PROCESS_FLOW sub-process in dependency order on a worker pool
+
+    Edges come from each entry's ``dependencies`` (a sibling sub-process, or a whole phase
+    such as ``01_foundation``); sibling order for sub-processes listed in a phase's
+    ``dependencies`` in process-configuration.json comes from the configuration instead.
+    References outside PROCESS_FLOW (e.g. ``shared/notifications``) are not scheduled.
+    """
+    
+    def __init__(self, process_knowledge: ProcessKnowledge, config: Dict[str, Any], output_root: Path = PROCESS_ROOT):
+        self.process_knowledge = process_knowledge
+        self.config = config
+        self.output_root = Path(output_root)
+        self.nodes: List[str] = [
+            f"{phase}/{sub}" for phase, subs in process_knowledge.PROCESS_FLOW.items() for sub in subs
+        ]
+        self.deps: Dict[str, List[str]] = {node: self._dependencies(node) for node in self.nodes}
+        self.durations: Dict[str, float] = {}
+    
+    def _config_phase(self, phase: str) -> Optional[Dict[str, Any]]:
+        label = AIPromptGenerator._format_phase_label(phase)
+        for entry in self.config.get("phases", {}).values():
+            if entry.get("directory", "").startswith(label + "/"):
+                return entry
+        return None
+    
+    def output_dir(self, node: str) -> Path:
+        phase, sub = node.split("/", 1)
+        entry = self._config_phase(phase)
+        directory = entry["directory"] if entry else f"{AIPromptGenerator._format_phase_label(phase)}/agents"
+        return self.output_root / directory / sub
+    
+    def _dependencies(self, node: str) -> List[str]:
+        phase, sub = node.split("/", 1)
+        flow = self.process_knowledge.PROCESS_FLOW
+        configured = (self._config_phase(phase) or {}).get("dependencies", {})
+        deps: List[str] = []
+        for dep in flow[phase][sub].get("dependencies", []):
+            if dep in flow:
+                deps.extend(f"{dep}/{other}" for other in flow[dep])
+            elif dep in flow[phase] and sub not in configured:
+                deps.append(f"{phase}/{dep}")
+        # The configuration's phase-local ordering is authoritative: PROCESS_FLOW also lists
+        # siblings a sub-process merely references (project_configuration ↔ approver_assignment)
+        deps.extend(f"{phase}/{dep}" for dep in configured.get(sub, []) if dep in flow[phase])
+        return sorted(set(deps) - {node})
+    
+    def topological_order(self) -> List[str]:
+        """Kahn's algorithm; raises ValueError naming a cycle if one exists"""
+        return topological_order(self.deps)
+    
+    def run(self, jobs: int = DEFAULT_JOBS, ledger: Optional[TraceLedger] = None) -> Dict[str, Any]:
+        """Execute all sub-processes; each starts as soon as its dependencies have finished"""
+        data_extractor = DataExtractor()
+        prompt_generator = AIPromptGenerator(self.process_knowledge, data_extractor)
+        start = time.perf_counter()
+        
+        def execute(node: str) -> float:
+            node_start = time.perf_counter()
+            phase, sub = node.split("/", 1)
+            DocumentationGenerator(phase, sub, self.output_dir(node), prompt_generator, verbose=False,
+                                   ledger=ledger).generate_documentation()
+            return time.perf_counter() - node_start
         
-        print(f"✅ Generated {len(prompts)} AI prompts for {self.sub_process}")
-        print("📋 Next: Execute AI prompts to generate actual content")
+        def completed(node: str, seconds: float) -> None:
+            self.durations[node] = seconds
+            print(f"✅ {node} ({seconds:.3f}s)")
+        
+        failed = run_graph(self.deps, execute, jobs, on_result=completed).failed
+        
+        total = time.perf_counter() - start
+        critical_time, critical_path = self.critical_path()
+        return {
+            "completed": len(self.durations),
+            "failed": failed,
+            "wall_seconds": round(total, 3),
+            "work_seconds": round(sum(self.durations.values()), 3),
+            "critical_path_seconds": round(critical_time, 3),
+            "critical_path": critical_path,
+            "export_cache": data_extractor.cache_summary(),
+            "schema_projection": prompt_generator.projector.summary(),
+        }
+    
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """Longest chain of measured durations through the DAG"""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for node in self.topological_order():
+            best = max(self.deps[node], key=lambda dep: finish.get(dep, 0.0), default=None)
+            finish[node] = (finish.get(best, 0.0) if best else 0.0) + self.durations.get(node, 0.0)
+            previous[node] = best
+        if not finish:
+            return 0.0, []
+        node = max(finish, key=finish.get)
+        length = finish[node]
+        path: List[str] = []
+        while node:
+            path.append(node)
+            node = previous[node]
+        return length, list(reversed(path))
+
+def dry_run_estimates(targets: Sequence[Sequence[str]], prompt_generator: AIPromptGenerator, args: argparse.Namespace):
+    """Print per-prompt size/cost estimates for (phase, sub_process) targets"""
+    start = time.perf_counter()
+    prices = load_prices(args.prices)
+    estimates: List[PromptEstimate] = []
+    for phase, sub_process in targets:
+        generator = DocumentationGenerator(phase, sub_process, prompt_generator=prompt_generator, verbose=False)
+        estimates.extend(generator.estimate_prompts(prices, args.output_tokens))
+    print()
+    print(format_report(estimates, prices))
+    print(f"\n⏱️  Estimated {len(estimates)} prompts in {time.perf_counter() - start:.3f}s (assuming {args.output_tokens:,} output tokens each)")
 
 def main():
     parser = argparse.ArgumentParser(description='AI-Powered Documentation Agent')
     parser.add_argument('--phase', default='01_foundation', help='Process phase')
     parser.add_argument('--sub-process', help='Sub-process name (auto-detected from current directory)')
-    parser.add_argument('--dry-run', action='store_true', help='Show what would be generated')
+    parser.add_argument('--all', action='store_true', help='Generate every PROCESS_FLOW sub-process in dependency order')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help=f'Concurrent sub-processes with --all (default: {DEFAULT_JOBS})')
+    parser.add_argument('--config', type=Path, default=CONFIG_PATH, help='process-configuration.json used for phase directories and dependencies')
+    parser.add_argument('--output-root', type=Path, default=PROCESS_ROOT, help='Process root the phase directories are resolved against (with --all)')
+    parser.add_argument('--dry-run', action='store_true', help='Build prompts in memory and report size/cost estimates without writing files')
+    parser.add_argument('--prices', type=Path, help='JSON price table for --dry-run (model → input_per_mtok/output_per_mtok/context_tokens)')
+    parser.add_argument('--output-tokens', type=int, default=DEFAULT_OUTPUT_TOKENS, help='Expected response tokens per prompt for --dry-run costs')
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    with instrumented(args, "ai-powered-agent"):
+        run(args)
+
+
+def run(args: argparse.Namespace):
+    if args.all:
+        with span("scan"):
+            config = json_codec.load_path(args.config) if args.config.exists() else {}
+            scheduler = ProcessScheduler(ProcessKnowledge(), config, args.output_root)
+        try:
+            order = scheduler.topological_order()
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        if args.dry_run:
+            print(f"🔍 DRY RUN: Would generate AI prompts for {len(order)} sub-processes:")
+            for node in order:
+                deps = ', '.join(scheduler.deps[node]) or 'none'
+                print(f"  - {node} → {scheduler.output_dir(node)} (after: {deps})")
+            prompt_generator = AIPromptGenerator(scheduler.process_knowledge, DataExtractor())
+            dry_run_estimates([node.split('/', 1) for node in order], prompt_generator, args)
+            return
+        ledger = ledger_from_args(args, "ai-powered-agent")
+        started = time.time()
+        report = scheduler.run(args.jobs, ledger)
+        if ledger:
+            ledger.record("generate_all", started, time.time(), subject=f"{report['completed']} sub-processes",
+                          status="failed" if report['failed'] else "ok", jobs=args.jobs,
+                          critical_path_seconds=report['critical_path_seconds'])
+            ledger.close()
+        print(f"⏱️  {report['completed']} sub-processes in {report['wall_seconds']:.3f}s wall "
+              f"({report['work_seconds']:.3f}s total work, critical path {report['critical_path_seconds']:.3f}s: "
+              f"{' → '.join(report['critical_path'])})")
+        if report['failed']:
+            sys.exit(1)
+        return
     
     # Auto-detect sub-process from current directory
     if not args.sub_process:
@@ -454,11 +703,18 @@ def main():
     
     if args.dry_run:
         print(f"🔍 DRY RUN: Would generate AI prompts for {args.sub_process} in {args.phase}")
+        prompt_generator = AIPromptGenerator(ProcessKnowledge(), DataExtractor())
+        dry_run_estimates([(args.phase, args.sub_process)], prompt_generator, args)
         return
     
     # Generate documentation
-    generator = DocumentationGenerator(args.phase, args.sub_process)
-    generator.generate_documentation()
+    ledger = ledger_from_args(args, "ai-powered-agent")
+    generator = DocumentationGenerator(args.phase, args.sub_process, ledger=ledger)
+    try:
+        generator.generate_documentation()
+    finally:
+        if ledger:
+            ledger.close()
 
 if __name__ == "__main__":
     main()
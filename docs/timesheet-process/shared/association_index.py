@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Index association type IDs used across every workflow export.
+
+Each export under ``data/raw/workflows`` is parsed once (on a process pool) and every
+object carrying an association type ID is recorded as a usage: workflow, action, direction
+(from → to object type where the export says), category, and how the action uses it:
+``create`` when it writes the association (a create-association action, or an association
+spec such as a create-record action's ``associations``), ``filter`` for branch and
+enrollment filters, and ``reference`` for everything else (e.g. setting a property on, or
+emailing, an associated record). Rules files declare assertions against the index; see
+``evaluate_rules``.
+
+Usage:
+    # Summarise every association type ID in the exports
+    python3 analysis/timesheet_process/shared/association_index.py
+
+    # Show where specific IDs are used
+    python3 analysis/timesheet_process/shared/association_index.py 126 128
+
+    # Evaluate a rules file
+    python3 analysis/timesheet_process/shared/association_index.py --rules path/to/association-rules.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import json_codec
+from hjps import WorkflowCollection, default_cache, default_layout, load_json
+from workflow_repository import ID_PATTERN
+
+ASSOCIATION_ID_KEYS = ("associationTypeId", "association_type_id", "associationType")
+FROM_KEYS = ("fromObjectTypeId", "fromObjectType", "from_object_type")
+TO_KEYS = ("toObjectTypeId", "toObjectType", "to_object_type", "targetObjectTypeId", "objectTypeId")
+NESTED_ACTION_KEYS = ("actions", "acceptActions", "rejectActions")
+BRANCH_KEYS = ("branches", "listBranches", "staticBranches", "defaultBranch")
+# Actions whose association IDs describe the association they write
+CREATE_ASSOCIATION_ACTION_TYPES = {"0-63809083", "CREATE_ASSOCIATION", "CREATE_ASSOCIATIONS"}
+# Keys holding the association an action writes, in any action type (e.g. create-record associations)
+ASSOCIATION_SPEC_KEYS = ("associationSpec", "associationSpecs", "labelToApply")
+SPEC_ID_KEYS = ASSOCIATION_ID_KEYS + ("typeId",)
+DEFAULT_WORKFLOW_DIR = default_layout().workflows
+DEFAULT_JOBS = os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class AssociationUsage:
+    association_type_id: str
+    workflow_id: str
+    workflow_file: str
+    action_id: str
+    usage: str  # "create" (action writes it), "filter" (branch/enrollment filter) or "reference" (anything else)
+    direction: str
+    category: str = ""
+
+
+def _first(mapping: Dict[str, Any], keys: Sequence[str]) -> str:
+    for key in keys:
+        value = mapping.get(key)
+        if isinstance(value, (str, int)) and str(value):
+            return str(value)
+    return ""
+
+
+def _association_ids(node: Dict[str, Any], keys: Sequence[str] = ASSOCIATION_ID_KEYS) -> Iterator[str]:
+    for key in keys:
+        value = node.get(key)
+        if isinstance(value, (int, str)) and str(value).strip().isdigit():
+            yield str(value).strip()
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, (int, str)) and str(item).strip().isdigit():
+                    yield str(item).strip()
+
+
+def _iter_actions(workflow: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (action id, action) for every action, nested ones under their own ID."""
+    stack: List[Any] = list(reversed(workflow.get("actions") or []))
+    while stack:
+        action = stack.pop()
+        if not isinstance(action, dict):
+            continue
+        action_id = str(action.get("actionId") or action.get("actionGuid") or action.get("id") or "?")
+        yield action_id, action
+        nested: List[Any] = []
+        for key in NESTED_ACTION_KEYS:
+            if isinstance(action.get(key), list):
+                nested.extend(action[key])
+        for key in BRANCH_KEYS:
+            branches = action.get(key)
+            for branch in branches if isinstance(branches, list) else [branches]:
+                if isinstance(branch, dict) and isinstance(branch.get("actions"), list):
+                    nested.extend(branch["actions"])
+        stack.extend(reversed(nested))
+
+
+def scan_workflow(workflow: Dict[str, Any], workflow_id: str, workflow_file: str,
+                  source_object: str = "") -> List[AssociationUsage]:
+    """Return every association type ID usage in one parsed export."""
+    usages: List[AssociationUsage] = []
+    source_object = source_object or str(workflow.get("objectTypeId") or "")
+
+    def record(node: Dict[str, Any], action_id: str, usage: str, context_from: str,
+               id_keys: Sequence[str] = ASSOCIATION_ID_KEYS) -> None:
+        for assoc_id in _association_ids(node, id_keys):
+            origin = _first(node, FROM_KEYS) or context_from
+            target = _first(node, TO_KEYS)
+            usages.append(AssociationUsage(
+                association_type_id=assoc_id,
+                workflow_id=workflow_id,
+                workflow_file=workflow_file,
+                action_id=action_id,
+                usage=usage,
+                direction=f"{origin or '?'}→{target or '?'}",
+                category=_first(node, ("associationCategory", "category")),
+            ))
+
+    # Enrollment criteria live outside the action list
+    for key in ("enrollmentCriteria", "segmentCriteria", "reEnrollmentTriggerSets"):
+        if key in workflow:
+            for node in _walk(workflow[key]):
+                record(node, "enrollment", "filter", source_object)
+
+    for action_id, action in _iter_actions(workflow):
+        creates = str(action.get("actionTypeId") or action.get("type") or "").upper() in CREATE_ASSOCIATION_ACTION_TYPES
+        # (usage, inside an association spec, node); everything below a filter or spec inherits it
+        stack: List[Tuple[str, bool, Any]] = [("create" if creates else "reference", False, action)]
+        while stack:
+            usage, in_spec, value = stack.pop()
+            if isinstance(value, list):
+                stack.extend((usage, in_spec, item) for item in value)
+                continue
+            if not isinstance(value, dict):
+                continue
+            record(value, action_id, usage, source_object, SPEC_ID_KEYS if in_spec else ASSOCIATION_ID_KEYS)
+            for key, child in value.items():
+                if key in NESTED_ACTION_KEYS or (key in BRANCH_KEYS and _has_actions(child)):
+                    continue  # scanned under the nested action's own ID
+                if isinstance(child, (dict, list)):
+                    # Branch conditions only read associations; a spec is the association being written
+                    if usage == "filter" or "filter" in key.lower() or key in ("listBranches", "staticBranches"):
+                        stack.append(("filter", False, child))
+                    elif key in ASSOCIATION_SPEC_KEYS:
+                        stack.append(("create", True, child))
+                    else:
+                        stack.append((usage, in_spec, child))
+    return usages
+
+
+def _has_actions(value: Any) -> bool:
+    items = value if isinstance(value, list) else [value]
+    return any(isinstance(item, dict) and isinstance(item.get("actions"), list) for item in items)
+
+
+def _walk(value: Any) -> Iterator[Dict[str, Any]]:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(child for child in item.values() if isinstance(child, (dict, list)))
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def _parse_export(path: Path) -> Any:
+    # Worker processes share nothing in memory, but can share the on-disk parsed cache
+    return load_json(path, default_cache())
+
+
+def _scan_file(task: Tuple[str, str, str],
+               loader: Callable[[Path], Any] = _parse_export) -> Tuple[List[AssociationUsage], str | None]:
+    path, workflow_id, workflow_file = task
+    try:
+        workflow = loader(Path(path))
+    except (OSError, ValueError) as exc:
+        return [], f"{workflow_file}: {exc}"
+    if not isinstance(workflow, dict):
+        return [], f"{workflow_file}: top-level JSON is not an object"
+    return scan_workflow(workflow, workflow_id, workflow_file), None
+
+
+class AssociationIndex:
+    """Association type ID → usages across all scanned exports."""
+
+    def __init__(self, usages: Iterable[AssociationUsage] = (), errors: Iterable[str] = ()):
+        self.by_id: Dict[str, List[AssociationUsage]] = {}
+        self.errors = list(errors)
+        self.files = 0
+        self.seconds = 0.0
+        for usage in usages:
+            self.by_id.setdefault(usage.association_type_id, []).append(usage)
+
+    @classmethod
+    def build(cls, workflow_dir: Path = DEFAULT_WORKFLOW_DIR, jobs: int = DEFAULT_JOBS) -> "AssociationIndex":
+        start = time.perf_counter()
+        # Workflow IDs come from the file name (as in WorkflowRepository) so each export is parsed once
+        paths = sorted(workflow_dir.glob("*.json")) if workflow_dir.exists() else []
+        tasks = [(str(path), next(iter(ID_PATTERN.findall(path.stem)), path.stem), path.name) for path in paths]
+        usages: List[AssociationUsage] = []
+        errors: List[str] = []
+        if jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_scan_file, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+        else:
+            # In-process scans parse through the shared collection, so other tools reuse the documents
+            exports = WorkflowCollection.shared(workflow_dir).exports
+            results = [_scan_file(task, lambda path: exports.load(path.name)) for task in tasks]
+        for found, error in results:
+            usages.extend(found)
+            if error:
+                errors.append(error)
+        index = cls(usages, errors)
+        index.files = len(tasks)
+        index.seconds = time.perf_counter() - start
+        return index
+
+    def usages(self, association_type_id: str | int, workflow_id: str | None = None,
+               usage: str | None = None) -> List[AssociationUsage]:
+        found = self.by_id.get(str(association_type_id), [])
+        return [
+            item for item in found
+            if (workflow_id is None or item.workflow_id == str(workflow_id))
+            and (usage is None or item.usage == usage)
+        ]
+
+
+def evaluate_rules(index: AssociationIndex, rules: Sequence[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str | None]]:
+    """Evaluate rule dicts; returns (rule, failure message or None) in rule order.
+
+    Rule keys: ``association_type_id`` (required), ``name``, ``usage`` ("create"/"filter"/"reference"),
+    and one of ``workflow`` (must use the ID), ``absent_from`` (must not use it), or
+    ``only_workflows`` (no other workflow may use it).
+    """
+    results: List[Tuple[Dict[str, Any], str | None]] = []
+    for rule in rules:
+        assoc_id = str(rule["association_type_id"])
+        usage = rule.get("usage")
+        failure = None
+        if "workflow" in rule:
+            if not index.usages(assoc_id, str(rule["workflow"]), usage):
+                failure = f"workflow {rule['workflow']} has no {usage or 'any'} usage of association {assoc_id}"
+        elif "absent_from" in rule:
+            found = index.usages(assoc_id, str(rule["absent_from"]), usage)
+            if found:
+                actions = ", ".join(sorted({item.action_id for item in found}))
+                failure = f"workflow {rule['absent_from']} uses association {assoc_id} (actions {actions})"
+        elif "only_workflows" in rule:
+            allowed = {str(wf) for wf in rule["only_workflows"]}
+            others = sorted({item.workflow_id for item in index.usages(assoc_id, usage=usage)} - allowed)
+            if others:
+                failure = f"association {assoc_id} also used by {', '.join(others)}"
+        else:
+            failure = "rule needs one of workflow / absent_from / only_workflows"
+        results.append((rule, failure))
+    return results
+
+
+def load_rules(path: Path) -> List[Dict[str, Any]]:
+    data = json_codec.load_path(path)
+    return data.get("rules", []) if isinstance(data, dict) else data
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index association type IDs across workflow exports")
+    parser.add_argument("association_ids", nargs="*", help="Association type IDs to list usages for")
+    parser.add_argument("--workflow-dir", type=Path, default=DEFAULT_WORKFLOW_DIR)
+    parser.add_argument("--rules", type=Path, help="Rules JSON to evaluate against the index")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"Worker processes (default: {DEFAULT_JOBS})")
+    parser.add_argument("--json", action="store_true", help="Print usages as JSON")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    index = AssociationIndex.build(args.workflow_dir, args.jobs)
+    print(f"Scanned {index.files} exports in {index.seconds:.2f}s; {len(index.by_id)} association type IDs")
+    for error in index.errors:
+        print(f"  ⚠️ {error}")
+
+    ids = args.association_ids or sorted(index.by_id, key=int)
+    if args.json:
+        print(json_codec.dumps({aid: [asdict(u) for u in index.usages(aid)] for aid in ids}, indent=2))
+    else:
+        for aid in ids:
+            found = index.usages(aid)
+            workflows = sorted({u.workflow_id for u in found})
+            print(f"{aid}: {len(found)} usage(s) in {len(workflows)} workflow(s)")
+            if args.association_ids:
+                for u in found:
+                    print(f"    {u.workflow_id} action {u.action_id} · {u.usage} · {u.direction} {u.category}".rstrip())
+
+    if args.rules:
+        failures = [(rule, msg) for rule, msg in evaluate_rules(index, load_rules(args.rules)) if msg]
+        for rule, msg in failures:
+            print(f"FAIL {rule.get('name', rule['association_type_id'])}: {msg}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
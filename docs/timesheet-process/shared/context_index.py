@@ -4,10 +4,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence
+
+import json_codec
+from instrumentation import add_instrumentation_arguments, instrumented, span
+from hjps import DataLayout, HubSpotData, repo_root as resolve_repo_root
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "context-index.json"
 
 
 def iso_timestamp(ts: float) -> str:
@@ -84,35 +89,32 @@ def gather_shared_assets(shared_root: Path, repo_root: Path) -> Dict[str, Any]:
 
 
 def gather_data_sources(repo_root: Path) -> Dict[str, Any]:
+    """Summaries of the exports under ``data/raw`` (listed only; no export is parsed here)."""
     data_sources: Dict[str, Any] = {}
+    layout = DataLayout.for_root(repo_root)
+    data = HubSpotData.shared(layout)
 
-    schema_dir = repo_root / "data" / "raw" / "ai-context" / "ai-context-export" / "data-model"
-    if schema_dir.exists():
-        data_sources["schemas"] = [file_summary(path, repo_root) for path in sorted(schema_dir.glob("*.json"))]
+    if layout.schemas.exists():
+        data_sources["schemas"] = [file_summary(path, repo_root) for path in sorted(data.schemas.paths())]
 
-    workflow_dir = repo_root / "data" / "raw" / "workflows"
-    if workflow_dir.exists():
-        data_sources["workflows"] = [file_summary(path, repo_root) for path in sorted(workflow_dir.glob("*.json"))]
+    if layout.workflows.exists():
+        data_sources["workflows"] = [file_summary(path, repo_root) for path in data.workflows.paths()]
 
-    modules_dir = repo_root / "data" / "raw" / "themes" / "Timesheets-Theme" / "modules"
+    modules_dir = layout.modules
     if modules_dir.exists():
-        module_infos: List[Dict[str, Any]] = []
-        for module_path in sorted(modules_dir.iterdir()):
-            if module_path.is_dir():
-                stat = module_path.stat()
-                module_infos.append(
-                    {
-                        "name": module_path.name,
-                        "path": str(module_path.relative_to(repo_root)),
-                        "file_count": sum(1 for _ in module_path.glob("**/*") if _.is_file()),
-                        "modified": iso_timestamp(stat.st_mtime),
-                    }
-                )
-        data_sources["modules"] = module_infos
-
-    forms_dir = repo_root / "data" / "raw" / "ai-context" / "ai-context-export" / "forms"
-    if forms_dir.exists():
-        data_sources["forms"] = [file_summary(path, repo_root) for path in sorted(forms_dir.glob("*.json"))]
+        manifest = data.modules.manifest
+        data_sources["modules"] = [
+            {
+                "name": entry.name,
+                "path": str((modules_dir / entry.name).relative_to(repo_root)),
+                "file_count": entry.file_count,
+                "modified": iso_timestamp(entry.mtime),
+            }
+            for entry in (manifest.get(name) for name in manifest.names())
+        ]
+
+    if layout.forms.exists():
+        data_sources["forms"] = [file_summary(path, repo_root) for path in sorted(data.forms.repository.index().values())]
 
     return data_sources
 
@@ -121,15 +123,19 @@ def build_index() -> Dict[str, Any]:
     script_path = Path(__file__).resolve()
     shared_root = script_path.parent
     timesheet_root = shared_root.parent
-    repo_root = timesheet_root.parent.parent
+    repo_root = resolve_repo_root()
 
     index: Dict[str, Any] = {
         "generated_at": datetime.now().astimezone().isoformat(),
         "timesheet_root": str(timesheet_root.relative_to(repo_root)),
-        "phases": gather_timesheet_process(timesheet_root, repo_root),
-        "shared_assets": gather_shared_assets(shared_root, repo_root),
-        "data_sources": gather_data_sources(repo_root),
     }
+    with span("scan"):
+        with span("phases"):
+            index["phases"] = gather_timesheet_process(timesheet_root, repo_root)
+        with span("shared_assets"):
+            index["shared_assets"] = gather_shared_assets(shared_root, repo_root)
+        with span("data_sources"):
+            index["data_sources"] = gather_data_sources(repo_root)
 
     additional_files = [
         timesheet_root / "PROCESS-FLOW-COMPLETE.md",
@@ -142,7 +148,16 @@ def build_index() -> Dict[str, Any]:
     return index
 
 
-def main() -> None:
+def write_index(index: Dict[str, Any], output_path: Path = DEFAULT_OUTPUT, pretty: bool = False) -> Path:
+    with span("render"):
+        text = json_codec.dumps(index, indent=2 if pretty else None,
+                                separators=None if pretty else json_codec.COMPACT, ensure_ascii=False)
+    with span("write"):
+        output_path.write_text(text, encoding="utf-8")
+    return output_path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Generate an index for timesheet process assets.")
     parser.add_argument(
         "--output",
@@ -155,21 +170,13 @@ def main() -> None:
         action="store_true",
         help="Pretty-print JSON with indentation",
     )
-    args = parser.parse_args()
-
-    index = build_index()
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
 
-    script_path = Path(__file__).resolve()
-    default_output = script_path.parent / "context-index.json"
-    output_path = args.output or default_output
-
-    output_path.write_text(
-        json.dumps(index, indent=2 if args.pretty else None, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    with instrumented(args, "context_index"):
+        output_path = write_index(build_index(), args.output or DEFAULT_OUTPUT, args.pretty)
     print(f"Context index written to {output_path}")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,107 @@
+"""Run a dependency graph of tasks on a thread pool.
+
+Nodes are names mapped to the names they depend on. ``topological_order`` checks the graph
+(Kahn's algorithm, naming a cycle if there is one); ``run_graph`` starts each node as soon
+as its dependencies have finished. A node whose dependency failed, directly or through a
+node skipped for that reason, is skipped instead of run on stale inputs, so every node ends
+up either completed or failed. The agent scheduler (``ai-powered-agent.py``) and the
+documentation build (``docs_build.py``) both run through it.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, Iterable, List, Mapping, Optional, Set, TypeVar
+
+R = TypeVar("R")
+
+
+def topological_order(deps: Mapping[str, Iterable[str]]) -> List[str]:
+    """Kahn's algorithm over ``deps`` (input order breaks ties); raises ValueError naming a cycle."""
+    graph = {node: [dep for dep in dict.fromkeys(node_deps) if dep in deps] for node, node_deps in deps.items()}
+    indegree = {node: len(node_deps) for node, node_deps in graph.items()}
+    dependents: Dict[str, List[str]] = {node: [] for node in graph}
+    for node, node_deps in graph.items():
+        for dep in node_deps:
+            dependents[dep].append(node)
+    ready = [node for node in graph if indegree[node] == 0]
+    order: List[str] = []
+    while ready:
+        node = ready.pop(0)
+        order.append(node)
+        for child in dependents[node]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if len(order) != len(graph):
+        raise ValueError(f"Dependency cycle: {' -> '.join(find_cycle(graph, set(graph) - set(order)))}")
+    return order
+
+
+def find_cycle(deps: Mapping[str, Iterable[str]], remaining: Set[str]) -> List[str]:
+    # Every node left after Kahn's has an unresolved dependency inside ``remaining``
+    node = sorted(remaining)[0]
+    path: List[str] = []
+    while node not in path:
+        path.append(node)
+        node = next(dep for dep in deps[node] if dep in remaining)
+    return path[path.index(node):] + [node]
+
+
+@dataclass
+class GraphRun(Generic[R]):
+    """What each node returned, and why the others failed or were skipped."""
+
+    results: Dict[str, R] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+def run_graph(deps: Mapping[str, Iterable[str]], func: Callable[[str], R], jobs: int = 1,
+              on_result: Optional[Callable[[str, R], None]] = None, thread_name_prefix: str = "") -> GraphRun[R]:
+    """Call ``func(node)`` for every node once its dependencies have completed.
+
+    Dependencies outside ``deps`` are ignored. ``on_result`` runs on the calling thread as
+    each node completes; failures and skips are printed and recorded in ``failed``.
+    """
+    topological_order(deps)
+    graph = {node: set(node_deps) & set(deps) for node, node_deps in deps.items()}
+    remaining = {node: set(node_deps) for node, node_deps in graph.items()}
+    run: GraphRun[R] = GraphRun()
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix=thread_name_prefix) as pool:
+        running: Dict[Future, str] = {}
+
+        def submit_ready() -> None:
+            for node in [n for n, node_deps in remaining.items() if not node_deps]:
+                del remaining[node]
+                running[pool.submit(func, node)] = node
+
+        submit_ready()
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                try:
+                    run.results[node] = future.result()
+                except Exception as exc:
+                    run.failed[node] = f"{type(exc).__name__}: {exc}"
+                    print(f"❌ {node}: {run.failed[node]}")
+                else:
+                    if on_result:
+                        on_result(node, run.results[node])
+                for node_deps in remaining.values():
+                    node_deps.discard(node)
+            # Anything depending on a failure, directly or through a skipped node, is skipped
+            skipped = True
+            while skipped:
+                skipped = [n for n in remaining if graph[n] & set(run.failed)]
+                for node in skipped:
+                    del remaining[node]
+                    run.failed[node] = "skipped: dependency failed"
+                    print(f"⏭️  {node}: dependency failed")
+            submit_ready()
+    # Every node is accounted for as completed or failed, even if it could never start
+    for node in remaining:
+        run.failed[node] = "skipped: dependencies never finished"
+        print(f"⏭️  {node}: dependencies never finished")
+    return run
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""Rebuild only the stale documentation artifacts, make-style.
+
+Every generated artifact is a target in one build graph: ``context-index``, one
+``extract/<agent>`` (project-configuration-style context extract) and ``packs/<agent>``
+(``prompt-pack.*.json``) per scaffolded subprocess, and one ``verify/<phase>`` per traced
+phase. A target declares its input files, non-file parameters, the targets it depends on,
+and the function that produces it. Its fingerprint is the SHA-256 over the content digest
+of each input (the producing tool's source included) plus the parameters; a target is
+rebuilt when that fingerprint or one of its outputs differs from the last build recorded in
+``data/raw/.cache/docs-build-state.json``. Digests are reused while a file's size and
+mtime are unchanged, so a no-op build hashes nothing.
+
+Stale targets run in dependency order on a thread pool; a target starts as soon as the
+targets it depends on have finished, and its staleness is decided only then, so an
+upstream rebuild that leaves its outputs byte-identical does not cascade.
+
+Usage:
+    # Build everything that is stale
+    python3 analysis/timesheet_process/shared/docs_build.py
+
+    # Show the plan (parallel waves) and why each target is stale, without building
+    python3 analysis/timesheet_process/shared/docs_build.py --dry-run --why
+
+    # Only the approval packs and verification (plus whatever they depend on)
+    python3 analysis/timesheet_process/shared/docs_build.py 'packs/*approv*' verify/approval
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+SHARED_DIR = Path(__file__).resolve().parent
+if str(SHARED_DIR / "verification") not in sys.path:
+    sys.path.insert(0, str(SHARED_DIR / "verification"))
+
+import context_index  # noqa: E402
+from dependency_graph import run_graph, topological_order  # noqa: E402
+import docs_pipeline  # noqa: E402
+import extract_project_configuration_context as extract  # noqa: E402
+import json_codec  # noqa: E402
+import prompt_pack_builder  # noqa: E402
+import verify_phase  # noqa: E402
+import workflow_graph  # noqa: E402
+from hjps import REPO_ROOT, HubSpotData, default_layout  # noqa: E402
+from instrumentation import add_instrumentation_arguments, instrumented, span  # noqa: E402
+
+STATE_PATH = default_layout().cache / "docs-build-state.json"
+# Bump when the fingerprint layout changes so every target is rebuilt once
+STATE_VERSION = 1
+DEFAULT_JOBS = docs_pipeline.DEFAULT_JOBS
+TIMESHEET_ROOT = extract.PROCESS_ROOT
+SKIPPED_DIRS = {"__pycache__", ".git"}
+
+
+def display_path(path: Path) -> str:
+    return extract.display_path(path)
+
+
+def tree_files(root: Path) -> List[Path]:
+    if not root.exists():
+        return []
+    return sorted(path for path in root.rglob("*") if path.is_file() and not SKIPPED_DIRS & set(path.parts))
+
+
+def tool_sources(*modules: Any) -> List[Path]:
+    """Source files of the producing tools; editing a tool rebuilds what it produced."""
+    return [Path(module.__file__).resolve() for module in modules]
+
+
+class DigestCache:
+    """SHA-256 per file, recomputed only when its size or mtime changes."""
+
+    def __init__(self, entries: Optional[Dict[str, List[Any]]] = None):
+        self.entries: Dict[str, List[Any]] = dict(entries or {})
+        self.hashed = 0
+        self._lock = threading.Lock()
+
+    def digest(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        with self._lock:
+            cached = self.entries.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        with self._lock:
+            self.entries[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self.hashed += 1
+        return digest
+
+
+@dataclass
+class Target:
+    """One generated artifact (or group of artifacts produced together)."""
+
+    name: str
+    outputs: List[Path]
+    inputs: Callable[[], Iterable[Path]]
+    produce: Callable[[], None]
+    deps: List[str] = field(default_factory=list)
+    params: Callable[[], Dict[str, Any]] = dict
+
+
+@dataclass
+class Evaluation:
+    """A target's current input digests and why (if at all) it must be rebuilt."""
+
+    target: Target
+    inputs: Dict[str, Optional[str]]
+    params: Dict[str, Any]
+    fingerprint: str
+    reasons: List[str]
+
+    @property
+    def stale(self) -> bool:
+        return bool(self.reasons)
+
+
+class BuildContext:
+    """Data shared by the producers of one build, created on first use."""
+
+    def __init__(self, config: Dict[str, Any], deep: bool = False, jobs: int = DEFAULT_JOBS):
+        self.config = config
+        self.deep = deep
+        self.jobs = jobs
+        self.data = HubSpotData.shared()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="build-load")
+        self._indexes: Optional[extract.SharedIndexes] = None
+        self._lock = threading.Lock()
+        # verify_phase prints its report and keeps module-level caches; phases verify one at a time
+        self.verify_lock = threading.Lock()
+
+    def indexes(self, subprocesses: Sequence[extract.Subprocess]) -> extract.SharedIndexes:
+        with self._lock:
+            if self._indexes is None:
+                self._indexes = extract.load_shared_indexes(subprocesses, self.executor, self.data)
+            return self._indexes
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+
+class BuildGraph:
+    def __init__(self, targets: Iterable[Target]):
+        self.targets: Dict[str, Target] = {target.name: target for target in targets}
+        for target in self.targets.values():
+            unknown = [dep for dep in target.deps if dep not in self.targets]
+            if unknown:
+                raise ValueError(f"{target.name} depends on unknown target(s): {', '.join(unknown)}")
+        self.outputs: Dict[Path, str] = {
+            output: target.name for target in self.targets.values() for output in target.outputs
+        }
+
+    def select(self, patterns: Sequence[str]) -> List[str]:
+        """Targets matching any pattern, plus everything they depend on, in dependency order."""
+        chosen = [name for name in self.targets if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)]
+        if patterns and not chosen:
+            raise ValueError(f"No targets match: {' '.join(patterns)}")
+        closure: Set[str] = set()
+        stack = list(chosen)
+        while stack:
+            name = stack.pop()
+            if name not in closure:
+                closure.add(name)
+                stack.extend(self.targets[name].deps)
+        return [name for name in self.topological_order() if name in closure]
+
+    def topological_order(self) -> List[str]:
+        """Kahn's algorithm; raises ValueError naming a cycle if the graph has one."""
+        return topological_order({name: target.deps for name, target in self.targets.items()})
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+
+def index_inputs(graph_outputs: Callable[[], Set[Path]]) -> List[Path]:
+    """Everything context_index.py summarizes, minus other targets' outputs.
+
+    The index lists the shared/ and numbered process directories; leaving out files the
+    graph itself generates keeps the graph acyclic and stops every build from staling it.
+    """
+    layout = default_layout()
+    roots = [path for path in TIMESHEET_ROOT.iterdir() if path.is_dir() and path.name[:2].isdigit()]
+    roots.append(TIMESHEET_ROOT / "shared")
+    files = [path for root in roots for path in tree_files(root)]
+    files += [TIMESHEET_ROOT / name for name in ("PROCESS-FLOW-COMPLETE.md", "STRUCTURE-STATUS-SUMMARY.md",
+                                                 "README.md", "CONTEXT-RESET-SUMMARY.md")]
+    for directory in (layout.schemas, layout.workflows, layout.forms):
+        files += sorted(directory.glob("*.json")) if directory.exists() else []
+    files += tree_files(layout.modules)
+    generated = graph_outputs()
+    return [path for path in files if path not in generated and path.suffix != ".pyc"]
+
+
+def index_target(ctx: BuildContext, graph_outputs: Callable[[], Set[Path]]) -> Target:
+    output = context_index.DEFAULT_OUTPUT
+
+    def produce() -> None:
+        context_index.write_index(context_index.build_index(), output)
+
+    return Target(
+        name="context-index",
+        outputs=[output],
+        inputs=lambda: index_inputs(graph_outputs) + tool_sources(context_index),
+        produce=produce,
+    )
+
+
+def extract_target(ctx: BuildContext, sub: extract.Subprocess, subprocesses: Sequence[extract.Subprocess]) -> Target:
+    layout = ctx.data.layout
+
+    def inputs() -> List[Path]:
+        files = [extract.CONFIG_PATH, sub.directory / "assets" / "asset-inventory.json",
+                 sub.directory / "properties" / "property-mapping.json"]
+        # The schema alias index is built from every schema export
+        files += ctx.data.schemas.paths()
+        files += [path for path in map(ctx.data.workflows.path, sub.workflows) if path is not None]
+        files += [path for name in sub.modules for path in tree_files(layout.modules / name)]
+        return files + tool_sources(extract, workflow_graph)
+
+    def params() -> Dict[str, Any]:
+        # Keyword matches search the module names, so the set of present modules counts
+        return {"modules": ctx.data.modules.names() if sub.module_keywords else []}
+
+    def produce() -> None:
+        extract.write_extract(sub, ctx.indexes(subprocesses))
+
+    return Target(
+        name=f"extract/{sub.name}",
+        outputs=[sub.output_path],
+        inputs=inputs,
+        params=params,
+        produce=produce,
+    )
+
+
+def packs_target(ctx: BuildContext, sub: extract.Subprocess) -> Target:
+    phase = docs_pipeline.phase_id(ctx.config, sub.phase)
+    phase_path = docs_pipeline.phase_docs(ctx.config, sub.phase)
+    deliverables = docs_pipeline.DEFAULT_DELIVERABLES
+
+    def inputs() -> List[Path]:
+        files = [path for path, _, _ in prompt_pack_builder.context_bundle_paths(phase_path, sub.directory)]
+        return files + tool_sources(prompt_pack_builder)
+
+    def produce() -> None:
+        index = prompt_pack_builder.load_context_index(context_index.DEFAULT_OUTPUT)
+        prompt_pack_builder.write_prompt_packs(phase, sub.name, deliverables, index, REPO_ROOT, phase_path, sub.directory)
+
+    return Target(
+        name=f"packs/{sub.name}",
+        outputs=[sub.directory / f"prompt-pack.{deliverable}.json" for deliverable in deliverables],
+        inputs=inputs,
+        produce=produce,
+        deps=["context-index"],
+    )
+
+
+def verify_target(ctx: BuildContext, phase: str, config: Dict[str, Path]) -> Target:
+    layout = ctx.data.layout
+    phase_dir = config["phase_dir"]
+
+    def inputs() -> List[Path]:
+        files = [config["trace"], layout.cms_forms]
+        files += sorted(phase_dir.glob("**/assets/asset-inventory.json"))
+        files += sorted(phase_dir.glob("**/properties/property-mapping.json"))
+        files += ctx.data.schemas.paths()
+        workflow_ids = verify_phase.gather_trace_workflow_ids(config["trace"])
+        exports = verify_phase.resolve_workflow_exports(workflow_ids, layout.workflows)
+        files += [path for path in exports.values() if path is not None]
+        return files + verify_phase.check_sources()
+
+    def params() -> Dict[str, Any]:
+        # Module checks only test presence
+        return {"deep": ctx.deep, "modules": ctx.data.modules.names()}
+
+    def produce() -> None:
+        argv = ["--phase", phase, "--force", "--jobs", str(ctx.jobs)] + (["--deep"] if ctx.deep else [])
+        with ctx.verify_lock:
+            verify_phase.verify(verify_phase.parse_args(argv), config)
+
+    return Target(
+        name=f"verify/{phase}",
+        outputs=[config["log_dir"] / verify_phase.STATE_FILENAME],
+        inputs=inputs,
+        params=params,
+        produce=produce,
+    )
+
+
+def documentation_graph(ctx: BuildContext) -> BuildGraph:
+    subprocesses = [sub for sub in extract.discover_subprocesses(ctx.config) if sub.directory.exists()]
+    holder: Dict[str, BuildGraph] = {}
+    targets = [index_target(ctx, lambda: set(holder["graph"].outputs))]
+    targets += [extract_target(ctx, sub, subprocesses) for sub in subprocesses]
+    targets += [packs_target(ctx, sub) for sub in subprocesses]
+    targets += [verify_target(ctx, phase, config) for phase, config in docs_pipeline.verification_configs(ctx.config).items()]
+    holder["graph"] = BuildGraph(targets)
+    return holder["graph"]
+
+
+# ---------------------------------------------------------------------------
+# Staleness and execution
+# ---------------------------------------------------------------------------
+
+
+class Builder:
+    def __init__(self, graph: BuildGraph, state_path: Path = STATE_PATH, force: bool = False):
+        self.graph = graph
+        self.state_path = state_path
+        self.force = force
+        state = self._load_state()
+        self.records: Dict[str, Dict[str, Any]] = state.get("targets", {})
+        self.digests = DigestCache(state.get("digests"))
+        self._lock = threading.Lock()
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            state = json_codec.load_path(self.state_path)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) and state.get("version") == STATE_VERSION else {}
+
+    def save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {"version": STATE_VERSION, "targets": self.records, "digests": self.digests.entries}
+            self.state_path.write_text(json_codec.dumps(payload, separators=json_codec.COMPACT), encoding="utf-8")
+
+    def evaluate(self, name: str, stale_deps: Sequence[str] = ()) -> Evaluation:
+        target = self.graph.targets[name]
+        with span("scan"):
+            inputs = {display_path(path): self.digests.digest(path) for path in sorted(set(target.inputs()))}
+        params = target.params()
+        fingerprint = hashlib.sha256(json_codec.dumps([inputs, params], sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            record = self.records.get(name)
+        reasons: List[str] = ["forced"] if self.force else []
+        if record is None:
+            reasons.append("never built")
+        else:
+            for output in target.outputs:
+                recorded = record.get("outputs", {}).get(display_path(output))
+                current = self.digests.digest(output)
+                if current is None:
+                    reasons.append(f"output missing: {display_path(output)}")
+                elif current != recorded:
+                    reasons.append(f"output modified since last build: {display_path(output)}")
+            if record.get("fingerprint") != fingerprint:
+                reasons += self._input_changes(record.get("inputs", {}), inputs)
+                reasons += [f"parameter changed: {key}" for key in sorted(set(params) | set(record.get("params", {})))
+                            if params.get(key) != record.get("params", {}).get(key)]
+        reasons += [f"depends on stale {dep}" for dep in stale_deps]
+        return Evaluation(target, inputs, params, fingerprint, reasons)
+
+    @staticmethod
+    def _input_changes(previous: Dict[str, Optional[str]], current: Dict[str, Optional[str]]) -> List[str]:
+        reasons = []
+        for path in sorted(set(previous) | set(current)):
+            before, after = previous.get(path), current.get(path)
+            if before == after:
+                continue
+            if path not in previous or before is None:
+                reasons.append(f"input added: {path}")
+            elif path not in current or after is None:
+                reasons.append(f"input removed: {path}")
+            else:
+                reasons.append(f"input changed: {path}")
+        return reasons
+
+    def plan(self, names: Sequence[str]) -> List[Tuple[int, Evaluation]]:
+        """Evaluate every selected target without building; stale targets get a parallel wave number.
+
+        Outputs of stale dependencies are not rebuilt here, so their dependents are reported
+        as stale on that account.
+        """
+        waves: Dict[str, int] = {}
+        planned: List[Tuple[int, Evaluation]] = []
+        for name in names:
+            deps = self.graph.targets[name].deps
+            evaluation = self.evaluate(name, [dep for dep in deps if dep in waves])
+            if evaluation.stale:
+                waves[name] = 1 + max((waves[dep] for dep in deps if dep in waves), default=0)
+            planned.append((waves.get(name, 0), evaluation))
+        return planned
+
+    def build_one(self, name: str) -> Tuple[Evaluation, float]:
+        evaluation = self.evaluate(name)
+        if not evaluation.stale:
+            return evaluation, 0.0
+        start = time.perf_counter()
+        # Spans of the producing tools nest under the target kind, e.g. packs/render
+        with span(name.split("/", 1)[0]):
+            evaluation.target.produce()
+        seconds = time.perf_counter() - start
+        record = {
+            "fingerprint": evaluation.fingerprint,
+            "inputs": evaluation.inputs,
+            "params": evaluation.params,
+            "outputs": {display_path(path): self.digests.digest(path) for path in evaluation.target.outputs},
+            "built_at": datetime.now().astimezone().isoformat(),
+            "seconds": round(seconds, 6),
+        }
+        with self._lock:
+            self.records[name] = record
+        return evaluation, seconds
+
+    def build(self, names: Sequence[str], jobs: int = DEFAULT_JOBS, why: bool = False) -> Dict[str, Any]:
+        """Run the selected targets; each is checked (and rebuilt if stale) once its dependencies finish."""
+        built: Dict[str, float] = {}
+        fresh: List[str] = []
+        start = time.perf_counter()
+
+        def finished(name: str, result: Tuple[Evaluation, float]) -> None:
+            evaluation, seconds = result
+            if not evaluation.stale:
+                fresh.append(name)
+                return
+            built[name] = seconds
+            print(f"✅ {name} ({seconds:.3f}s)")
+            if why:
+                print(format_reasons(evaluation.reasons))
+
+        # Dependencies outside the selection are ignored; select() always includes them
+        failed = run_graph({name: self.graph.targets[name].deps for name in names}, self.build_one, jobs,
+                           on_result=finished, thread_name_prefix="build").failed
+        self.save_state()
+        return {
+            "built": built,
+            "up_to_date": sorted(fresh),
+            "failed": failed,
+            "wall_seconds": round(time.perf_counter() - start, 3),
+            "files_hashed": self.digests.hashed,
+        }
+
+
+def format_reasons(reasons: Sequence[str], limit: int = 8) -> str:
+    lines = [f"     - {reason}" for reason in reasons[:limit]]
+    if len(reasons) > limit:
+        lines.append(f"     - … {len(reasons) - limit} more")
+    return "\n".join(lines)
+
+
+def format_plan(planned: Sequence[Tuple[int, Evaluation]], why: bool = False) -> str:
+    stale = [(wave, evaluation) for wave, evaluation in planned if evaluation.stale]
+    lines = [f"🔍 {len(stale)} of {len(planned)} targets stale"]
+    for wave in sorted({wave for wave, _ in stale}):
+        names = [evaluation for w, evaluation in stale if w == wave]
+        lines.append(f"  wave {wave} ({len(names)} in parallel):")
+        for evaluation in names:
+            outputs = ", ".join(display_path(path) for path in evaluation.target.outputs)
+            lines.append(f"    - {evaluation.target.name} → {outputs}")
+            if why:
+                lines.append(format_reasons(evaluation.reasons))
+    if why:
+        for _, evaluation in planned:
+            if not evaluation.stale:
+                lines.append(f"  up to date: {evaluation.target.name} ({len(evaluation.inputs)} inputs unchanged)")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild stale documentation artifacts in dependency order")
+    parser.add_argument("targets", nargs="*", help="Target names or glob patterns (default: all); dependencies are included")
+    parser.add_argument("--config", type=Path, default=extract.CONFIG_PATH, help="Process configuration JSON")
+    parser.add_argument("--dry-run", action="store_true", help="Print the build plan without building")
+    parser.add_argument("--why", action="store_true", help="Explain why each target is (or is not) rebuilt")
+    parser.add_argument("--list", action="store_true", help="List targets with their outputs and dependencies")
+    parser.add_argument("--force", action="store_true", help="Rebuild the selected targets even when up to date")
+    parser.add_argument("--deep", action="store_true", help="Deep verification (a parameter of the verify targets)")
+    parser.add_argument("--state", type=Path, default=STATE_PATH, help="Build state file")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"Targets built concurrently (default: {DEFAULT_JOBS})")
+    add_instrumentation_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    with instrumented(args, "docs_build"):
+        return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    ctx = BuildContext(json_codec.load_path(args.config), deep=args.deep, jobs=args.jobs)
+    try:
+        graph = documentation_graph(ctx)
+        try:
+            names = graph.select(args.targets)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+
+        if args.list:
+            for name in names:
+                target = graph.targets[name]
+                deps = ", ".join(target.deps) or "none"
+                print(f"{name} → {', '.join(display_path(path) for path in target.outputs)} (after: {deps})")
+            return 0
+
+        builder = Builder(graph, args.state, force=args.force)
+        if args.dry_run:
+            print(format_plan(builder.plan(names), args.why))
+            return 0
+
+        report = builder.build(names, args.jobs, args.why)
+    finally:
+        ctx.close()
+    print(f"⏱️  {len(report['built'])} rebuilt, {len(report['up_to_date'])} up to date, {len(report['failed'])} failed "
+          f"in {report['wall_seconds']:.3f}s ({report['files_hashed']} files hashed)")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Run the documentation refresh in one process: index → extracts → prompt packs → verification.
+
+The separate scripts each pay interpreter startup and re-discover and re-parse the same
+exports. Here the stages share one interpreter, one ``HubSpotData`` (so every schema,
+workflow, and module export is parsed at most once across all stages), one worker pool,
+and the in-memory context index, which the prompt-pack stage uses without reading it back.
+Subprocesses and phases come from ``process-configuration.json``; each stage is timed and
+recorded in the trace ledger.
+
+Usage:
+    # Full refresh of every phase
+    python3 analysis/timesheet_process/shared/docs_pipeline.py
+
+    # One phase, deep verification, fresh verification logs
+    python3 analysis/timesheet_process/shared/docs_pipeline.py --phase foundation --deep --force
+
+    # Only rebuild the index and extracts; write the stage timings as JSON
+    python3 analysis/timesheet_process/shared/docs_pipeline.py --stages index extract --json /tmp/timings.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SHARED_DIR = Path(__file__).resolve().parent
+if str(SHARED_DIR / "verification") not in sys.path:
+    sys.path.insert(0, str(SHARED_DIR / "verification"))
+
+import json_codec  # noqa: E402
+import verify_phase  # noqa: E402
+from context_index import DEFAULT_OUTPUT as DEFAULT_INDEX_PATH, build_index, write_index  # noqa: E402
+from extract_project_configuration_context import (  # noqa: E402
+    CONFIG_PATH,
+    DEFAULT_OUTLINE_DEPTH,
+    PROCESS_ROOT,
+    SharedIndexes,
+    Subprocess,
+    discover_subprocesses,
+    display_path,
+    load_shared_indexes,
+    write_extract,
+)
+from hjps import REPO_ROOT, HubSpotData  # noqa: E402
+from instrumentation import add_instrumentation_arguments, carry, instrumented, span  # noqa: E402
+from prompt_layout import format_prefix_report, shared_prefix_report  # noqa: E402
+from prompt_pack_builder import DELIVERABLE_TEMPLATES, load_context_index, prefix_report_entry, write_prompt_packs  # noqa: E402
+from trace_ledger import TraceLedger, add_trace_arguments, ledger_from_args  # noqa: E402
+
+STAGES = ("index", "extract", "packs", "verify")
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_DELIVERABLES = sorted(DELIVERABLE_TEMPLATES)
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    seconds: float
+    outputs: int
+    detail: str = ""
+
+
+@dataclass
+class PipelineState:
+    """Everything one stage hands to the next."""
+
+    config: Dict[str, Any]
+    data: HubSpotData
+    executor: ThreadPoolExecutor
+    subprocesses: List[Subprocess]
+    phases: Optional[Sequence[str]] = None
+    context_index: Optional[Dict[str, Any]] = None
+    indexes: Optional[SharedIndexes] = None
+    verify_exit_codes: Dict[str, int] = field(default_factory=dict)
+    timings: List[StageTiming] = field(default_factory=list)
+
+
+def phase_root(config: Dict[str, Any], phase: str) -> Path:
+    """Phase directory (``phases/01-foundation``); the configuration points at its agents/ folder."""
+    return (PROCESS_ROOT / config["phases"][phase]["directory"]).parent
+
+
+def phase_docs(config: Dict[str, Any], phase: str) -> Path:
+    """Directory holding the phase ``overview.md`` (``docs/`` in the phases/ layout)."""
+    root = phase_root(config, phase)
+    return root / "docs" if (root / "docs" / "overview.md").exists() else root
+
+
+def phase_id(config: Dict[str, Any], phase: str) -> str:
+    """Prompt-pack phase identifier, e.g. ``01_foundation``."""
+    return phase_root(config, phase).name.replace("-", "_")
+
+
+def verification_configs(config: Dict[str, Any], phases: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Path]]:
+    """Trace, phase and log paths per phase, rooted at this checkout's phase directories.
+
+    The trace file name per phase comes from ``verify_phase.PHASES``; phases without a trace
+    yet are left out.
+    """
+    configs: Dict[str, Dict[str, Path]] = {}
+    for phase in config.get("phaseOrder", []):
+        if (phases and phase not in phases) or phase not in verify_phase.PHASES:
+            continue
+        defaults = verify_phase.PHASES[phase]
+        root = phase_root(config, phase)
+        trace = root / defaults["trace"].relative_to(defaults["phase_dir"])
+        if trace.exists():
+            configs[phase] = {"trace": trace, "phase_dir": root, "log_dir": root / "verification" / "logs"}
+    return configs
+
+
+def run_index(state: PipelineState, output_path: Path = DEFAULT_INDEX_PATH, pretty: bool = False) -> StageTiming:
+    start = time.perf_counter()
+    state.context_index = build_index()
+    write_index(state.context_index, output_path, pretty)
+    state.context_index["_source_path"] = display_path(output_path)
+    return StageTiming("index", time.perf_counter() - start, 1, f"→ {display_path(output_path)}")
+
+
+def run_extract(state: PipelineState, outline_depth: int = DEFAULT_OUTLINE_DEPTH) -> StageTiming:
+    start = time.perf_counter()
+    state.indexes = load_shared_indexes(state.subprocesses, state.executor, state.data)
+    results = list(state.executor.map(carry(lambda sub: write_extract(sub, state.indexes, outline_depth)), state.subprocesses))
+    loads = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in state.indexes.load_seconds.items())
+    return StageTiming("extract", time.perf_counter() - start, len(results), f"shared indexes: {loads}")
+
+
+def run_packs(state: PipelineState, deliverables: Sequence[str] = DEFAULT_DELIVERABLES,
+              index_path: Path = DEFAULT_INDEX_PATH, pretty: bool = False) -> StageTiming:
+    start = time.perf_counter()
+    if state.context_index is None:
+        state.context_index = load_context_index(index_path)
+
+    def build(sub: Subprocess) -> Tuple[str, List[Tuple[Path, Dict[str, Any]]]]:
+        phase = phase_id(state.config, sub.phase)
+        return phase, write_prompt_packs(phase, sub.name, deliverables, state.context_index, REPO_ROOT,
+                                         phase_docs(state.config, sub.phase), sub.directory, pretty=pretty)
+
+    results = list(state.executor.map(carry(build), state.subprocesses))
+    prompts = [prefix_report_entry(phase, pack) for phase, written in results for _, pack in written]
+    report = shared_prefix_report(prompts)
+    return StageTiming("packs", time.perf_counter() - start, len(prompts),
+                       format_prefix_report(report).splitlines()[0] if prompts else "")
+
+
+def run_verify(state: PipelineState, deep: bool = False, force: bool = False,
+               jobs: int = verify_phase.DEFAULT_JOBS) -> StageTiming:
+    start = time.perf_counter()
+    for phase, config in verification_configs(state.config, state.phases).items():
+        argv = ["--phase", phase, "--jobs", str(jobs)] + (["--deep"] if deep else []) + (["--force"] if force else [])
+        print(f"Verifying {phase}:")
+        state.verify_exit_codes[phase] = verify_phase.verify(verify_phase.parse_args(argv), config)
+    failed = sorted(phase for phase, code in state.verify_exit_codes.items() if code)
+    detail = f"discrepancies in {', '.join(failed)}" if failed else "no discrepancies"
+    return StageTiming("verify", time.perf_counter() - start, len(state.verify_exit_codes), detail)
+
+
+def run_pipeline(args: argparse.Namespace, ledger: Optional[TraceLedger] = None) -> PipelineState:
+    config = json_codec.load_path(args.config)
+    subprocesses = [sub for sub in discover_subprocesses(config, args.phase, args.subprocess) if sub.directory.exists()]
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs), thread_name_prefix="pipeline") as executor:
+        state = PipelineState(config=config, data=HubSpotData.shared(), executor=executor,
+                              subprocesses=subprocesses, phases=args.phase)
+        stages = {
+            "index": lambda: run_index(state, args.index_output, args.pretty),
+            "extract": lambda: run_extract(state, args.outline_depth),
+            "packs": lambda: run_packs(state, args.deliverables, args.index_output, args.pretty),
+            "verify": lambda: run_verify(state, args.deep, args.force, args.jobs),
+        }
+        for stage in STAGES:
+            if stage not in args.stages:
+                continue
+            started = time.time()
+            with span(stage):
+                timing = stages[stage]()
+            state.timings.append(timing)
+            if ledger:
+                ledger.record(stage, started, time.time(), subject=timing.detail, outputs=timing.outputs)
+    return state
+
+
+def format_timings(timings: Sequence[StageTiming], total: float) -> str:
+    lines = ["Stage timings:"]
+    for timing in timings:
+        lines.append(f"  {timing.stage:<8} {timing.seconds:8.3f}s  {timing.outputs:>4} outputs  {timing.detail}")
+    lines.append(f"  {'total':<8} {total:8.3f}s")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh the context index, extracts, prompt packs and verification logs in one process")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH, help="Process configuration JSON")
+    parser.add_argument("--phase", action="append", help="Limit to a phase key (repeatable)")
+    parser.add_argument("--subprocess", action="append", help="Limit extracts and packs to a subprocess/agent name (repeatable)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to run (always in pipeline order)")
+    parser.add_argument("--deliverables", nargs="+", choices=DEFAULT_DELIVERABLES, default=DEFAULT_DELIVERABLES,
+                        help="Prompt pack deliverables per subprocess")
+    parser.add_argument("--index-output", type=Path, default=DEFAULT_INDEX_PATH, help="Context index path")
+    parser.add_argument("--outline-depth", type=int, default=DEFAULT_OUTLINE_DEPTH,
+                        help=f"Branch depth expanded in workflow action outlines (default: {DEFAULT_OUTLINE_DEPTH})")
+    parser.add_argument("--deep", action="store_true", help="Also check workflow contents during verification")
+    parser.add_argument("--force", action="store_true", help="Write fresh verification logs even when inputs are unchanged")
+    parser.add_argument("--pretty", action="store_true", help="Pretty-print the JSON outputs")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"Worker threads shared by the stages (default: {DEFAULT_JOBS})")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Also write the stage timings to this JSON file")
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    ledger = ledger_from_args(args, "timesheet-docs")
+    start = time.perf_counter()
+    try:
+        with instrumented(args, "docs_pipeline"):
+            state = run_pipeline(args, ledger)
+    finally:
+        if ledger:
+            ledger.close()
+    total = time.perf_counter() - start
+
+    print(format_timings(state.timings, total))
+    if args.json_path:
+        args.json_path.parent.mkdir(parents=True, exist_ok=True)
+        args.json_path.write_text(json_codec.dumps({
+            "generated_at": datetime.now().astimezone().isoformat(),
+            "total_seconds": round(total, 6),
+            "stages": [asdict(timing) for timing in state.timings],
+            "verification": state.verify_exit_codes,
+        }, indent=2), encoding="utf-8")
+    return 1 if any(state.verify_exit_codes.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
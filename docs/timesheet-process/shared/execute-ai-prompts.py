@@ -2,64 +2,265 @@
 """
 Execute AI Prompts to Generate Documentation
 This script takes the generated prompts and uses AI to create the actual documentation content
+
+Prompts run concurrently through llm_engine (concurrency cap, rate limits, retries, timeouts).
+The default provider writes offline placeholders; pass --provider openai/anthropic for real calls.
+Every prompt starts with the system prompt and the shared/phase context as a fixed prefix
+(see prompt_layout.py), so provider prompt caching serves it after the first request; the
+shared-prefix ratio of each run or batch is printed and recorded in ai-execution-status.json.
+Each request (and each batch compile/ingest) is also appended to the shared trace ledger
+(see trace_ledger.py; --no-trace to skip). --profile, --trace-timings and --mem write an
+instrumentation report for the run (see instrumentation.py).
+
+Usage:
+    # From a sub-process directory: placeholders for the prompt files
+    python3 <repo>/analysis/timesheet_process/shared/execute-ai-prompts.py
+
+    # Real execution of the prompt files plus prompt packs, 8 at a time, 1 request/s
+    python3 <repo>/analysis/timesheet_process/shared/execute-ai-prompts.py --provider anthropic --model <model> --packs "prompt-pack.*.json" --concurrency 8 --rps 1
+
+    # Bulk: compile pending prompts into a batch file, submit it, then ingest the results
+    python3 <repo>/analysis/timesheet_process/shared/execute-ai-prompts.py --provider anthropic --model <model> --packs "phases/*/agents/*/prompt-pack.*.json" --batch-out batch.jsonl
+    python3 <repo>/analysis/timesheet_process/shared/execute-ai-prompts.py --provider anthropic --ingest-results batch-results.jsonl --manifest batch.jsonl.manifest.json
 """
 
+import glob
 import os
 import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
 import argparse
 import json
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-def execute_ai_prompt(prompt_file: str, output_file: str, context: str = ""):
-    """Execute an AI prompt and save the result"""
-    
-    # Read the prompt
-    with open(prompt_file, 'r', encoding='utf-8') as f:
-        prompt = f.read()
-    
-    # Add context if provided
-    if context:
-        prompt = f"{context}\n\n{prompt}"
-    
-    # For now, we'll create a placeholder that shows what AI would generate
-    # In a real implementation, this would call an AI API (OpenAI, Claude, etc.)
-    
-    placeholder_content = f"""# AI-Generated Content Placeholder
+import json_codec
+from hjps import REPO_ROOT
+from instrumentation import add_instrumentation_arguments, instrumented, span
+from llm_engine import LLMRequest, LLMResult, add_engine_arguments, engine_from_args, run_requests
+from prompt_batch import ingest_results, write_batch
+from prompt_layout import SHARED_SYSTEM_PROMPT, format_prefix_report, join_prefix, shared_prefix_report
+from streaming_output import StreamingOutput
+from trace_ledger import TraceLedger, add_trace_arguments, ledger_from_args
 
-This file would contain AI-generated content based on the prompt in: {prompt_file}
+DEFAULT_SYSTEM_PROMPT = SHARED_SYSTEM_PROMPT
+# Identical for every prompt file, so it belongs in the cached prefix rather than the user turn
+REFERENCE_CONTEXT = """Reference Documentation:
+- Use the 03_approval folder as a template for structure and detail level
+- Follow the same comprehensive approach as the 03_approval documentation
+- Include real HubSpot data and technical details
+- Make it implementation-ready and actionable"""
 
-## Prompt Summary:
-{prompt[:200]}...
+@dataclass
+class PromptJob:
+    """One prompt to execute and where its response goes"""
+    id: str
+    source: str
+    system: str
+    user: str
+    output_path: Path
+    prefix: Tuple[str, ...] = ()
+    group: str = ""
 
-## Next Steps:
-1. Copy the prompt from {prompt_file}
-2. Paste it into your AI tool (ChatGPT, Claude, etc.)
-3. Generate the content
-4. Save the result as {output_file}
+    def request(self, args: argparse.Namespace) -> LLMRequest:
+        return LLMRequest(self.id, self.system, self.user, model=args.model, max_tokens=args.max_tokens, prefix=self.prefix)
 
-## Context:
-{context if context else "No additional context provided"}
+def phase_context(phase: str) -> str:
+    return f"""Process Context:
+- Phase: {phase}
+- Purpose: Generate comprehensive documentation for system reengineering"""
 
----
-*Generated by execute-ai-prompts.py on {datetime.now().isoformat()}*
-"""
+def prefix_report(jobs: List[PromptJob]) -> Dict[str, Any]:
+    """Shared-prefix ratio of a set of jobs, grouped by phase"""
+    report = shared_prefix_report((job.group, join_prefix(job.system, job.prefix), job.user) for job in jobs)
+    print(f"🧩 {format_prefix_report(report)}")
+    return report
+
+def load_prompt_file_jobs(prompt_mappings: Dict[str, str], context: str = "", phase: str = "") -> List[PromptJob]:
+    """Jobs for the prompt files ai-powered-agent.py writes into the sub-process directory
+
+    The reference and phase context form the shared prefix; ``context`` (sub-process
+    specific) goes in front of each prompt after it.
+    """
+    prefix = (REFERENCE_CONTEXT, phase_context(phase)) if phase else (REFERENCE_CONTEXT,)
+    jobs = []
+    for prompt_file, output_file in prompt_mappings.items():
+        if not Path(prompt_file).exists():
+            print(f"⚠️  Prompt file not found: {prompt_file}")
+            continue
+        with open(prompt_file, 'r', encoding='utf-8') as f:
+            prompt = f.read()
+        # Add context if provided
+        if context:
+            prompt = f"{context}\n\n{prompt}"
+        jobs.append(PromptJob(prompt_file, prompt_file, DEFAULT_SYSTEM_PROMPT, prompt, Path(output_file), prefix, phase))
+    return jobs
+
+def load_prompt_pack_jobs(patterns: List[str]) -> List[PromptJob]:
+    """Jobs for prompt packs from prompt_pack_builder.py; outputs.path is relative to the repo root"""
+    jobs = []
+    for pattern in patterns:
+        for pack_path in sorted(glob.glob(pattern)) or [pattern]:
+            try:
+                pack = json_codec.load_path(Path(pack_path))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️  Skipping prompt pack {pack_path}: {e}")
+                continue
+            meta = pack.get("metadata", {})
+            job_id = f"{meta.get('phase', '?')}/{meta.get('subprocess', '?')}/{meta.get('deliverable', Path(pack_path).stem)}"
+            # Packs from prompt_pack_builder carry their shared/phase context as prefix segments
+            prefix = tuple(segment["text"] for segment in pack["prompt"].get("prefix", []))
+            jobs.append(PromptJob(
+                job_id,
+                pack_path,
+                pack["prompt"].get("system", DEFAULT_SYSTEM_PROMPT),
+                pack["prompt"]["user"],
+                REPO_ROOT / pack["outputs"]["path"],
+                prefix,
+                meta.get("phase", ""),
+            ))
+    return jobs
+
+def execute_prompts(jobs: List[PromptJob], args: argparse.Namespace, ledger: Optional[TraceLedger] = None) -> Dict[str, object]:
+    """Run every job through the execution engine, streaming each response into its output file
+
+    Responses are written to ``<output>.partial`` as they arrive and renamed into place on
+    completion; a partial left by an interrupted run is resumed on the next run.
+    """
+    engine = engine_from_args(args)
+    by_id = {job.id: job for job in jobs}
+    requests = {job.id: job.request(args) for job in jobs}
     
-    # Save the placeholder
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(placeholder_content)
+    def trace_result(result: LLMResult):
+        request = requests[result.id]
+        ended = time.time()
+        ledger.record(
+            "llm_request", ended - result.seconds, ended, subject=result.id,
+            bytes_in=len(request.system_text.encode('utf-8')) + len(request.user.encode('utf-8')),
+            bytes_out=len(result.text.encode('utf-8')),
+            prompt_tokens=int(result.usage.get("prompt_tokens") or result.usage.get("input_tokens") or request.estimated_tokens),
+            cache_hits=int(result.cached), status="ok" if result.ok else "failed",
+            attempts=result.attempts, ttfb_seconds=round(result.ttfb, 3) if result.ttfb is not None else None,
+            resumed_chars=result.resumed_chars,
+        )
     
-    print(f"✅ Created placeholder: {output_file}")
-    return True
+    def open_output(request: LLMRequest, key: str) -> StreamingOutput:
+        return StreamingOutput(by_id[request.id].output_path, key)
+    
+    def report_result(result: LLMResult):
+        job = by_id[result.id]
+        if ledger:
+            trace_result(result)
+        if not result.ok:
+            print(f"❌ {job.id}: {result.error} (after {result.attempts} attempt(s); partial kept for resume)")
+            return
+        if result.cached:
+            print(f"✅ {job.output_path} (cache)")
+        else:
+            resumed = f", resumed after {result.resumed_chars:,} chars" if result.resumed_chars else ""
+            print(f"✅ {job.output_path} (first byte {result.ttfb or 0:.2f}s, total {result.seconds:.2f}s, "
+                  f"{result.attempts} attempt(s){resumed})")
+    
+    layout = prefix_report(jobs)
+    results = run_requests(engine, list(requests.values()), report_result, open_output)
+    cache_summary = engine.cache.summary() if engine.cache else None
+    if engine.cache:
+        engine.cache.close()
+    return {
+        "provider": args.provider,
+        "engine": engine.stats.to_dict(),
+        "cache": cache_summary,
+        "prompt_layout": layout,
+        "results": [
+            {"id": r.id, "output": str(by_id[r.id].output_path), "ok": r.ok, "attempts": r.attempts,
+             "ttfb_seconds": round(r.ttfb, 3) if r.ttfb is not None else None, "seconds": round(r.seconds, 3),
+             "resumed_chars": r.resumed_chars, "cached": r.cached, "error": r.error, "usage": r.usage}
+            for r in results
+        ],
+    }
+
+def compile_batch(jobs: List[PromptJob], args: argparse.Namespace, ledger: Optional[TraceLedger] = None) -> Dict[str, object]:
+    """Write cache hits straight to their outputs and every other job into a JSONL batch file"""
+    with ledger.span("batch_compile", subject=str(args.batch_out)) if ledger else nullcontext({}) as trace:
+        execution = _compile_batch(jobs, args)
+        requests = [job.request(args) for job in jobs]
+        trace.update(
+            bytes_in=sum(len(r.system_text.encode('utf-8')) + len(r.user.encode('utf-8')) for r in requests),
+            bytes_out=args.batch_out.stat().st_size if args.batch_out.exists() else 0,
+            prompt_tokens=sum(r.estimated_tokens for r in requests),
+            cache_hits=execution["cached"],
+            requests=execution["batch"]["requests"],
+        )
+    return execution
+
+def _compile_batch(jobs: List[PromptJob], args: argparse.Namespace) -> Dict[str, object]:
+    engine = engine_from_args(args)
+    pending = []
+    cached = 0
+    layout = prefix_report(jobs)
+    for job in jobs:
+        request = job.request(args)
+        key = engine.cache_key(request)
+        hit = engine.cache.get(key) if engine.cache else None
+        if hit is not None:
+            output = StreamingOutput(job.output_path, key)
+            output.discard()
+            output.write(hit[0])
+            output.commit()
+            cached += 1
+            print(f"✅ {job.output_path} (cache)")
+            continue
+        pending.append((request, key, job.output_path.resolve()))
+    batch = write_batch(pending, engine.provider, args.batch_out)
+    cache_summary = engine.cache.summary() if engine.cache else None
+    if engine.cache:
+        engine.cache.close()
+    print(f"📦 {batch['requests']} pending prompts written to {args.batch_out} ({cached} served from cache)")
+    return {"provider": args.provider, "mode": "batch", "batch": batch, "cache": cache_summary,
+            "cached": cached, "prompt_layout": layout, "results": []}
+
+def ingest_batch(args: argparse.Namespace, ledger: Optional[TraceLedger] = None) -> Dict[str, object]:
+    """Fan a batch results file out to the outputs recorded in its manifest"""
+    engine = engine_from_args(args)
+    manifest = json_codec.load_path(args.manifest)
+    with ledger.span("batch_ingest", subject=str(args.ingest_results)) if ledger else nullcontext({}) as trace:
+        stats = ingest_results(args.ingest_results, manifest, engine.provider, engine.cache)
+        trace.update(bytes_in=args.ingest_results.stat().st_size, written=stats.written,
+                     status="failed" if stats.failed else "ok")
+    cache_summary = engine.cache.summary() if engine.cache else None
+    if engine.cache:
+        engine.cache.close()
+    for error in stats.errors:
+        print(f"❌ {error}")
+    print(f"✅ Ingested {stats.written} responses from {args.ingest_results} "
+          f"({stats.failed} failed, {stats.unknown} not in manifest)")
+    return {"provider": args.provider, "mode": "batch_ingest", "ingest": stats.to_dict(), "cache": cache_summary,
+            "results": [{"ok": False, "error": error} for error in stats.errors]}
 
 def main():
     parser = argparse.ArgumentParser(description='Execute AI Prompts to Generate Documentation')
     parser.add_argument('--sub-process', help='Sub-process name (auto-detected from current directory)')
     parser.add_argument('--phase', help='Process phase (auto-detected from path)')
     parser.add_argument('--context', help='Additional context for AI prompts')
+    parser.add_argument('--packs', nargs='*', default=[], help='Prompt pack JSON files or globs to execute (e.g. "*/prompt-pack.*.json")')
+    parser.add_argument('--batch-out', type=Path, help='Write pending prompts to this JSONL batch request file instead of calling the provider')
+    parser.add_argument('--ingest-results', type=Path, help='Write responses from a batch results JSONL file to their output paths')
+    parser.add_argument('--manifest', type=Path, help='Batch manifest for --ingest-results (written next to the --batch-out file)')
+    add_engine_arguments(parser)
+    add_trace_arguments(parser)
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
-    
+    if (args.batch_out or args.ingest_results) and args.provider == "placeholder":
+        parser.error("batch mode needs a real --provider (openai or anthropic)")
+    if args.ingest_results and not args.manifest:
+        parser.error("--ingest-results needs --manifest")
+    with instrumented(args, "execute-ai-prompts"):
+        run(args)
+
+def run(args: argparse.Namespace):
     # Auto-detect sub-process from current directory
     if not args.sub_process:
         args.sub_process = Path.cwd().name
@@ -89,49 +290,69 @@ def main():
         "properties/property-mapping-prompt.txt": "properties/property-mapping.json"
     }
     
-    # Add context about the 03_approval reference
-    context = f"""
-Reference Documentation:
-- Use the 03_approval folder as a template for structure and detail level
-- Follow the same comprehensive approach as the 03_approval documentation
-- Include real HubSpot data and technical details
-- Make it implementation-ready and actionable
-
-Process Context:
-- Phase: {args.phase}
-- Sub-process: {args.sub_process}
-- Purpose: Generate comprehensive documentation for system reengineering
-"""
+    # Reference and phase context are shared by every prompt; only the sub-process varies
+    context = f"Sub-process Context:\n- Sub-process: {args.sub_process}"
+    if args.context:
+        context += f"\n- Notes: {args.context}"
     
-    # Execute each prompt
-    for prompt_file, output_file in prompt_mappings.items():
-        if Path(prompt_file).exists():
-            execute_ai_prompt(prompt_file, output_file, context)
+    # Execute prompt files and any prompt packs concurrently (or via a batch file)
+    ledger = ledger_from_args(args, "execute-ai-prompts")
+    try:
+        if args.ingest_results:
+            jobs = []
+            with span("execute"):
+                execution = ingest_batch(args, ledger)
         else:
-            print(f"⚠️  Prompt file not found: {prompt_file}")
+            with span("parse"):
+                jobs = load_prompt_file_jobs(prompt_mappings, context, args.phase) + load_prompt_pack_jobs(args.packs)
+            with span("execute"):
+                if args.batch_out:
+                    execution = compile_batch(jobs, args, ledger)
+                else:
+                    execution = execute_prompts(jobs, args, ledger) if jobs else {"provider": args.provider, "results": []}
+    finally:
+        if ledger:
+            ledger.close()
+    failed = [r for r in execution["results"] if not r["ok"]]
+    placeholders = args.provider == "placeholder"
+    batch_status = {"batch": "batch_compiled", "batch_ingest": "batch_ingested"}.get(execution.get("mode", ""))
     
     # Generate status report
     status_report = {
         "agent": "execute_ai_prompts",
         "phase": args.phase,
         "sub_process": args.sub_process,
-        "status": "placeholders_created",
+        "status": "placeholders_created" if placeholders else ("failed" if failed else batch_status or "content_generated"),
         "timestamp": datetime.now().isoformat(),
-        "message": f"AI prompt placeholders created for {args.sub_process}",
+        "message": f"AI prompt {'placeholders created' if placeholders else 'execution finished'} for {args.sub_process}",
         "next_steps": [
             "Execute AI prompts manually using the generated placeholders",
             "Replace placeholders with actual AI-generated content",
             "Review and refine the generated documentation",
             "Test documentation completeness and accuracy"
+        ] if placeholders else [
+            "Review and refine the generated documentation",
+            "Re-run failed prompts" if failed else "Test documentation completeness and accuracy"
         ],
-        "prompt_files": list(prompt_mappings.keys())
+        "prompt_files": list(prompt_mappings.keys()),
+        "prompt_packs": [job.source for job in jobs if job.source not in prompt_mappings],
+        "execution": execution
     }
     
-    with open("ai-execution-status.json", 'w', encoding='utf-8') as f:
-        json.dump(status_report, f, indent=2)
+    with span("write"), open("ai-execution-status.json", 'w', encoding='utf-8') as f:
+        f.write(json_codec.dumps(status_report, indent=2))
     
-    print(f"✅ Created AI execution placeholders for {args.sub_process}")
-    print("📋 Next: Execute AI prompts manually to generate actual content")
+    if placeholders:
+        print(f"✅ Created AI execution placeholders for {args.sub_process}")
+        print("📋 Next: Execute AI prompts manually to generate actual content")
+    elif execution.get("mode") == "batch":
+        print("📋 Next: submit the batch file, then re-run with --ingest-results and --manifest")
+    elif execution.get("mode") != "batch_ingest":
+        engine = execution.get("engine", {})
+        print(f"✅ {engine.get('succeeded', 0)}/{len(jobs)} prompts executed in {engine.get('wall_seconds', 0)}s "
+              f"({engine.get('retries', 0)} retries, {engine.get('cached', 0)} from cache)")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
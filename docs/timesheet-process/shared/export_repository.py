@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Lazy, cached access to a directory of HubSpot JSON exports.
+
+The directory is indexed (name, path, size) on first use; documents are parsed on first
+request and kept in a byte-bounded LRU cache weighted by file size. Hit/miss/eviction
+counters make it easy to confirm a run parsed each export at most once. ``shared()`` hands
+out one repository per directory so every caller in a process shares the same cache.
+
+Usage:
+    python3 analysis/timesheet_process/shared/export_repository.py data/raw/workflows --filter 5673
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+
+import json_codec
+from json_stream import extract_fields
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bytes_parsed: int = 0
+    reparsed: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 3)}
+
+
+class ExportRepository:
+    """Indexed JSON exports under one directory with a size-bounded LRU of parsed documents."""
+
+    _shared: Dict[Tuple[str, str], "ExportRepository"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: Path, pattern: str = "*.json", max_bytes: int = DEFAULT_MAX_BYTES,
+                 loader: Callable[[Path], Any] | None = None):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.max_bytes = max_bytes
+        self.loader = loader  # full-document parser; defaults to json_codec.load_path
+        self.stats = CacheStats()
+        self._index: Dict[str, Path] | None = None
+        self._sizes: Dict[str, int] = {}
+        self._cache: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._parsed: set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    @classmethod
+    def shared(cls, directory: Path, pattern: str = "*.json") -> "ExportRepository":
+        """One repository per (directory, pattern) for the whole process."""
+        key = (str(Path(directory).resolve()), pattern)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(Path(directory), pattern)
+            return cls._shared[key]
+
+    # -- index --------------------------------------------------------------
+
+    def index(self) -> Dict[str, Path]:
+        with self._lock:
+            if self._index is None:
+                paths = sorted(self.directory.glob(self.pattern)) if self.directory.exists() else []
+                self._index = {path.name: path for path in paths}
+                self._sizes = {path.name: path.stat().st_size for path in paths}
+            return self._index
+
+    def names(self, contains: str = "") -> List[str]:
+        """File names containing ``contains`` (case-insensitive); ``*`` or empty matches all."""
+        needle = "" if contains in ("", "*") else contains.lower()
+        return [name for name in self.index() if needle in name.lower()]
+
+    def path(self, name: str) -> Path | None:
+        return self.index().get(name)
+
+    def size(self, name: str) -> int:
+        self.index()
+        return self._sizes.get(name, 0)
+
+    def is_cached(self, name: str) -> bool:
+        with self._lock:
+            return name in self._cache
+
+    # -- documents ----------------------------------------------------------
+
+    def load(self, name: str, fields: Sequence[str] | None = None) -> Any:
+        """Parsed document (or streamed ``fields`` projection) for an indexed file name."""
+        path = self.path(name)
+        if path is None:
+            raise FileNotFoundError(f"{name} not found under {self.directory}")
+        key: Hashable = (name, tuple(fields)) if fields else name
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return self._cache[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Per-key lock: concurrent callers wait for one parse instead of racing
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.stats.hits += 1
+                    return self._cache[key][0]
+            if fields:
+                value = extract_fields(path, list(fields))
+                weight = len(json_codec.dumps(value, separators=json_codec.COMPACT, default=str))
+            else:
+                value = self.loader(path) if self.loader else json_codec.load_path(path)
+                weight = self._sizes.get(name, 0)
+            with self._lock:
+                self.stats.misses += 1
+                self.stats.bytes_parsed += self._sizes.get(name, 0)
+                if key in self._parsed:
+                    self.stats.reparsed += 1
+                self._parsed.add(key)
+                self._store(key, value, weight)
+            return value
+
+    def _store(self, key: Hashable, value: Any, weight: int) -> None:
+        if weight > self.max_bytes:
+            return  # too large to keep; callers get it once
+        self._cache[key] = (value, weight)
+        self._cached_bytes += weight
+        while self._cached_bytes > self.max_bytes and self._cache:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted
+            self.stats.evictions += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "files": len(self.index()),
+            "cached_bytes": self._cached_bytes,
+            **self.stats.to_dict(),
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index and load JSON exports through the shared cache")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--filter", default="", help="Substring filter on file names")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    repo = ExportRepository(args.directory, max_bytes=args.max_bytes)
+    names = repo.names(args.filter)
+    for _ in range(2):
+        for name in names:
+            repo.load(name)
+    print(json_codec.dumps(repo.summary(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,27 +1,49 @@
 #!/usr/bin/env python3
-"""Extract enriched context for the project_configuration subprocess."""
+"""Extract enriched schema/workflow/module context for every configured subprocess.
+
+Subprocesses come from ``process-configuration.json`` (phases → agents). For each one the
+objects, workflows, and modules are derived from its ``properties/property-mapping.json``
+and ``assets/asset-inventory.json``; entries under ``contextExtracts.subprocesses`` override
+them. Schemas, workflow exports, and module metadata are loaded once into shared indexes
+and every extract is rendered from those indexes on a thread pool.
+
+Usage:
+    # Render every subprocess
+    python3 analysis/timesheet_process/shared/extract_project_configuration_context.py
+
+    # Only the original project configuration extract
+    python3 analysis/timesheet_process/shared/extract_project_configuration_context.py --subprocess project_configuration
+
+    # One phase, four render threads
+    python3 analysis/timesheet_process/shared/extract_project_configuration_context.py --phase approval --jobs 4
+"""
 
 from __future__ import annotations
 
+import argparse
 import json
-from collections import defaultdict
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
-
-REPO_ROOT = Path(__file__).resolve().parents[3]
-DATA_ROOT = REPO_ROOT / "data" / "raw"
-SCHEMA_DIR = DATA_ROOT / "ai-context" / "ai-context-export" / "data-model"
-WORKFLOW_DIR = DATA_ROOT / "workflows"
-OUTPUT_PATH = (
-    REPO_ROOT
-    / "analysis"
-    / "timesheet_process"
-    / "01_foundation"
-    / "project_configuration"
-    / "generated"
-    / "project-configuration-context.md"
-)
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import json_codec
+from instrumentation import add_instrumentation_arguments, instrumented, span
+from hjps import REPO_ROOT, HubSpotData, SchemaCollection
+from module_manifest import ModuleManifest
+from workflow_graph import WorkflowGraph
+from workflow_repository import WorkflowRepository
+
+PROCESS_ROOT = Path(__file__).resolve().parents[1]
+CONFIG_PATH = Path(__file__).resolve().parent / "process-configuration.json"
+DEFAULT_OUTPUT = "generated/{slug}-context.md"
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_OUTLINE_DEPTH = 6
 
 ASSOCIATION_OBJECT_MAP = {
     "0-1": "contacts",
@@ -45,37 +67,210 @@ ASSOCIATION_OBJECT_MAP = {
     "2-26173281": "hj_timesheets",
 }
 
-WORKFLOW_IDS = {
-    "567500453": "Consultant Approval Request",
-    "567466561": "Approval Reminder 1",
-    "567463273": "Approval Reminder 3",
-    "1680618036": "Customer Approval Response",
-    "1682422902": "H&J Approval Response",
+ASSOCIATION_TARGETS = {
+    "contacts", "companies", "deals", "hj_approvals", "hj_consultants",
+    "hj_timesheets", "hj_services", "hj_field_tickets", "hj_wells",
 }
 
 
-def load_schema() -> Dict[str, Any]:
-    matches = sorted(SCHEMA_DIR.glob("hj_projects-schema-*.json"), reverse=True)
-    if not matches:
-        raise FileNotFoundError("No hj_projects schema found under data/raw/ai-context/ai-context-export/data-model")
-    return json.loads(matches[0].read_text(encoding="utf-8"))
+@dataclass
+class Subprocess:
+    """One phase agent and the objects, workflows, and modules its extract covers."""
+
+    phase: str
+    name: str
+    directory: Path
+    output_path: Path
+    objects: List[str]
+    mapped_properties: Dict[str, List[str]]
+    workflows: Dict[str, str]
+    modules: List[str]
+    module_keywords: List[str]
+
+    @property
+    def title(self) -> str:
+        return self.name.replace("_", " ").title()
+
+
+@dataclass
+class SharedIndexes:
+    """Schemas, workflow exports, and module metadata loaded once per run."""
+
+    schemas: Dict[str, Dict[str, Any]]
+    schema_exports: SchemaCollection
+    workflows: WorkflowRepository
+    modules: ModuleManifest
+    load_seconds: Dict[str, float]
+    graphs: Dict[str, WorkflowGraph | None] = field(default_factory=dict)
+    _graph_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def schema(self, obj: str) -> Dict[str, Any] | None:
+        """The export ``SchemaCollection.find`` resolves ``obj`` to, as verify and the agent use."""
+        return self.schema_exports.for_object(obj)
+
+    def graph(self, workflow_id: str) -> WorkflowGraph | None:
+        """Build each workflow's action graph once, however many extracts render it."""
+        with self._graph_lock:
+            if workflow_id in self.graphs:
+                return self.graphs[workflow_id]
+        data = self.workflows.load(workflow_id)
+        graph = WorkflowGraph.from_workflow(data) if data else None
+        with self._graph_lock:
+            return self.graphs.setdefault(workflow_id, graph)
+
+
+def read_json(path: Path) -> Any:
+    return json_codec.load_path(path)
+
+
+def schema_properties(schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Custom schemas list ``properties``; core exports nest them under ``schema.results``."""
+    props = schema.get("properties")
+    if isinstance(props, list):
+        return props
+    nested = schema.get("schema") if isinstance(schema.get("schema"), dict) else schema
+    results = nested.get("results")
+    return results if isinstance(results, list) else []
+
+
+def object_label(schema: Dict[str, Any], obj: str) -> str:
+    labels = schema.get("labels") or {}
+    if labels.get("singular"):
+        return labels["singular"]
+    base = obj[3:] if obj.startswith("hj_") else obj
+    return base.rstrip("s").replace("_", " ").title()
+
+
+# ---------------------------------------------------------------------------
+# Shared indexes
+# ---------------------------------------------------------------------------
+
+
+def load_schema_index(schemas: SchemaCollection, executor: ThreadPoolExecutor) -> Dict[str, Dict[str, Any]]:
+    """Map every object alias to its schema export (the canonical export, else newest file)."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for alias, name in schemas.alias_index(executor).items():
+        schema = schemas.load(name)
+        if schema is not None:
+            index[alias] = schema
+    return index
+
+
+def load_shared_indexes(subprocesses: Sequence[Subprocess], executor: ThreadPoolExecutor,
+                        data: HubSpotData | None = None) -> SharedIndexes:
+    data = data or HubSpotData.shared()
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    with span("schemas"):
+        schemas = load_schema_index(data.schemas, executor)
+    timings["schemas"] = time.perf_counter() - start
+
+    # Workflow JSON itself is parsed lazily when a section renders its actions
+    start = time.perf_counter()
+    workflows = data.workflows.repository
+    with span("workflows"):
+        workflows.scan()
+    timings["workflows"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    modules = data.modules.manifest
+    with span("modules"):
+        modules.scan()
+    timings["modules"] = time.perf_counter() - start
+    return SharedIndexes(schemas=schemas, schema_exports=data.schemas, workflows=workflows, modules=modules,
+                         load_seconds=timings)
+
+
+# ---------------------------------------------------------------------------
+# Subprocess discovery
+# ---------------------------------------------------------------------------
+
+
+def _read_optional(path: Path) -> Dict[str, Any]:
+    try:
+        data = read_json(path)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def discover_subprocesses(config: Dict[str, Any], phases: Sequence[str] | None = None,
+                          names: Sequence[str] | None = None) -> List[Subprocess]:
+    extracts = config.get("contextExtracts") or {}
+    output_template = extracts.get("output", DEFAULT_OUTPUT)
+    overrides = extracts.get("subprocesses") or {}
+
+    subprocesses: List[Subprocess] = []
+    for phase in config.get("phaseOrder", []):
+        phase_cfg = config.get("phases", {}).get(phase, {})
+        if phases and phase not in phases:
+            continue
+        phase_dir = PROCESS_ROOT / phase_cfg.get("directory", "")
+        for agent in phase_cfg.get("agents", []):
+            if names and agent not in names:
+                continue
+            agent_dir = phase_dir / agent
+            inventory = _read_optional(agent_dir / "assets" / "asset-inventory.json")
+            mapping = _read_optional(agent_dir / "properties" / "property-mapping.json")
+            override = overrides.get(agent, {})
+
+            workflows = override.get("workflows")
+            if workflows is None:
+                workflows = {
+                    str(item["id"]): item.get("name") or str(item["id"])
+                    for item in inventory.get("workflows", [])
+                    if isinstance(item, dict) and item.get("id")
+                }
+            mapped = {
+                obj: list(props) for obj, props in (mapping.get("objects") or {}).items() if isinstance(props, dict)
+            }
+            objects = override.get("objects")
+            if objects is None:
+                objects = list(mapped)
+            modules = override.get("modules")
+            if modules is None:
+                modules = [item["name"] for item in inventory.get("modules", []) if isinstance(item, dict) and item.get("name")]
+
+            subprocesses.append(
+                Subprocess(
+                    phase=phase,
+                    name=agent,
+                    directory=agent_dir,
+                    output_path=agent_dir / output_template.format(slug=agent.replace("_", "-"), agent=agent),
+                    objects=objects,
+                    mapped_properties=mapped,
+                    workflows=workflows,
+                    modules=modules,
+                    module_keywords=override.get("moduleKeywords", []),
+                )
+            )
+    return subprocesses
+
 
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
 
-def build_property_tables(schema: Dict[str, Any]) -> List[str]:
+
+def build_property_tables(schema: Dict[str, Any], label: str, only: Iterable[str] | None = None) -> List[str]:
     required = set(schema.get("requiredProperties", []))
-    custom_lines = ["### Custom Project Properties", "", "| Property | Label | Type | Required | Description |", "|---|---|---|---|---|"]
+    only = set(only) if only is not None else None
+    custom_lines = [f"### Custom {label} Properties", "", "| Property | Label | Type | Required | Description |", "|---|---|---|---|---|"]
     core_lines = ["### HubSpot Core Properties", "", "| Property | Label | Type | Description |", "|---|---|---|---|"]
 
-    for prop in sorted(schema.get("properties", []), key=lambda x: x.get("name", "")):
+    for prop in sorted(schema_properties(schema), key=lambda x: x.get("name", "")):
         name = prop.get("name", "")
-        label = prop.get("label", "")
+        if only is not None and name not in only:
+            continue
+        label_text = prop.get("label", "")
         ptype = f"{prop.get('type', '')}/{prop.get('fieldType', '')}".strip("/")
         desc = (prop.get("description") or "").replace("\n", " ")
         if name.startswith("hj_"):
             required_flag = "✅" if name in required else ""
-            custom_lines.append(f"| `{name}` | {label} | {ptype} | {required_flag} | {desc} |")
+            custom_lines.append(f"| `{name}` | {label_text} | {ptype} | {required_flag} | {desc} |")
         else:
-            core_lines.append(f"| `{name}` | {label} | {ptype} | {desc} |")
+            core_lines.append(f"| `{name}` | {label_text} | {ptype} | {desc} |")
 
     if len(custom_lines) == 4:
         custom_lines.append("| _(none)_ | | | | |")
@@ -85,12 +280,12 @@ def build_property_tables(schema: Dict[str, Any]) -> List[str]:
     return ["\n".join(custom_lines), "\n".join(core_lines)]
 
 
-def build_association_table(schema: Dict[str, Any]) -> str:
+def build_association_table(schema: Dict[str, Any], prefix: str) -> str:
     lines = ["### Object Associations", "", "| Association | Target Object | Association ID | Cardinality |", "|---|---|---|---|"]
-    for assoc in sorted(schema.get("associations", []), key=lambda x: x.get("id", "")):
+    for assoc in sorted(schema.get("associations", []), key=lambda x: str(x.get("id", ""))):
         target_code = assoc.get("toObjectTypeId")
         target = ASSOCIATION_OBJECT_MAP.get(target_code, target_code)
-        if target in {"contacts", "companies", "deals", "hj_approvals", "hj_consultants", "hj_timesheets", "hj_services", "hj_field_tickets", "hj_wells"} or assoc.get("name", "").startswith("project_"):
+        if target in ASSOCIATION_TARGETS or assoc.get("name", "").startswith(prefix):
             lines.append(
                 f"| `{assoc.get('name')}` | {target} | {assoc.get('id')} | {assoc.get('cardinality')} |"
             )
@@ -99,98 +294,40 @@ def build_association_table(schema: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def load_workflow(workflow_id: str) -> Dict[str, Any] | None:
-    candidates = list(WORKFLOW_DIR.glob(f"*{workflow_id}*.json"))
-    if not candidates:
-        return None
-    # prefer files named workflow-... over v4-flow- to capture enriched metadata
-    candidates.sort(key=lambda p: ("workflow-" not in p.name, p.name))
-    return json.loads(candidates[0].read_text(encoding="utf-8"))
-
-
-def summarize_action(action: Dict[str, Any]) -> str:
-    action_id = action.get("actionId") or action.get("actionGuid") or action.get("id")
-    label = action.get("name") or action.get("type")
-    atype = action.get("type")
-    details = []
-    if atype == "SEND_EMAIL":
-        email_id = action.get("emailId") or action.get("email")
-        if email_id:
-            details.append(f"emailId={email_id}")
-        if action.get("recipientType"):
-            details.append(f"recipient={action['recipientType']}")
-    elif atype == "SET_PROPERTY":
-        details.append(f"property={action.get('propertyName')}")
-        details.append(f"value={action.get('propertyValue')}")
-    elif atype == "LIST_BRANCH":
-        branches = action.get("branches") or []
-        details.append(f"branches={len(branches)}")
-    elif atype == "DELAY_UNTIL":
-        details.append(f"delay={action.get('delayMilliseconds')}ms")
-    elif atype == "WEBHOOK":
-        details.append(action.get("webhookUrl", ""))
-    detail_str = ", ".join(filter(None, details))
-    return f"- `{action_id}` · {label} ({atype}){(' → ' + detail_str) if detail_str else ''}"
-
-
-def build_workflow_section(workflow_id: str, label: str) -> str:
-    data = load_workflow(workflow_id)
-    if not data:
+def build_object_sections(obj: str, indexes: SharedIndexes, mapped: Iterable[str] | None = None) -> List[str]:
+    schema = indexes.schema(obj)
+    if schema is None:
+        return [f"### {obj}\n- ⚠️ No schema export found for `{obj}` under data/raw/ai-context/ai-context-export/data-model"]
+    label = object_label(schema, obj)
+    # Core objects carry hundreds of properties, so only the mapped ones are listed
+    only = None if obj.startswith("hj_") else mapped
+    sections = build_property_tables(schema, label, only)
+    if schema.get("associations"):
+        sections += ["", build_association_table(schema, f"{label.lower().replace(' ', '_')}_")]
+    return sections
+
+
+def build_workflow_section(workflow_id: str, label: str, indexes: SharedIndexes,
+                           max_depth: int = DEFAULT_OUTLINE_DEPTH) -> str:
+    entry = indexes.workflows.entry(workflow_id)
+    if entry is None:
         return f"### {label}\n- ⚠️ Workflow {workflow_id} not found in data/raw/workflows"
 
-    actions = data.get("actions", [])
-    lines = [f"### {label}", "", f"- **Workflow ID:** `{workflow_id}`", f"- **Name:** {data.get('name', 'N/A')}", f"- **Object Type:** {data.get('objectType', 'unknown')} ({data.get('type', '')})", f"- **Total Actions:** {len(actions)}", "", "**Actions:**"]
-    if actions:
-        for action in actions:
-            lines.append(summarize_action(action))
+    lines = [f"### {label}", "", f"- **Workflow ID:** `{workflow_id}`", f"- **Name:** {entry.name or 'N/A'}", f"- **Object Type:** {entry.object_type or 'unknown'} ({entry.type or ''})", f"- **Total Actions:** {entry.action_count}", "", "**Actions:**"]
+    graph = indexes.graph(workflow_id) if entry.action_count else None
+    if graph and graph.nodes:
+        lines[-2:-2] = [f"- **Graph:** {graph.stats().describe()}"]
+        lines.extend(graph.outline(max_depth))
     else:
         lines.append("- (no actions found in export)")
     return "\n".join(lines)
 
 
-def build_module_summary() -> str:
-    modules_dir = DATA_ROOT / "themes" / "Timesheets-Theme" / "modules"
-    if not modules_dir.exists():
+def build_module_summary(sub: Subprocess, indexes: SharedIndexes) -> str:
+    if not indexes.modules.modules_dir.exists():
         return "### CMS Modules\n- ⚠️ Timesheets-Theme modules directory not found"
 
-    interesting = []
-    for module in modules_dir.iterdir():
-        if not module.is_dir():
-            continue
-        lowered = module.name.lower()
-        if not any(token in lowered for token in ("approval", "project", "timesheet")):
-            continue
-
-        meta_path = module / "meta.json"
-        fields_path = module / "fields.json"
-
-        label = module.name
-        description = ""
-        if meta_path.exists():
-            try:
-                meta_data = json.loads(meta_path.read_text(encoding="utf-8"))
-                description = meta_data.get("label") or meta_data.get("description") or ""
-            except json.JSONDecodeError:
-                description = "(meta.json unreadable)"
-
-        field_count = "?"
-        sample_fields: List[str] = []
-        if fields_path.exists():
-            try:
-                fields_data = json.loads(fields_path.read_text(encoding="utf-8"))
-                if isinstance(fields_data, list):
-                    field_count = len(fields_data)
-                    sample_fields = [f.get("name", "") for f in fields_data if isinstance(f, dict)]
-                elif isinstance(fields_data, dict):
-                    entries = fields_data.get("fields") or []
-                    if isinstance(entries, list):
-                        field_count = len(entries)
-                        sample_fields = [f.get("name", "") for f in entries if isinstance(f, dict)]
-            except json.JSONDecodeError:
-                field_count = "?"
-
-        fields_preview = ", ".join(name for name in sample_fields[:5] if name)
-        interesting.append((label, description, field_count, fields_preview))
+    selected = set(sub.modules) | set(indexes.modules.matching(sub.module_keywords))
 
     lines = [
         "### CMS Modules",
@@ -198,37 +335,95 @@ def build_module_summary() -> str:
         "| Module | Label/Description | Field count | Key fields |",
         "|---|---|---|---|",
     ]
-    for name, desc, count, preview in sorted(interesting):
-        display_desc = desc or "(no label)"
-        display_preview = preview or "—"
-        lines.append(f"| `{name}` | {display_desc} | {count} | {display_preview} |")
+    for name in sorted(selected):
+        info = indexes.modules.get(name)
+        if info is None:
+            lines.append(f"| `{name}` | ⚠️ not found in theme export | ? | — |")
+            continue
+        display_desc = info.label or "(no label)"
+        display_preview = ", ".join(n for n in info.field_names[:5] if n) or "—"
+        lines.append(f"| `{name}` | {display_desc} | {info.field_count} | {display_preview} |")
     if len(lines) == 4:
         lines.append("| _(none found)_ | | | |")
     return "\n".join(lines)
 
 
-def main() -> None:
-    schema = load_schema()
-    property_sections = build_property_tables(schema)
+def render_extract(sub: Subprocess, indexes: SharedIndexes, max_depth: int = DEFAULT_OUTLINE_DEPTH) -> str:
     parts = [
-        "# Project Configuration Context Extract",
+        f"# {sub.title} Context Extract",
         f"_Generated: {datetime.now().isoformat()}_",
         "",
-        *property_sections,
-        "",
-        build_association_table(schema),
-        "",
-        build_module_summary(),
-        "",
-        "## Workflows",
     ]
-    for wf_id, label in WORKFLOW_IDS.items():
+    for obj in sub.objects:
+        parts += [*build_object_sections(obj, indexes, sub.mapped_properties.get(obj)), ""]
+    parts += [build_module_summary(sub, indexes), "", "## Workflows"]
+    for wf_id, label in sub.workflows.items():
         parts.append("")
-        parts.append(build_workflow_section(wf_id, label))
-
-    OUTPUT_PATH.write_text("\n".join(parts), encoding="utf-8")
-    print(f"Context extract written to {OUTPUT_PATH.relative_to(REPO_ROOT)}")
+        parts.append(build_workflow_section(wf_id, label, indexes, max_depth))
+    return "\n".join(parts)
+
+
+def write_extract(sub: Subprocess, indexes: SharedIndexes,
+                  max_depth: int = DEFAULT_OUTLINE_DEPTH) -> Tuple[Subprocess, float]:
+    start = time.perf_counter()
+    with span("render"):
+        content = render_extract(sub, indexes, max_depth)
+    with span("write"):
+        sub.output_path.parent.mkdir(parents=True, exist_ok=True)
+        sub.output_path.write_text(content, encoding="utf-8")
+    return sub, time.perf_counter() - start
+
+
+def display_path(path: Path) -> str:
+    try:
+        return str(path.relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render schema/workflow/module context extracts for each subprocess")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH, help="Process configuration JSON")
+    parser.add_argument("--phase", action="append", help="Limit to a phase key (repeatable)")
+    parser.add_argument("--subprocess", action="append", help="Limit to a subprocess/agent name (repeatable)")
+    parser.add_argument("--outline-depth", type=int, default=DEFAULT_OUTLINE_DEPTH,
+                        help=f"Branch depth expanded in workflow action outlines (default: {DEFAULT_OUTLINE_DEPTH})")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"Worker threads for loading and rendering (default: {DEFAULT_JOBS})")
+    add_instrumentation_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    with instrumented(args, "extract_project_configuration_context"):
+        return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    with span("scan"):
+        config = read_json(args.config)
+        subprocesses = discover_subprocesses(config, args.phase, args.subprocess)
+    # Agents listed in the configuration but not yet scaffolded get no extract
+    missing = [sub for sub in subprocesses if not sub.directory.exists()]
+    subprocesses = [sub for sub in subprocesses if sub.directory.exists()]
+    if not subprocesses:
+        print("No matching subprocess directories found.", file=sys.stderr)
+        return 1
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        with span("parse"):
+            indexes = load_shared_indexes(subprocesses, executor)
+        results = list(executor.map(lambda sub: write_extract(sub, indexes, args.outline_depth), subprocesses))
+
+    loads = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in indexes.load_seconds.items())
+    print(f"Shared indexes: {len(indexes.schemas)} schema aliases, {len(indexes.workflows.entries)} workflow exports, "
+          f"{len(indexes.modules.entries)} modules ({loads})")
+    for sub, seconds in results:
+        print(f"  {sub.phase}/{sub.name}: {seconds * 1000:.1f} ms → {display_path(sub.output_path)}")
+    for sub in missing:
+        print(f"  {sub.phase}/{sub.name}: skipped (no directory at {display_path(sub.directory)})")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
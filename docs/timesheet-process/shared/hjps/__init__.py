@@ -0,0 +1,82 @@
+"""Shared data access for the HubSpot exports behind the timesheet process docs.
+
+The repository root and ``data/raw`` layout are resolved once; schemas, workflows, forms,
+and theme modules are exposed as lazily loaded collections that every script shares, so
+a run parses each export at most once (and, with ``HJPS_PARSED_CACHE=1``, later runs load
+the parsed form from ``data/raw/.cache/parsed`` instead).
+
+Usage:
+    from hjps import HubSpotData
+
+    data = HubSpotData.shared()
+    schema = data.schemas.for_object("hj_projects")
+    workflow = data.workflows.load("567358311")
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .exports import (
+    PREFERRED_SCHEMA_FILES,
+    FormCollection,
+    ModuleCollection,
+    SchemaCollection,
+    WorkflowCollection,
+    object_aliases,
+)
+from .parsed_cache import PARSE_STATS, ParsedCache, ParseStats, default_cache, load_json
+from .paths import REPO_ROOT, DataLayout, default_layout, repo_root
+
+
+class HubSpotData:
+    """The four export collections for one data layout."""
+
+    _shared: Dict[Tuple[DataLayout, bool], "HubSpotData"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, layout: Optional[DataLayout] = None, parsed_cache: Optional[ParsedCache] = None):
+        self.layout = layout or default_layout()
+        self.parsed_cache = parsed_cache if parsed_cache is not None else default_cache()
+        self.schemas = SchemaCollection.shared(self.layout.schemas, self.parsed_cache)
+        self.workflows = WorkflowCollection.shared(self.layout.workflows, self.parsed_cache)
+        self.forms = FormCollection.shared(self.layout.forms, self.parsed_cache)
+        self.modules = ModuleCollection.shared(self.layout.modules)
+
+    @classmethod
+    def shared(cls, layout: Optional[DataLayout] = None) -> "HubSpotData":
+        layout = layout or default_layout()
+        with cls._shared_lock:
+            if layout not in cls._shared:
+                cls._shared[layout] = cls(layout)
+            return cls._shared[layout]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.layout.root),
+            "parsed_cache": str(self.parsed_cache.directory) if self.parsed_cache else None,
+            "schemas": self.schemas.repository.summary(),
+            "forms": self.forms.repository.summary(),
+            "parsing": PARSE_STATS.to_dict(),
+        }
+
+
+__all__ = [
+    "PARSE_STATS",
+    "PREFERRED_SCHEMA_FILES",
+    "REPO_ROOT",
+    "DataLayout",
+    "FormCollection",
+    "HubSpotData",
+    "ModuleCollection",
+    "ParseStats",
+    "ParsedCache",
+    "SchemaCollection",
+    "WorkflowCollection",
+    "default_cache",
+    "default_layout",
+    "load_json",
+    "object_aliases",
+    "repo_root",
+]
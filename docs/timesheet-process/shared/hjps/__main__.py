@@ -0,0 +1,56 @@
+"""Summarize the export collections, or warm/clear the on-disk parsed cache.
+
+Usage:
+    # Collection sizes for the resolved repository root
+    python3 -m hjps            (from analysis/timesheet_process/shared)
+
+    # Parse every schema and workflow export into data/raw/.cache/parsed
+    python3 -m hjps --warm
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from . import PARSE_STATS, HubSpotData, ParsedCache, default_layout
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="hjps", description="Inspect the shared HubSpot export collections")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--warm", action="store_true", help="Load every schema/workflow/form export through the parsed cache")
+    action.add_argument("--clear-cache", action="store_true", help="Delete the on-disk parsed cache")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    layout = default_layout()
+    if args.clear_cache:
+        print(f"Removed {ParsedCache().clear()} parsed cache entries")
+        return 0
+    data = HubSpotData(layout, ParsedCache() if args.warm else None)
+    start = time.perf_counter()
+    if args.warm:
+        list(data.schemas.documents())
+        for path in data.workflows.paths():
+            data.workflows.load_file(path.name)
+        for name in data.forms.names():
+            data.forms.load(name)
+    report = {
+        "root": str(layout.root),
+        "schemas": len(data.schemas.names()),
+        "workflows": len(data.workflows.paths()),
+        "forms": len(data.forms.names()),
+        "modules": len(data.modules.names()),
+        "parsing": PARSE_STATS.to_dict(),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
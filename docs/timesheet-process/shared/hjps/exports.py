@@ -0,0 +1,210 @@
+"""Typed, lazily loaded collections over the HubSpot exports.
+
+Each collection wraps the repository that already indexes its export type
+(``ExportRepository`` for schemas and forms, ``WorkflowRepository`` for workflows,
+``ModuleManifest`` for theme modules) and parses through the shared loader, so documents
+are memoized in-process and, when enabled, served from the on-disk parsed cache.
+``shared()`` returns one collection per directory for the whole process.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from export_repository import ExportRepository
+from json_stream import extract
+from module_manifest import MANIFEST_NAME, ModuleEntry, ModuleManifest
+from workflow_repository import WorkflowRepository
+
+from .parsed_cache import ParsedCache, default_cache, load_json
+from .paths import default_layout
+
+# Canonical export per object where several files describe it (the CRM ``-schema-2-`` exports)
+PREFERRED_SCHEMA_FILES = {
+    "deal": "deals_schema.json",
+    "deals": "deals_schema.json",
+    "company": "companies_schema.json",
+    "contact": "contacts_schema.json",
+    "contacts": "contacts_schema.json",
+    "hj_projects": "hj_projects-schema-2-26103074.json",
+    "hj_consultants": "hj_consultants-schema-2-26103040.json",
+    "hj_wells": "hj_wells-schema-2-26102958.json",
+    "hj_approvals": "hj_approvals-schema-2-26103010.json",
+}
+
+
+def object_aliases(name: str) -> Set[str]:
+    name = name.lower()
+    aliases = {name, name.rstrip("s")}
+    if name.endswith("ies"):
+        aliases.add(name[:-3] + "y")
+    return aliases
+
+
+def schema_base_name(path: Path) -> str:
+    return re.split(r"[_-]schema", path.stem.lower(), maxsplit=1)[0]
+
+
+class _SharedByDirectory:
+    _shared: Dict[Tuple[type, str], Any] = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, directory: Path, parsed_cache: Optional[ParsedCache] = None):
+        """One collection per directory for the whole process."""
+        key = (cls, str(Path(directory).resolve()))
+        with _SharedByDirectory._shared_lock:
+            if key not in _SharedByDirectory._shared:
+                _SharedByDirectory._shared[key] = cls(Path(directory), parsed_cache or default_cache())
+            return _SharedByDirectory._shared[key]
+
+
+class SchemaCollection(_SharedByDirectory):
+    """CRM object schema exports, addressable by file name or object alias."""
+
+    def __init__(self, directory: Path, parsed_cache: Optional[ParsedCache] = None):
+        self.directory = Path(directory)
+        self.repository = ExportRepository(self.directory, loader=lambda path: load_json(path, parsed_cache))
+        self._aliases: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def paths(self) -> List[Path]:
+        return list(self.repository.index().values())
+
+    def names(self) -> List[str]:
+        return self.repository.names()
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Parsed schema by file name; None when missing, unreadable, or not an object."""
+        if self.repository.path(name) is None:
+            return None
+        try:
+            data = self.repository.load(name)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def documents(self, executor: Optional[Executor] = None) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """Every readable schema, newest file name first (parsed in parallel with ``executor``)."""
+        names = sorted(self.names(), reverse=True)
+        loaded = executor.map(self.load, names) if executor else map(self.load, names)
+        for name, data in zip(names, loaded):
+            if data is not None:
+                yield self.directory / name, data
+
+    def alias_index(self, executor: Optional[Executor] = None) -> Dict[str, str]:
+        """Object alias → schema file name (preferred exports first, then newest file wins)."""
+        with self._lock:
+            if self._aliases is not None:
+                return self._aliases
+        aliases: Dict[str, str] = {
+            alias: name for alias, name in PREFERRED_SCHEMA_FILES.items() if self.repository.path(name)
+        }
+        for path, data in self.documents(executor):
+            keys = object_aliases(schema_base_name(path))
+            if isinstance(data.get("name"), str):
+                keys |= object_aliases(data["name"])
+            for alias in keys:
+                aliases.setdefault(alias, path.name)
+        with self._lock:
+            self._aliases = aliases
+        return aliases
+
+    def find(self, obj: str) -> Optional[str]:
+        """Schema file name for an object key such as ``deal``, ``contacts`` or ``hj_projects``."""
+        key = obj.lower()
+        preferred = PREFERRED_SCHEMA_FILES.get(key)
+        if preferred and self.repository.path(preferred):
+            return preferred
+        # File-name aliases need no parsing; fall back to the full (parsed) alias index
+        for name in sorted(self.names(), reverse=True):
+            if key in object_aliases(schema_base_name(Path(name))):
+                return name
+        return self.alias_index().get(key)
+
+    def for_object(self, obj: str) -> Optional[Dict[str, Any]]:
+        name = self.find(obj)
+        return self.load(name) if name else None
+
+
+class WorkflowCollection(_SharedByDirectory):
+    """Workflow exports by ID (persisted manifest) or by file name (with field projections).
+
+    Both views parse through the same ``ExportRepository``, so a file is parsed once whether
+    it is reached by workflow ID, file name, or while the manifest is rebuilt.
+    """
+
+    def __init__(self, directory: Path, parsed_cache: Optional[ParsedCache] = None):
+        self.directory = Path(directory)
+        self.exports = ExportRepository(self.directory, loader=lambda path: load_json(path, parsed_cache))
+        self.repository = WorkflowRepository(self.directory, loader=lambda path: self.exports.load(path.name))
+        self._files: Optional[Set[str]] = None
+
+    def paths(self) -> List[Path]:
+        """Export files (directory listing only; nothing is parsed)."""
+        return sorted(self.directory.glob("*.json")) if self.directory.exists() else []
+
+    def files(self) -> Set[str]:
+        if self._files is None:
+            self._files = {path.name for path in self.paths()}
+        return self._files
+
+    def ids(self) -> List[str]:
+        return self.repository.ids()
+
+    def path(self, workflow_id: str) -> Optional[Path]:
+        return self.repository.path(workflow_id)
+
+    def load(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return self.repository.load(workflow_id)
+
+    def load_file(self, filename: str) -> Optional[Dict[str, Any]]:
+        return self.repository.load_file(filename)
+
+
+class FormCollection(_SharedByDirectory):
+    """Form exports from the AI context bundle, plus names from the CMS forms export."""
+
+    def __init__(self, directory: Path, parsed_cache: Optional[ParsedCache] = None):
+        self.directory = Path(directory)
+        self.repository = ExportRepository(self.directory, loader=lambda path: load_json(path, parsed_cache))
+        self._cms_names: Dict[Path, Optional[Set[str]]] = {}
+
+    def names(self, contains: str = "") -> List[str]:
+        return self.repository.names(contains)
+
+    def load(self, name: str) -> Any:
+        return self.repository.load(name)
+
+    def cms_form_names(self, cms_forms_path: Path) -> Optional[Set[str]]:
+        """Form names streamed out of the CMS forms export; None when it is missing."""
+        if cms_forms_path not in self._cms_names:
+            names: Optional[Set[str]] = None
+            if cms_forms_path.exists():
+                names = {name for _, name in extract(cms_forms_path, ["results[].name"]) if isinstance(name, str) and name}
+            self._cms_names[cms_forms_path] = names
+        return self._cms_names[cms_forms_path]
+
+
+class ModuleCollection(_SharedByDirectory):
+    """Theme modules from the incrementally rebuilt module manifest."""
+
+    def __init__(self, directory: Path, parsed_cache: Optional[ParsedCache] = None):
+        self.directory = Path(directory)
+        self.manifest = ModuleManifest(self.directory, default_layout().cache / MANIFEST_NAME)
+
+    def names(self) -> List[str]:
+        return self.manifest.names()
+
+    def get(self, name: str) -> Optional[ModuleEntry]:
+        return self.manifest.get(name)
+
+    def exists(self, name: str) -> bool:
+        return self.manifest.exists(name)
+
+    def matching(self, keywords) -> List[str]:
+        return self.manifest.matching(keywords)
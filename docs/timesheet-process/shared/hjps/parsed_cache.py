@@ -0,0 +1,120 @@
+"""Optional on-disk cache of parsed JSON exports.
+
+A parsed document is stored with ``marshal`` (JSON only yields types marshal supports) next
+to a header of the source path, size, mtime, and interpreter version; a later process whose
+export is unchanged loads the marshalled value instead of parsing the JSON again. Enabled
+with ``HJPS_PARSED_CACHE=1`` (or an explicit ``ParsedCache``); without it every first load
+parses JSON and only the in-process memoization applies.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import json_codec
+
+from .paths import default_layout
+
+CACHE_ENV = "HJPS_PARSED_CACHE"
+CACHE_VERSION = 1
+
+
+@dataclass
+class ParseStats:
+    """Process-wide counters: JSON documents parsed vs. served from the parsed cache."""
+
+    json_parsed: int = 0
+    json_bytes: int = 0
+    cache_loads: int = 0
+    cache_writes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+PARSE_STATS = ParseStats()
+_stats_lock = threading.Lock()
+
+
+def _count(**increments: int) -> None:
+    with _stats_lock:
+        for name, value in increments.items():
+            setattr(PARSE_STATS, name, getattr(PARSE_STATS, name) + value)
+
+
+def parse_json_file(path: Path) -> Any:
+    raw = Path(path).read_bytes()
+    value = json_codec.loads(raw)
+    _count(json_parsed=1, json_bytes=len(raw))
+    return value
+
+
+class ParsedCache:
+    """Marshalled parsed documents keyed by source path and validated by size/mtime."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else default_layout().cache / "parsed"
+
+    def entry_path(self, source: Path) -> Path:
+        digest = hashlib.sha1(str(Path(source).resolve()).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.marshal"
+
+    @staticmethod
+    def _header(source: Path) -> tuple:
+        stat = source.stat()
+        return (CACHE_VERSION, tuple(sys.version_info[:2]), str(source.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    def load(self, source: Path) -> Any:
+        source = Path(source)
+        header = self._header(source)
+        entry = self.entry_path(source)
+        try:
+            with entry.open("rb") as handle:
+                if marshal.load(handle) == header:
+                    value = marshal.load(handle)
+                    _count(cache_loads=1)
+                    return value
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        value = parse_json_file(source)
+        self._write(entry, header, value)
+        return value
+
+    def _write(self, entry: Path, header: tuple, value: Any) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with tmp.open("wb") as handle:
+                marshal.dump(header, handle)
+                marshal.dump(value, handle)
+            os.replace(tmp, entry)
+            _count(cache_writes=1)
+        except (OSError, ValueError):
+            pass  # read-only checkout or unmarshallable value; parsing still worked
+
+    def clear(self) -> int:
+        removed = 0
+        for entry in self.directory.glob("*.marshal") if self.directory.exists() else []:
+            entry.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV, "").lower() in {"1", "true", "yes", "on"}
+
+
+def default_cache() -> Optional[ParsedCache]:
+    return ParsedCache() if cache_enabled() else None
+
+
+def load_json(path: Path, cache: Optional[ParsedCache] = None) -> Any:
+    """Parse an export, through the parsed cache when one is given."""
+    return cache.load(path) if cache is not None else parse_json_file(path)
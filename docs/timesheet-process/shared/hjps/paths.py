@@ -0,0 +1,70 @@
+"""Repository root and HubSpot export layout, resolved once per process."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Sequence
+
+ROOT_ENV = "HJPS_REPO_ROOT"
+
+
+@lru_cache(maxsize=None)
+def repo_root() -> Path:
+    """Repository root: ``$HJPS_REPO_ROOT`` when set, otherwise four levels above shared/."""
+    override = os.environ.get(ROOT_ENV)
+    if override:
+        return Path(override).resolve()
+    # shared/hjps/paths.py → shared → timesheet process root → analysis → repo
+    return Path(__file__).resolve().parents[4]
+
+
+REPO_ROOT = repo_root()
+
+
+def first_existing(candidates: Sequence[Path]) -> Path:
+    return next((path for path in candidates if path.exists()), candidates[0])
+
+
+@dataclass(frozen=True)
+class DataLayout:
+    """Where each kind of export lives under ``data/raw``."""
+
+    root: Path
+    data_root: Path
+    schemas: Path
+    workflows: Path
+    forms: Path
+    cms_forms: Path
+    modules: Path
+    cache: Path
+
+    @classmethod
+    def for_root(cls, root: Path) -> "DataLayout":
+        data_root = Path(root) / "data" / "raw"
+        export = data_root / "ai-context" / "ai-context-export"
+        return cls(
+            root=Path(root),
+            data_root=data_root,
+            schemas=export / "data-model",
+            workflows=data_root / "workflows",
+            forms=export / "forms",
+            cms_forms=data_root / "hubspot-cms-api" / "forms" / "cms_forms_data.json",
+            # Theme exports have lived under both names; prefer whichever is present
+            modules=first_existing([
+                data_root / "themes" / "Timesheets-Theme" / "modules",
+                data_root / "hubspot-cms-assets" / "Timesheets-Theme" / "modules",
+            ]),
+            cache=data_root / ".cache",
+        )
+
+    def with_overrides(self, **paths: Path | None) -> "DataLayout":
+        """Copy with the given directories replaced (``None`` values keep the default)."""
+        return replace(self, **{name: Path(path) for name, path in paths.items() if path is not None})
+
+
+@lru_cache(maxsize=None)
+def default_layout() -> DataLayout:
+    return DataLayout.for_root(repo_root())
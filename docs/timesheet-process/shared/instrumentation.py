@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Profiling hooks and hot-path timers shared by the documentation tools.
+
+Each tool adds the same flags with ``add_instrumentation_arguments`` and runs inside
+``instrumented(args, tool)``:
+
+- ``--profile``: cProfile the run, worker threads included, into one ``.pstats`` file
+- ``--trace-timings``: time the nested ``span()`` blocks the tools put around scanning,
+  parsing, rendering and writing (spans nest per thread; a pool task wrapped in ``carry()``
+  nests under the span that submitted it)
+- ``--mem``: tracemalloc peak and the source lines that allocated the most
+
+With any flag set, one JSON report in a fixed layout (``REPORT_SCHEMA``) is written under
+``data/traces/profiles`` so runs of the same tool can be compared. Without flags ``span()``
+returns a shared no-op context, so the hooks cost nothing in normal runs.
+
+Usage:
+    # Span timings and top allocators for one tool run
+    python3 analysis/timesheet_process/shared/context_index.py --trace-timings --mem
+
+    # Print a report, or compare two runs span by span
+    python3 analysis/timesheet_process/shared/instrumentation.py show data/traces/profiles/context_index-<stamp>.json
+    python3 analysis/timesheet_process/shared/instrumentation.py compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+import json_codec
+from hjps import REPO_ROOT
+
+DEFAULT_REPORT_DIR = REPO_ROOT / "data" / "traces" / "profiles"
+REPORT_SCHEMA = "timesheet-docs.instrumentation/1"
+DEFAULT_TOP = 25
+# Allocations made by the import machinery and by the instrumentation itself are not the tool's.
+# They are dropped from the per-line statistics; Snapshot.filter_traces takes seconds on large runs.
+MEMORY_EXCLUDED_FILES = frozenset({
+    tracemalloc.__file__,
+    cProfile.__file__,
+    pstats.__file__,
+    __file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+})
+
+R = TypeVar("R")
+_NULL_SPAN = nullcontext()
+_active: Optional["Instrumentation"] = None
+
+
+def span(name: str) -> ContextManager[Any]:
+    """Time a block under ``name`` (nested inside the enclosing span) when ``--trace-timings`` is on."""
+    session = _active
+    if session is None or not session.timings:
+        return _NULL_SPAN
+    return session.span(name)
+
+
+def carry(func: Callable[..., R]) -> Callable[..., R]:
+    """Wrap ``func`` for a pool worker so its spans nest under the caller's current span."""
+    session = _active
+    if session is None or not session.timings:
+        return func
+    return session.carry(func)
+
+
+def attach(key: str, value: Any) -> None:
+    """Add ``value`` under ``key`` to the active session's report; a no-op when nothing is instrumented."""
+    if _active is not None:
+        _active.attach(key, value)
+
+
+def display_path(path: str) -> str:
+    try:
+        return str(Path(path).relative_to(REPO_ROOT))
+    except ValueError:
+        return path
+
+
+@dataclass
+class SpanStats:
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "total_seconds": round(self.total_seconds, 6), "max_seconds": round(self.max_seconds, 6)}
+
+
+def tree_order(paths: Sequence[str]) -> List[str]:
+    """Span paths as a tree: siblings in first-start order, each followed by its children."""
+    first = {path: position for position, path in enumerate(paths)}
+
+    def key(path: str) -> List[int]:
+        parts = path.split("/")
+        return [first.get("/".join(parts[:depth]), len(first)) for depth in range(1, len(parts) + 1)]
+
+    return sorted(paths, key=key)
+
+
+def write_profile(profilers: Sequence[cProfile.Profile], pstats_path: Path, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """Merge the profilers into one ``.pstats`` file; returns its path and the top functions by cumulative time."""
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    pstats_path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(str(pstats_path))
+    stats.sort_stats("cumulative")
+    functions = []
+    for func in stats.fcn_list[:top]:  # type: ignore[attr-defined]
+        primitive, calls, own, cumulative, _ = stats.stats[func]  # type: ignore[attr-defined]
+        filename, line, name = func
+        functions.append({
+            "function": f"{display_path(filename)}:{line}({name})",
+            "calls": calls,
+            "primitive_calls": primitive,
+            "total_seconds": round(own, 6),
+            "cumulative_seconds": round(cumulative, 6),
+        })
+    return {"pstats": display_path(str(pstats_path)), "threads": len(profilers), "top": functions}
+
+
+class Instrumentation:
+    """One instrumented run: profilers, span timers, and tracemalloc, reported together."""
+
+    def __init__(self, tool: str, profile: bool = False, timings: bool = False, mem: bool = False,
+                 report_dir: Path = DEFAULT_REPORT_DIR, top: int = DEFAULT_TOP):
+        self.tool = tool
+        self.profile = profile
+        self.timings = timings
+        self.mem = mem
+        self.report_dir = Path(report_dir)
+        self.top = top
+        self.stem = f"{tool}-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.spans: Dict[str, SpanStats] = {}
+        self.extra: Dict[str, Any] = {}
+        self._profilers: List[cProfile.Profile] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_at = ""
+        self._wall = self._cpu = 0.0
+        self._tracing_memory = False
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        path = "/".join(stack)
+        with self._lock:
+            # Registered on entry: a parent is always registered before its children
+            stats = self.spans.setdefault(path, SpanStats())
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                stats.calls += 1
+                stats.total_seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+
+    def carry(self, func: Callable[..., R]) -> Callable[..., R]:
+        prefix = list(self._local.__dict__.get("stack", []))
+
+        def run(*args: Any, **kwargs: Any) -> R:
+            stack = self._local.__dict__.setdefault("stack", [])
+            saved = stack[:]
+            stack[:] = prefix
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stack[:] = saved
+        return run
+
+    def attach(self, key: str, value: Any) -> None:
+        """Add a tool-specific section (e.g. a profile the tool took itself) to the report."""
+        self.extra[key] = value
+
+    def _profile_thread(self, frame: Any, event: str, arg: Any) -> None:
+        # Runs once as the first profile event of each new thread; the thread's own profiler replaces it
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._profilers.append(profiler)
+        profiler.enable()
+
+    def start(self) -> None:
+        self._started_at = datetime.now().astimezone().isoformat()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        if self.mem and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing_memory = True
+        if self.profile:
+            profiler = cProfile.Profile()
+            self._profilers.append(profiler)
+            threading.setprofile(self._profile_thread)
+            profiler.enable()
+
+    def stop(self) -> Dict[str, Any]:
+        wall, cpu = time.perf_counter() - self._wall, time.process_time() - self._cpu
+        memory = self._memory_report() if self._tracing_memory else None
+        profile = None
+        if self.profile:
+            self._profilers[0].disable()
+            threading.setprofile(None)
+            profile = write_profile(self._profilers, self.report_dir / f"{self.stem}.pstats", self.top)
+        return {
+            "schema": REPORT_SCHEMA,
+            "tool": self.tool,
+            "argv": sys.argv[1:],
+            "started_at": self._started_at,
+            "python": platform.python_version(),
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(cpu, 6),
+            "spans": {path: self.spans[path].to_dict() for path in tree_order(self.spans)},
+            "profile": profile,
+            "memory": memory,
+            **self.extra,
+        }
+
+    def _memory_report(self) -> Dict[str, Any]:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        statistics = [stat for stat in snapshot.statistics("lineno") if stat.traceback[0].filename not in MEMORY_EXCLUDED_FILES]
+        return {
+            "peak_bytes": peak,
+            "current_bytes": current,
+            "top": [
+                {"location": f"{display_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                 "size_bytes": stat.size, "count": stat.count}
+                for stat in statistics[:self.top]
+            ],
+        }
+
+    def write(self, report: Dict[str, Any]) -> Path:
+        path = self.report_dir / f"{self.stem}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json_codec.dumps(report, indent=2, default=str), encoding="utf-8")
+        return path
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser, profile_help: Optional[str] = None) -> None:
+    """Instrumentation flags shared by the documentation tools."""
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--profile", action="store_true",
+                       help=profile_help or "cProfile the run (all threads) into a .pstats file next to the JSON report")
+    group.add_argument("--trace-timings", action="store_true",
+                       help="Time nested spans around scanning, parsing, rendering and writing")
+    group.add_argument("--mem", action="store_true", help="Report tracemalloc peak and top allocating lines")
+    group.add_argument("--instrument-dir", type=Path, default=DEFAULT_REPORT_DIR,
+                       help="Directory for instrumentation reports (default: data/traces/profiles)")
+
+
+@contextmanager
+def instrumented(args: argparse.Namespace, tool: str, profile: Optional[bool] = None) -> Iterator[Instrumentation]:
+    """Instrument the enclosed run as requested by the flags in ``args``; the report is written on exit.
+
+    Pass ``profile=False`` when the tool profiles a narrower section itself (and attaches it).
+    """
+    global _active
+    requested = args.profile or args.trace_timings or args.mem
+    session = Instrumentation(tool, profile=args.profile if profile is None else profile,
+                              timings=args.trace_timings, mem=args.mem, report_dir=args.instrument_dir)
+    if not requested:
+        yield session
+        return
+    previous, _active = _active, session
+    session.start()
+    try:
+        yield session
+    finally:
+        _active = previous
+        report = session.stop()
+        path = session.write(report)
+        if session.timings:
+            print(format_spans(report), file=sys.stderr)
+        print(f"Instrumentation report written to {display_path(str(path))}", file=sys.stderr)
+
+
+def format_spans(report: Dict[str, Any]) -> str:
+    lines = [f"Span timings ({report['tool']}, {report['wall_seconds']:.3f}s wall):"]
+    for path, stats in report.get("spans", {}).items():
+        indent = "  " * path.count("/")
+        lines.append(f"  {indent}{path.rsplit('/', 1)[-1]:<{max(4, 28 - len(indent))}} "
+                     f"{stats['total_seconds']:9.4f}s  {stats['calls']:>6} calls  max {stats['max_seconds']:.4f}s")
+    return "\n".join(lines)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [format_spans(report), f"  cpu {report['cpu_seconds']:.3f}s, Python {report['python']}, argv: {' '.join(report['argv'])}"]
+    if report.get("profile"):
+        lines.append(f"Top functions by cumulative time ({report['profile']['pstats']}):")
+        lines += [f"  {func['cumulative_seconds']:9.4f}s  {func['calls']:>7}  {func['function']}" for func in report["profile"]["top"][:10]]
+    if report.get("memory"):
+        memory = report["memory"]
+        lines.append(f"Memory: peak {memory['peak_bytes'] / 1e6:.1f} MB; top allocators:")
+        lines += [f"  {entry['size_bytes'] / 1e3:9.1f} kB  {entry['count']:>7}  {entry['location']}" for entry in memory["top"][:10]]
+    return "\n".join(lines)
+
+
+def compare_reports(base: Dict[str, Any], new: Dict[str, Any]) -> str:
+    """Side-by-side wall/CPU, span, and peak-memory deltas between two reports of the same layout."""
+    if base.get("schema") != new.get("schema"):
+        raise ValueError(f"Report layouts differ: {base.get('schema')} vs {new.get('schema')}")
+
+    def row(label: str, before: Optional[float], after: Optional[float], unit: str = "s") -> str:
+        if before is None or after is None:
+            change = "only in " + ("new" if before is None else "base")
+        else:
+            change = f"{after / before:5.2f}x" if before else "n/a"
+        fmt = (lambda v: "-" if v is None else f"{v:.4f}{unit}") if unit == "s" else (lambda v: "-" if v is None else f"{v / 1e6:.1f}MB")
+        return f"  {label:<36} {fmt(before):>12} {fmt(after):>12}  {change}"
+
+    lines = [f"{base['tool']} ({base['started_at']}) → {new['tool']} ({new['started_at']})",
+             row("wall", base["wall_seconds"], new["wall_seconds"]),
+             row("cpu", base["cpu_seconds"], new["cpu_seconds"])]
+    paths = sorted(set(base.get("spans", {})) | set(new.get("spans", {})))
+    for path in paths:
+        before, after = base.get("spans", {}).get(path), new.get("spans", {}).get(path)
+        lines.append(row(path, before and before["total_seconds"], after and after["total_seconds"]))
+    if base.get("memory") or new.get("memory"):
+        lines.append(row("memory peak", (base.get("memory") or {}).get("peak_bytes"),
+                         (new.get("memory") or {}).get("peak_bytes"), unit="B"))
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect and compare instrumentation reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="Print a report")
+    show.add_argument("report", type=Path)
+    compare = commands.add_parser("compare", help="Compare two reports span by span")
+    compare.add_argument("base", type=Path)
+    compare.add_argument("new", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "show":
+        print(format_report(json_codec.load_path(args.report)))
+        return 0
+    try:
+        print(compare_reports(json_codec.load_path(args.base), json_codec.load_path(args.new)))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""JSON codec shared by the timesheet tools: orjson when installed, the stdlib otherwise.
+
+Both backends emit the same text for the two output modes the tools write:
+
+* pretty  - ``dumps(value, indent=2)`` (``json.dumps(value, indent=2)``)
+* compact - ``dumps(value, separators=COMPACT)`` (``json.dumps(value, separators=(",", ":"))``)
+
+``ensure_ascii``, ``sort_keys`` and ``default`` behave as in ``json.dumps``. Anything orjson
+cannot reproduce exactly falls back to the stdlib for that call: other indents or separators,
+integers beyond 64 bits, non-string keys, lone surrogates, and floats that orjson formats
+differently from ``repr`` (exponents, values below 1e-4). NaN and infinities are the one
+exception: they are not JSON, and orjson writes them as ``null``.
+
+Decoding accepts ``str``, ``bytes``, ``bytearray`` and ``memoryview``; ``load_path`` reads
+files as bytes (memory-mapped above ``MMAP_THRESHOLD``), so no UTF-8 text decoding pass
+happens before parsing. Documents orjson rejects (NaN tokens, huge integers) are re-parsed
+by the stdlib, which raises ``json.JSONDecodeError`` if they are not JSON at all.
+
+Usage examples:
+
+    # Which backend the tools will use (TIMESHEET_JSON_BACKEND=json forces the stdlib)
+    python3 analysis/timesheet_process/shared/json_codec.py backends
+
+    # Compare backends over the captured API payloads and responses
+    python3 analysis/timesheet_process/shared/json_codec.py benchmark
+
+    # Benchmark specific files, 50 rounds each
+    python3 analysis/timesheet_process/shared/json_codec.py benchmark data/raw/workflows/*.json --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+try:  # optional accelerated backend
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on local environment
+    orjson = None
+
+BACKEND_ENV = "TIMESHEET_JSON_BACKEND"
+COMPACT: Tuple[str, str] = (",", ":")
+PRETTY_INDENT = 2
+MMAP_THRESHOLD = 1 << 20
+DEFAULT_BENCH_GLOB = "docs/issues/*/data/*.json"
+
+JSONInput = str | bytes | bytearray | memoryview
+
+# Number tokens orjson writes differently from float.__repr__: any exponent form, and
+# values below 1e-4 that it spells out in full (``0.00001`` where repr gives ``1e-05``).
+# orjson always spells exponents ``<digit>e``, so with every digit mapped to ``0`` two
+# substring searches find all candidates; each is then confirmed as a whole token in value
+# position. A hit inside a string value only costs a stdlib fallback, never wrong output.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_FLOAT_HINTS = (b"0e", b"0.0000")
+_FLOAT_TOKEN = re.compile(rb"-?(?:\d+(?:\.\d+)?e[-+]?\d+|0\.0000\d*)")
+_NUMBER_BYTES = frozenset(b"0123456789.-+e")
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+
+
+def _has_divergent_float(raw: bytes) -> bool:
+    masked = raw.translate(_DIGITS_TO_ZERO)
+    for hint in _FLOAT_HINTS:
+        index = masked.find(hint)
+        while index != -1:
+            start = index
+            while start and raw[start - 1] in _NUMBER_BYTES:
+                start -= 1
+            token = _FLOAT_TOKEN.match(raw, start)
+            if (token and (start == 0 or raw[start - 1] in b"[:, \n")
+                    and (token.end() == len(raw) or raw[token.end()] in b",]}\n")):
+                return True
+            index = masked.find(hint, index + 1)
+    return False
+
+
+def _escape_non_ascii(match: re.Match) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+class StdlibCodec:
+    """``json`` module backend (always available)."""
+
+    name = "json"
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, value: Any, *, indent: int | None = None, separators: Tuple[str, str] | None = None,
+              sort_keys: bool = False, ensure_ascii: bool = True, default: Callable[[Any], Any] | None = None) -> str:
+        return json.dumps(value, indent=indent, separators=separators, sort_keys=sort_keys,
+                          ensure_ascii=ensure_ascii, default=default)
+
+
+class OrjsonCodec(StdlibCodec):
+    """orjson backend, falling back to the stdlib wherever the output would differ."""
+
+    name = "orjson"
+
+    def loads(self, data: JSONInput) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def dumps(self, value: Any, *, indent: int | None = None, separators: Tuple[str, str] | None = None,
+              sort_keys: bool = False, ensure_ascii: bool = True, default: Callable[[Any], Any] | None = None) -> str:
+        pretty = indent == PRETTY_INDENT and separators in (None, (",", ": "))
+        compact = indent is None and separators == COMPACT
+        if pretty or compact:
+            # datetimes and dataclasses go through ``default`` exactly as the stdlib sends them
+            option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                raw = orjson.dumps(value, default=default, option=option)
+            except orjson.JSONEncodeError:
+                raw = None
+            if raw is not None and not _has_divergent_float(raw):
+                text = raw.decode("utf-8")
+                # Non-ASCII (and DEL) can only occur inside strings, where the stdlib escapes it
+                if ensure_ascii and (not text.isascii() or "\x7f" in text):
+                    text = _NON_ASCII.sub(_escape_non_ascii, text)
+                return text
+        return super().dumps(value, indent=indent, separators=separators, sort_keys=sort_keys,
+                             ensure_ascii=ensure_ascii, default=default)
+
+
+def available_backends() -> List[str]:
+    backends = ["json"]
+    if orjson is not None:
+        backends.append("orjson")
+    return backends
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    if backend == "auto":
+        return "orjson" if orjson is not None else "json"
+    if backend not in available_backends():
+        raise ValueError(f"JSON backend '{backend}' is not available (installed: {', '.join(available_backends())})")
+    return backend
+
+
+def get_codec(backend: str = "auto") -> StdlibCodec:
+    return OrjsonCodec() if resolve_backend(backend) == "orjson" else StdlibCodec()
+
+
+CODEC = get_codec(os.environ.get(BACKEND_ENV) or "auto")
+
+
+def loads(data: JSONInput) -> Any:
+    """Parse a JSON document from text or an undecoded byte buffer."""
+    return CODEC.loads(data)
+
+
+def dumps(value: Any, *, indent: int | None = None, separators: Tuple[str, str] | None = None,
+          sort_keys: bool = False, ensure_ascii: bool = True, default: Callable[[Any], Any] | None = None) -> str:
+    """``json.dumps`` with the same keyword arguments and output, on the fastest backend."""
+    return CODEC.dumps(value, indent=indent, separators=separators, sort_keys=sort_keys,
+                       ensure_ascii=ensure_ascii, default=default)
+
+
+def load_path(path: Path, mmap_threshold: int = MMAP_THRESHOLD, codec: StdlibCodec | None = None) -> Any:
+    """Parse a file from its bytes, memory-mapping it when it is at least ``mmap_threshold`` bytes."""
+    codec = codec or CODEC
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if not size or size < mmap_threshold:
+            return codec.loads(handle.read())
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return codec.loads(view)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _best(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(paths: Sequence[Path], repeat: int = 20) -> Dict[str, Any]:
+    """Best-of-``repeat`` seconds per operation over all files, for each installed backend.
+
+    Loads include file I/O and are compared with the pre-codec ``json.loads(path.read_text())``;
+    dumps are compared with ``json.dumps``. Every backend's pretty and compact output is
+    checked against the stdlib's byte for byte.
+    """
+    raw = {path: path.read_bytes() for path in paths}
+    values = {path: json.loads(data) for path, data in raw.items()}
+    total_bytes = sum(len(data) for data in raw.values())
+    rows: List[Dict[str, Any]] = []
+
+    def row(backend: str, operation: str, func: Callable[[], Any]) -> None:
+        seconds = _best(func, repeat)
+        rows.append({"backend": backend, "operation": operation, "seconds": seconds,
+                     "mb_per_s": total_bytes / seconds / 1_000_000 if seconds else None})
+
+    row("json", "read_text + loads", lambda: [json.loads(path.read_text(encoding="utf-8")) for path in paths])
+    reference = {
+        mode: {path: json.dumps(value, **kwargs) for path, value in values.items()}
+        for mode, kwargs in (("pretty", {"indent": PRETTY_INDENT}), ("compact", {"separators": COMPACT}))
+    }
+    mismatches: Dict[str, List[str]] = {}
+    for backend in available_backends():
+        codec = get_codec(backend)
+        row(backend, "load_path", lambda: [load_path(path, codec=codec) for path in paths])
+        row(backend, "load_path (mmap)", lambda: [load_path(path, 0, codec) for path in paths])
+        row(backend, "dumps pretty", lambda: [codec.dumps(value, indent=PRETTY_INDENT) for value in values.values()])
+        row(backend, "dumps compact", lambda: [codec.dumps(value, separators=COMPACT) for value in values.values()])
+        mismatches[backend] = [
+            f"{mode}: {path}"
+            for mode, kwargs in (("pretty", {"indent": PRETTY_INDENT}), ("compact", {"separators": COMPACT}))
+            for path, value in values.items()
+            if codec.dumps(value, **kwargs) != reference[mode][path]
+        ]
+    return {"files": len(paths), "bytes": total_bytes, "repeat": repeat, "rows": rows, "mismatches": mismatches}
+
+
+def format_benchmark(report: Dict[str, Any]) -> str:
+    """Markdown table; loads are compared with the text baseline, dumps with the stdlib's."""
+    stdlib = {row["operation"]: row["seconds"] for row in report["rows"] if row["backend"] == "json"}
+    lines = [
+        f"Files: {report['files']}, {report['bytes'] / 1_000_000:.2f} MB, best of {report['repeat']}",
+        "| Backend | Operation | ms | MB/s | vs stdlib |",
+        "|---|---|---|---|---|",
+    ]
+    for row in report["rows"]:
+        base = stdlib[row["operation"]] if row["operation"].startswith("dumps") else stdlib["read_text + loads"]
+        lines.append(f"| {row['backend']} | {row['operation']} | {row['seconds'] * 1000:.2f} | "
+                     f"{row['mb_per_s']:.0f} | {base / row['seconds']:.1f}x |")
+    for backend, mismatches in report["mismatches"].items():
+        status = "identical to stdlib" if not mismatches else f"{len(mismatches)} mismatches: {', '.join(mismatches[:5])}"
+        lines.append(f"{backend} pretty/compact output: {status}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect or benchmark the shared JSON codec.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backends", help="List installed backends and the one in use")
+    bench_parser = sub.add_parser("benchmark", help="Compare backends on real JSON files")
+    bench_parser.add_argument("paths", type=Path, nargs="*", help=f"JSON files (default: {DEFAULT_BENCH_GLOB})")
+    bench_parser.add_argument("--repeat", type=int, default=20, help="Rounds per operation; the best is reported")
+    bench_parser.add_argument("--json", action="store_true", help="Print the raw report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "backends":
+        print(f"installed: {', '.join(available_backends())}; in use: {CODEC.name}")
+        return 0
+
+    from hjps import REPO_ROOT  # hjps imports this module, so the root is resolved here
+
+    paths = args.paths or sorted(REPO_ROOT.glob(DEFAULT_BENCH_GLOB))
+    if not paths:
+        print(f"No JSON files to benchmark (looked for {DEFAULT_BENCH_GLOB})", file=sys.stderr)
+        return 2
+    report = benchmark(paths, max(1, args.repeat))
+    print(dumps(report, indent=2, default=str) if args.json else format_benchmark(report))
+    return 1 if any(report["mismatches"].values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
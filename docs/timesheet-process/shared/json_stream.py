@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""Streaming extraction of selected paths from large HubSpot JSON exports.
+
+Exports such as ``cms_forms_data.json`` and the workflow files under
+``data/raw/workflows`` are often loaded in full just to read a handful of
+fields. This module walks the document as a stream and only materialises the
+values under the requested paths. Everything off the requested paths is
+skipped without building Python objects, so memory stays bounded by the chunk
+size plus the size of the matched values.
+
+Paths use a small dotted syntax where ``[]`` means "every array element":
+
+    results[].name        -> every form name
+    actions[].type        -> every top-level workflow action type
+    id                    -> the top-level ``id`` value
+
+Two backends produce the same ``(prefix, event, value)`` stream:
+
+* ``python`` - the pure-Python incremental tokenizer below (always available);
+  ``extract`` only tokenizes along the requested paths and skips the rest
+* ``ijson``  - ijson's fastest installed backend (yajl2_c when compiled)
+
+Usage examples:
+
+    # Print every form name from the CMS forms export
+    python3 analysis/timesheet_process/shared/json_stream.py extract data/raw/hubspot-cms-api/forms/cms_forms_data.json 'results[].name'
+
+    # Compare time and peak RSS against json.load on a synthetic 200k-entry export
+    python3 analysis/timesheet_process/shared/json_stream.py benchmark --synthesize 200000 --path 'results[].name'
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from json.decoder import scanstring
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+try:  # optional C-accelerated backend
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - depends on local environment
+    ijson = None
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Event = Tuple[str, str, Any]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+# Consumes everything up to the next bracket, stepping over complete strings in one C-level match
+_SKIP = re.compile(r'[^"{}\[\]]*(?:"(?:[^"\\]|\\.)*"[^"{}\[\]]*)*')
+_DECODER = json.JSONDecoder(parse_float=Decimal)
+_LITERALS = {"true": ("boolean", True), "false": ("boolean", False), "null": ("null", None)}
+
+
+class StreamError(ValueError):
+    """Raised when the stream is not valid JSON."""
+
+
+def available_backends() -> List[str]:
+    backends = ["python"]
+    if ijson is not None:
+        backends.append("ijson")
+    return backends
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    if backend == "auto":
+        return "ijson" if ijson is not None else "python"
+    if backend not in available_backends():
+        raise ValueError(f"JSON stream backend '{backend}' is not available (installed: {', '.join(available_backends())})")
+    return backend
+
+
+def pattern_to_prefix(pattern: str) -> str:
+    """Translate ``results[].name`` into the event prefix ``results.item.name``."""
+    parts: List[str] = []
+    for part in pattern.split("."):
+        depth = 0
+        while part.endswith("[]"):
+            part = part[:-2]
+            depth += 1
+        if part:
+            parts.append(part)
+        parts.extend(["item"] * depth)
+    return ".".join(parts)
+
+
+class _Tokenizer:
+    """Incremental JSON tokenizer over a text stream read in fixed-size chunks."""
+
+    def __init__(self, handle: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int | None = None) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer stays near one chunk in size
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self) -> bool:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return True
+            if not self._fill():
+                return False
+
+    def tokens(self) -> Iterator[Tuple[str, Any]]:
+        while self._skip_whitespace():
+            char = self.buffer[self.pos]
+            if char in "{}[]:,":
+                self.pos += 1
+                yield char, None
+            elif char == '"':
+                yield "string", self._read_string()
+            elif char == "-" or char.isdigit():
+                yield "number", self._read_number()
+            else:
+                yield self._read_literal()
+
+    def _read_string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.pos + 1, True)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise StreamError(f"Unterminated string: {exc}") from None
+            self.pos = end
+            return value
+
+    def _read_number(self) -> Any:
+        while True:
+            # A number running to the end of the buffer may continue in the next chunk
+            if _NUMBER_CHARS.match(self.buffer, self.pos).end() == len(self.buffer) and self._fill():
+                continue
+            match = _NUMBER.match(self.buffer, self.pos)
+            if not match:
+                raise StreamError(f"Invalid number near: {self.buffer[self.pos:self.pos + 20]!r}")
+            self.pos = match.end()
+            text = match.group(0)
+            if match.group(1) or match.group(2):
+                return Decimal(text)
+            return int(text)
+
+    def _read_literal(self) -> Tuple[str, Any]:
+        while len(self.buffer) - self.pos < 5 and self._fill():
+            pass
+        for literal, token in _LITERALS.items():
+            if self.buffer.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return token
+        raise StreamError(f"Unexpected token near: {self.buffer[self.pos:self.pos + 20]!r}")
+
+    # -- pruned access used by extract() -------------------------------------
+
+    def peek(self) -> str:
+        if not self._skip_whitespace():
+            raise StreamError("Unexpected end of JSON stream")
+        return self.buffer[self.pos]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise StreamError(f"Expected {char!r} near: {self.buffer[self.pos:self.pos + 20]!r}")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """Decode one complete value with the C decoder, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Grow geometrically so large values are not re-decoded once per chunk
+                if self._fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    continue
+                raise StreamError(f"Invalid JSON value near: {self.buffer[self.pos:self.pos + 20]!r}") from None
+            # A number running to the end of the buffer may continue in the next chunk; the
+            # decoder stops early at a trailing "." or "e", so check the token, not ``end``
+            if _NUMBER_CHARS.match(self.buffer, self.pos).end() == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Skip one value; containers that straddle the buffer are skipped bracket by bracket."""
+        if self.peek() not in "{[":
+            self.read_value()
+            return
+        try:
+            # Fast path: the whole container is already buffered, so the C decoder can step over it
+            _, self.pos = _DECODER.raw_decode(self.buffer, self.pos)
+            return
+        except json.JSONDecodeError:
+            pass
+        depth = 0
+        while True:
+            self.pos = _SKIP.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer) or self.buffer[self.pos] == '"':
+                # end of buffer, or a string that continues in the next chunk
+                if not self._fill():
+                    raise StreamError("Unexpected end of JSON stream")
+                continue
+            char = self.buffer[self.pos]
+            self.pos += 1
+            if char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _python_extract(handle: IO[str], targets: Dict[str, str], chunk_size: int) -> Iterator[Tuple[str, Any]]:
+    """Descend only along the path spine leading to ``targets``; skip every other value."""
+    tokenizer = _Tokenizer(handle, chunk_size)
+    spine: Set[str] = {""}
+    for prefix in targets:
+        parts = prefix.split(".")
+        spine.update(".".join(parts[:depth]) for depth in range(1, len(parts)))
+
+    def walk(prefix: str) -> Iterator[Tuple[str, Any]]:
+        if prefix in targets:
+            value = tokenizer.read_value()
+            yield targets[prefix], value
+            yield from _nested_matches(value, prefix, targets)
+            return
+        char = tokenizer.peek()
+        if prefix not in spine or char not in "{[":
+            tokenizer.skip_value()
+            return
+        closing = "}" if char == "{" else "]"
+        tokenizer.pos += 1
+        first = True
+        while tokenizer.peek() != closing:
+            if not first:
+                tokenizer.expect(",")
+            first = False
+            if char == "{":
+                if tokenizer.peek() != '"':
+                    raise StreamError("Expected object key")
+                key = tokenizer._read_string()
+                tokenizer.expect(":")
+                child = f"{prefix}.{key}" if prefix else key
+            else:
+                child = f"{prefix}.item" if prefix else "item"
+            yield from walk(child)
+        tokenizer.pos += 1
+
+    yield from walk("")
+
+
+def _walk_loaded(data: Any, parts: Sequence[str]) -> Iterable[Any]:
+    """Yield the values under an already-split prefix within loaded data."""
+    if not parts:
+        yield data
+        return
+    head, rest = parts[0], parts[1:]
+    if head == "item":
+        for item in data if isinstance(data, list) else []:
+            yield from _walk_loaded(item, rest)
+    elif isinstance(data, dict) and head in data:
+        yield from _walk_loaded(data[head], rest)
+
+
+def _nested_matches(value: Any, prefix: str, targets: Dict[str, str]) -> Iterator[Tuple[str, Any]]:
+    """Yield matches for targets nested inside an already materialised ``value``."""
+    base = f"{prefix}." if prefix else ""
+    for target, pattern in targets.items():
+        if target != prefix and target.startswith(base):
+            for match in _walk_loaded(value, target[len(base):].split(".")):
+                yield pattern, match
+
+
+def _python_parse(handle: IO[str], chunk_size: int) -> Iterator[Event]:
+    """Yield ijson-compatible ``(prefix, event, value)`` tuples."""
+    path: List[str] = []
+    # Container stack: "map" or "array"; expect_key tracks map key position
+    stack: List[str] = []
+    expect_key = False
+
+    def prefix() -> str:
+        return ".".join(path)
+
+    def close_value() -> None:
+        nonlocal expect_key
+        if stack and stack[-1] == "map":
+            path.pop()
+            expect_key = True
+
+    for token, value in _Tokenizer(handle, chunk_size).tokens():
+        if token in (",", ":"):
+            continue
+        if expect_key:
+            if token == "}":
+                stack.pop()
+                expect_key = False
+                yield prefix(), "end_map", None
+                close_value()
+            elif token == "string":
+                yield prefix(), "map_key", value
+                path.append(value)
+                expect_key = False
+            else:
+                raise StreamError(f"Expected object key, found {token!r}")
+            continue
+
+        if token == "{":
+            yield prefix(), "start_map", None
+            stack.append("map")
+            expect_key = True
+            continue
+        if token == "[":
+            yield prefix(), "start_array", None
+            stack.append("array")
+            path.append("item")
+            continue
+        if token == "]":
+            if not stack or stack[-1] != "array":
+                raise StreamError("Unbalanced ']'")
+            stack.pop()
+            path.pop()
+            yield prefix(), "end_array", None
+            close_value()
+            continue
+        if token == "}":
+            raise StreamError("Unbalanced '}'")
+        yield prefix(), token, value
+        close_value()
+
+    if stack:
+        raise StreamError("Unexpected end of JSON stream")
+
+
+def parse_events(source: Path | IO[str], backend: str = "auto", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Event]:
+    """Yield ``(prefix, event, value)`` tuples for ``source`` using the selected backend."""
+    backend = resolve_backend(backend)
+    if isinstance(source, (str, Path)):
+        if backend == "ijson":
+            with open(source, "rb") as handle:
+                yield from ijson.parse(handle, buf_size=chunk_size)
+        else:
+            with open(source, "r", encoding="utf-8") as handle:
+                yield from _python_parse(handle, chunk_size)
+        return
+    if backend == "ijson":
+        yield from ijson.parse(source, buf_size=chunk_size)
+    else:
+        yield from _python_parse(source, chunk_size)
+
+
+def _build_value(events: Iterator[Event], first_event: str) -> Any:
+    """Materialise the container that begins with ``first_event``."""
+    root: Any = {} if first_event == "start_map" else []
+    stack: List[Any] = [root]
+    key: str | None = None
+    for _, event, value in events:
+        container = stack[-1]
+        if event == "map_key":
+            key = value
+            continue
+        if event in ("end_map", "end_array"):
+            stack.pop()
+            if not stack:
+                return root
+            continue
+        if event in ("start_map", "start_array"):
+            child: Any = {} if event == "start_map" else []
+            if isinstance(container, dict):
+                container[key] = child
+            else:
+                container.append(child)
+            stack.append(child)
+            continue
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+    raise StreamError("Unexpected end of JSON stream while building value")
+
+
+def extract(source: Path | IO[str], patterns: Sequence[str], backend: str = "auto",
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(pattern, value)`` for every value matching one of ``patterns``, in document order."""
+    targets: Dict[str, str] = {pattern_to_prefix(pattern): pattern for pattern in patterns}
+    if resolve_backend(backend) == "python":
+        if isinstance(source, (str, Path)):
+            with open(source, "r", encoding="utf-8") as handle:
+                yield from _python_extract(handle, targets, chunk_size)
+        else:
+            yield from _python_extract(source, targets, chunk_size)
+        return
+
+    events = parse_events(source, backend=backend, chunk_size=chunk_size)
+    for prefix, event, value in events:
+        pattern = targets.get(prefix)
+        if pattern is None or event in ("map_key", "end_map", "end_array"):
+            continue
+        if event in ("start_map", "start_array"):
+            value = _build_value(events, event)
+            yield pattern, value
+            yield from _nested_matches(value, prefix, targets)
+        else:
+            yield pattern, value
+
+
+def extract_fields(source: Path | IO[str], patterns: Sequence[str], backend: str = "auto") -> Dict[str, Any]:
+    """Collect ``patterns`` into a dict: ``[]`` patterns become lists, others keep the first match."""
+    result: Dict[str, Any] = {pattern: [] for pattern in patterns if "[]" in pattern}
+    for pattern, value in extract(source, patterns, backend=backend):
+        if "[]" in pattern:
+            result[pattern].append(value)
+        else:
+            result.setdefault(pattern, value)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Benchmark helpers
+# ---------------------------------------------------------------------------
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _measure(mode: str, path: Path, pattern: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    if mode == "json.load":
+        with path.open(encoding="utf-8") as handle:
+            data = json.load(handle)
+        parts = pattern_to_prefix(pattern).split(".")
+        matches = sum(1 for _ in _walk_loaded(data, parts))
+    else:
+        matches = sum(1 for _ in extract(path, [pattern], backend=mode))
+    return {
+        "mode": mode,
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_kb": _peak_rss_kb(),
+        "matches": matches,
+    }
+
+
+def synthesize_forms_export(path: Path, entries: int) -> None:
+    """Write a forms-shaped export with ``entries`` results for benchmarking."""
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write('{"total": %d, "results": [' % entries)
+        for index in range(entries):
+            if index:
+                handle.write(",")
+            json.dump(
+                {
+                    "id": f"form-{index:08d}",
+                    "name": f"Timesheet Form {index}",
+                    "fieldGroups": [{"fields": [{"name": f"field_{n}", "label": f"Field {n}", "required": n % 2 == 0} for n in range(8)]}],
+                    "createdAt": "2025-09-18T00:00:00Z",
+                },
+                handle,
+            )
+        handle.write("]}")
+
+
+def run_benchmark(path: Path, pattern: str, modes: Sequence[str]) -> List[Dict[str, Any]]:
+    """Measure each mode in a fresh interpreter so peak RSS is not shared between runs."""
+    results = []
+    for mode in modes:
+        completed = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "_measure", mode, str(path), pattern],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(completed.stdout))
+    return results
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stream selected paths out of large JSON exports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = sub.add_parser("extract", help="Print values matching one or more paths")
+    extract_parser.add_argument("path", type=Path)
+    extract_parser.add_argument("patterns", nargs="+", help="Paths such as 'results[].name'")
+    extract_parser.add_argument("--backend", default="auto", choices=["auto", "python", "ijson"])
+
+    bench_parser = sub.add_parser("benchmark", help="Compare time and peak RSS against json.load")
+    bench_parser.add_argument("path", type=Path, nargs="?", help="Export to benchmark (omit with --synthesize)")
+    bench_parser.add_argument("--path", dest="pattern", default="results[].name", help="Path to extract (default: results[].name)")
+    bench_parser.add_argument("--synthesize", type=int, metavar="N", help="Generate a forms export with N results instead")
+
+    measure_parser = sub.add_parser("_measure")
+    measure_parser.add_argument("mode")
+    measure_parser.add_argument("path", type=Path)
+    measure_parser.add_argument("pattern")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if args.command == "_measure":
+        print(json.dumps(_measure(args.mode, args.path, args.pattern)))
+        return 0
+
+    if args.command == "extract":
+        for pattern, value in extract(args.path, args.patterns, backend=args.backend):
+            print(f"{pattern}\t{json.dumps(value, default=str, ensure_ascii=False)}")
+        return 0
+
+    modes = ["json.load", *available_backends()]
+    if args.synthesize:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "synthetic-forms.json"
+            synthesize_forms_export(path, args.synthesize)
+            size = path.stat().st_size
+            results = run_benchmark(path, args.pattern, modes)
+    elif args.path:
+        size = args.path.stat().st_size
+        results = run_benchmark(args.path, args.pattern, modes)
+    else:
+        print("Provide an export path or --synthesize N", file=sys.stderr)
+        return 2
+
+    print(f"File size: {size / 1_048_576:.1f} MiB, path: {args.pattern}")
+    print("| Mode | Seconds | Peak RSS (MiB) | Matches |")
+    print("|---|---|---|---|")
+    for result in results:
+        rss = result["peak_rss_kb"]
+        rss_text = f"{rss / 1024:.1f}" if rss is not None else "n/a"
+        print(f"| {result['mode']} | {result['seconds']:.3f} | {rss_text} | {result['matches']} |")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
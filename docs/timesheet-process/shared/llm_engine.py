@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""Concurrent LLM execution for documentation prompts.
+
+Requests run on asyncio behind a concurrency cap and two token buckets (requests per
+second and prompt tokens per minute). Transient failures (HTTP 429/5xx, timeouts, dropped
+connections) are retried with exponential backoff and full jitter; every attempt is bounded
+by a per-request timeout. With a ``ResponseCache`` attached, byte-identical requests are
+answered from disk before any rate limiting or network I/O. Responses stream (SSE) into
+``StreamingOutput`` sinks chunk by chunk; a stream cut off mid-response is retried as a
+continuation of the text already received. Providers are pluggable through ``PROVIDERS``:
+
+- ``placeholder`` — no network; returns the manual-execution placeholder text
+- ``openai`` — any OpenAI-compatible ``/chat/completions`` endpoint
+- ``anthropic`` — the Anthropic Messages API
+
+HTTP goes through ``urllib`` on worker threads, so no third-party client is needed. The
+benchmark mode starts ``llm_stub_server`` in-process and measures throughput and retries
+offline.
+
+Usage:
+    # Offline throughput/backpressure benchmark against the local stub
+    python3 analysis/timesheet_process/shared/llm_engine.py --benchmark 200 --concurrency 16 --rps 50
+
+    # Same, with the stub rejecting 10% of requests and capping its own concurrency
+    python3 analysis/timesheet_process/shared/llm_engine.py --benchmark 200 --failure-rate 0.1 --server-concurrency 8
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import json_codec
+from prompt_cost import estimate_tokens
+from prompt_layout import join_prefix
+from response_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_MB, DEFAULT_TTL_DAYS, ResponseCache, cache_key
+from streaming_output import StreamingOutput
+
+SinkFactory = Callable[["LLMRequest", str], StreamingOutput]
+ResultCallback = Callable[["LLMResult"], Optional[Awaitable[None]]]
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+CONTINUE_PROMPT = "Continue exactly where your previous message stopped. Do not repeat any text."
+_END = object()
+
+
+@dataclass
+class LLMRequest:
+    id: str
+    system: str
+    user: str
+    model: str = ""
+    max_tokens: int = 4096
+    temperature: float = 0.2
+    prefill: str = ""  # response text already received; the provider asks the model to continue it
+    prefix: Tuple[str, ...] = ()  # shared segments after the system prompt, each ending a cache breakpoint
+
+    @property
+    def system_text(self) -> str:
+        return join_prefix(self.system, self.prefix) if self.prefix else self.system
+
+    @property
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self.system_text) + estimate_tokens(self.user)
+
+
+@dataclass
+class LLMResult:
+    id: str
+    text: str = ""
+    ok: bool = False
+    attempts: int = 0
+    seconds: float = 0.0
+    error: str = ""
+    usage: Dict[str, Any] = field(default_factory=dict)
+    cached: bool = False
+    ttfb: float | None = None
+    resumed_chars: int = 0
+
+
+class RetryableError(Exception):
+    """A failure worth retrying (rate limit, overload, timeout, dropped connection)."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ProviderError(Exception):
+    """A failure that another attempt will not fix (bad request, auth)."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delay seconds or an HTTP date); None if unusable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+
+class Provider(abc.ABC):
+    """Provider interface: turn one request into completion text."""
+
+    name = "base"
+    model = ""
+    cacheable = True
+
+    @abc.abstractmethod
+    async def complete(self, request: LLMRequest, timeout: float) -> LLMResult:
+        """The whole reply to ``request``."""
+
+    async def stream(self, request: LLMRequest, timeout: float, usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield response text chunks; providers without streaming yield the whole reply once."""
+        result = await self.complete(request, timeout)
+        usage.update(result.usage)
+        yield result.text
+
+    def batch_entry(self, request: LLMRequest, custom_id: str) -> Dict[str, Any]:
+        """One line of an offline batch request file."""
+        raise ProviderError(f"provider {self.name!r} does not support batch submission")
+
+    def parse_batch_result(self, entry: Dict[str, Any]) -> LLMResult:
+        """Result for one line of a batch results file (``id`` is the custom ID)."""
+        raise ProviderError(f"provider {self.name!r} does not support batch results")
+
+
+class PlaceholderProvider(Provider):
+    """Offline provider producing the manual-execution placeholder."""
+
+    name = "placeholder"
+    cacheable = False
+
+    async def complete(self, request: LLMRequest, timeout: float) -> LLMResult:
+        text = f"""# AI-Generated Content Placeholder
+
+This file would contain AI-generated content for: {request.id}
+
+## Prompt Summary:
+{request.user[:200]}...
+
+## Next Steps:
+1. Re-run with --provider openai or --provider anthropic, or
+2. Paste the prompt into your AI tool and save the result here
+"""
+        return LLMResult(request.id, text=text, ok=True)
+
+
+class HTTPProvider(Provider):
+    """JSON-over-HTTP provider; subclasses shape the payload and read the reply."""
+
+    def __init__(self, base_url: str, api_key: str = "", model: str = ""):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+
+    @abc.abstractmethod
+    def endpoint(self) -> str:
+        """URL requests are POSTed to."""
+
+    def headers(self) -> Dict[str, str]:
+        return {"content-type": "application/json"}
+
+    @abc.abstractmethod
+    def payload(self, request: LLMRequest) -> Dict[str, Any]:
+        """JSON request body for ``request``."""
+
+    @abc.abstractmethod
+    def parse(self, request: LLMRequest, body: Dict[str, Any]) -> LLMResult:
+        """Result for a whole (non-streamed) JSON response body."""
+
+    @abc.abstractmethod
+    def parse_event(self, event: Dict[str, Any], usage: Dict[str, Any]) -> Tuple[str, bool]:
+        """(text delta, stream finished) for one server-sent event payload."""
+
+    def _post(self, request: LLMRequest, timeout: float) -> Dict[str, Any]:
+        with self._open(request, timeout, stream=False) as response:
+            try:
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, TimeoutError, OSError) as exc:
+                raise RetryableError(f"response interrupted: {exc}") from exc
+        try:
+            return json_codec.loads(body)
+        except ValueError as exc:  # JSON and UTF-8 decode errors, e.g. a proxy's HTML error page
+            raise ProviderError(f"invalid JSON response: {body[:200].decode('utf-8', errors='replace')!r}") from exc
+
+    def _open(self, request: LLMRequest, timeout: float, stream: bool) -> Any:
+        payload = self.payload(request)
+        if stream:
+            payload["stream"] = True
+        data = json.dumps(payload).encode("utf-8")
+        http_request = urllib.request.Request(self.endpoint(), data=data, headers=self.headers(), method="POST")
+        try:
+            return urllib.request.urlopen(http_request, timeout=timeout)
+        except urllib.error.HTTPError as exc:
+            detail = exc.read()[:300].decode("utf-8", errors="replace")
+            if exc.code in RETRYABLE_STATUS:
+                raise RetryableError(f"HTTP {exc.code}: {detail}", parse_retry_after(exc.headers.get("retry-after"))) from exc
+            raise ProviderError(f"HTTP {exc.code}: {detail}") from exc
+        except (urllib.error.URLError, ConnectionError, TimeoutError) as exc:
+            raise RetryableError(f"connection failed: {exc}") from exc
+
+    def _stream_events(self, request: LLMRequest, timeout: float, usage: Dict[str, Any]) -> Iterator[str]:
+        done = False
+        try:
+            with self._open(request, timeout, stream=True) as response:
+                for raw in response:
+                    try:
+                        line = raw.decode("utf-8").strip()
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            done = True
+                            break
+                        event = json_codec.loads(data)
+                    except ValueError as exc:  # undecodable bytes or a garbled event; the retry continues the text
+                        raise RetryableError(f"malformed stream event: {raw[:200]!r}") from exc
+                    text, done = self.parse_event(event, usage)
+                    if text:
+                        yield text
+                    if done:
+                        break
+        except (http.client.HTTPException, ConnectionError, TimeoutError, OSError) as exc:
+            raise RetryableError(f"stream interrupted: {exc}") from exc
+        if not done:
+            raise RetryableError("stream ended before the response finished")
+
+    async def complete(self, request: LLMRequest, timeout: float) -> LLMResult:
+        body = await asyncio.to_thread(self._post, request, timeout)
+        return self.parse(request, body)
+
+    async def stream(self, request: LLMRequest, timeout: float, usage: Dict[str, Any]) -> AsyncIterator[str]:
+        # The blocking reader runs on a worker thread and hands chunks to the loop as they arrive
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def pump() -> None:
+            try:
+                for chunk in self._stream_events(request, timeout, usage):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                loop.call_soon_threadsafe(queue.put_nowait, _END)
+            except BaseException as exc:  # forwarded to the consumer below
+                loop.call_soon_threadsafe(queue.put_nowait, exc)
+
+        reader = loop.run_in_executor(None, pump)
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+        await reader
+
+
+class OpenAICompatibleProvider(HTTPProvider):
+    name = "openai"
+
+    def endpoint(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    def headers(self) -> Dict[str, str]:
+        headers = super().headers()
+        if self.api_key:
+            headers["authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def payload(self, request: LLMRequest) -> Dict[str, Any]:
+        return {
+            "model": request.model or self.model,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "messages": [
+                # Byte-identical system+prefix text lets automatic prefix caching apply
+                {"role": "system", "content": request.system_text},
+                {"role": "user", "content": request.user},
+                *([{"role": "assistant", "content": request.prefill}, {"role": "user", "content": CONTINUE_PROMPT}]
+                  if request.prefill else []),
+            ],
+        }
+
+    def parse(self, request: LLMRequest, body: Dict[str, Any]) -> LLMResult:
+        try:
+            text = body["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as exc:
+            raise ProviderError(f"unexpected response shape: {str(body)[:200]}") from exc
+        return LLMResult(request.id, text=text or "", ok=True, usage=body.get("usage") or {})
+
+    def batch_entry(self, request: LLMRequest, custom_id: str) -> Dict[str, Any]:
+        return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": self.payload(request)}
+
+    def parse_batch_result(self, entry: Dict[str, Any]) -> LLMResult:
+        custom_id = str(entry.get("custom_id", ""))
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code", 200) != 200:
+            error = entry.get("error") or (response.get("body") or {}).get("error") or f"HTTP {response.get('status_code')}"
+            return LLMResult(custom_id, error=str(error))
+        result = self.parse(LLMRequest(custom_id, "", ""), response.get("body") or {})
+        result.id = custom_id
+        return result
+
+    def parse_event(self, event: Dict[str, Any], usage: Dict[str, Any]) -> Tuple[str, bool]:
+        if event.get("usage"):
+            usage.update(event["usage"])
+        choice = (event.get("choices") or [{}])[0]
+        return (choice.get("delta") or {}).get("content") or "", bool(choice.get("finish_reason"))
+
+
+class AnthropicProvider(HTTPProvider):
+    name = "anthropic"
+
+    def endpoint(self) -> str:
+        return f"{self.base_url}/v1/messages"
+
+    def headers(self) -> Dict[str, str]:
+        return {**super().headers(), "x-api-key": self.api_key, "anthropic-version": "2023-06-01"}
+
+    def payload(self, request: LLMRequest) -> Dict[str, Any]:
+        return {
+            "model": request.model or self.model,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "system": self.system_blocks(request),
+            "messages": [
+                {"role": "user", "content": request.user},
+                # Assistant prefill: the model continues this text (which must not end in whitespace)
+                *([{"role": "assistant", "content": request.prefill.rstrip()}] if request.prefill.strip() else []),
+            ],
+        }
+
+    @staticmethod
+    def system_blocks(request: LLMRequest) -> Any:
+        """System prompt, then one block per prefix segment with a cache breakpoint (API limit: 4)."""
+        if not request.prefix:
+            return request.system
+        blocks: List[Dict[str, Any]] = [{"type": "text", "text": request.system}]
+        for index, segment in enumerate(request.prefix):
+            block: Dict[str, Any] = {"type": "text", "text": segment}
+            if index >= len(request.prefix) - 4:
+                block["cache_control"] = {"type": "ephemeral"}
+            blocks.append(block)
+        return blocks
+
+    def parse(self, request: LLMRequest, body: Dict[str, Any]) -> LLMResult:
+        blocks = body.get("content")
+        if not isinstance(blocks, list):
+            raise ProviderError(f"unexpected response shape: {str(body)[:200]}")
+        text = "".join(block.get("text", "") for block in blocks if block.get("type") == "text")
+        return LLMResult(request.id, text=text, ok=True, usage=body.get("usage") or {})
+
+    def batch_entry(self, request: LLMRequest, custom_id: str) -> Dict[str, Any]:
+        return {"custom_id": custom_id, "params": self.payload(request)}
+
+    def parse_batch_result(self, entry: Dict[str, Any]) -> LLMResult:
+        custom_id = str(entry.get("custom_id", ""))
+        outcome = entry.get("result") or {}
+        if outcome.get("type") != "succeeded":
+            return LLMResult(custom_id, error=f"{outcome.get('type', 'unknown')}: {outcome.get('error', '')}".rstrip(": "))
+        result = self.parse(LLMRequest(custom_id, "", ""), outcome.get("message") or {})
+        result.id = custom_id
+        return result
+
+    def parse_event(self, event: Dict[str, Any], usage: Dict[str, Any]) -> Tuple[str, bool]:
+        kind = event.get("type")
+        if kind == "message_start":
+            usage.update((event.get("message") or {}).get("usage") or {})
+        elif kind == "message_delta":
+            usage.update(event.get("usage") or {})
+        elif kind == "content_block_delta":
+            return (event.get("delta") or {}).get("text", ""), False
+        elif kind == "error":
+            raise RetryableError(f"stream error: {event.get('error')}")
+        return "", kind == "message_stop"
+
+
+PROVIDERS: Dict[str, Callable[..., Provider]] = {
+    "placeholder": lambda **_: PlaceholderProvider(),
+    "openai": lambda base_url=None, api_key=None, model="": OpenAICompatibleProvider(
+        base_url or os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+        api_key if api_key is not None else os.environ.get("OPENAI_API_KEY", ""),
+        model,
+    ),
+    "anthropic": lambda base_url=None, api_key=None, model="": AnthropicProvider(
+        base_url or os.environ.get("ANTHROPIC_BASE_URL", "https://api.anthropic.com"),
+        api_key if api_key is not None else os.environ.get("ANTHROPIC_API_KEY", ""),
+        model,
+    ),
+}
+
+
+def make_provider(name: str, **options: Any) -> Provider:
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown provider {name!r}; choose from {', '.join(sorted(PROVIDERS))}")
+    return PROVIDERS[name](**options)
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting and execution
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second refilling up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        amount = min(amount, self.capacity)  # oversized requests still pass once the bucket is full
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                delay = (amount - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+
+@dataclass
+class EngineStats:
+    requests: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    cached: int = 0
+    rate_wait_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    ttfbs: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        def pct(values: List[float], p: float) -> float:
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3) if ordered else 0.0
+
+        return {
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "cached": self.cached,
+            "rate_wait_seconds": round(self.rate_wait_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "throughput_rps": round(self.requests / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            "latency_p50": pct(self.latencies, 0.5),
+            "latency_p95": pct(self.latencies, 0.95),
+            "ttfb_p50": pct(self.ttfbs, 0.5),
+            "ttfb_p95": pct(self.ttfbs, 0.95),
+        }
+
+
+class ExecutionEngine:
+    """Run requests concurrently with a cap, rate limits, retries, and timeouts."""
+
+    def __init__(self, provider: Provider, concurrency: int = DEFAULT_CONCURRENCY,
+                 requests_per_second: float = 0.0, tokens_per_minute: float = 0.0,
+                 retries: int = DEFAULT_RETRIES, timeout: float = DEFAULT_TIMEOUT,
+                 backoff: float = DEFAULT_BACKOFF, cache: ResponseCache | None = None, stream: bool = True):
+        self.provider = provider
+        self.stream = stream
+        self.cache = cache if provider.cacheable else None
+        self.concurrency = max(1, concurrency)
+        self.request_bucket = TokenBucket(requests_per_second, max(1.0, requests_per_second))
+        self.token_bucket = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.stats = EngineStats()
+
+    def cache_key(self, request: LLMRequest) -> str:
+        return cache_key(self.provider.name, request.model or self.provider.model, request.system_text, request.user,
+                         {"max_tokens": request.max_tokens, "temperature": request.temperature})
+
+    async def _transfer(self, request: LLMRequest, sink: StreamingOutput | None, result: LLMResult, start: float) -> None:
+        """One provider call, streamed into ``sink`` (continuing any text it already holds)."""
+        if sink is None:
+            response = await self.provider.complete(request, self.timeout)
+            result.text, result.usage = response.text, response.usage
+            result.ttfb = time.perf_counter() - start
+            return
+        if sink.text:
+            request = replace(request, prefill=sink.text)
+        if self.stream:
+            async for chunk in self.provider.stream(request, self.timeout, result.usage):
+                if chunk and result.ttfb is None:
+                    result.ttfb = time.perf_counter() - start
+                sink.write(chunk)
+        else:
+            response = await self.provider.complete(request, self.timeout)
+            result.ttfb = time.perf_counter() - start
+            result.usage.update(response.usage)
+            sink.write(response.text)
+        result.text = sink.text
+
+    async def _finish(self, result: LLMResult, on_result: ResultCallback | None) -> LLMResult:
+        if on_result is not None:
+            outcome = on_result(result)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        return result
+
+    async def execute(self, request: LLMRequest, semaphore: asyncio.Semaphore,
+                      on_result: ResultCallback | None = None, sinks: SinkFactory | None = None) -> LLMResult:
+        key = self.cache_key(request)
+        sink = sinks(request, key) if sinks else None
+        if self.cache:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.stats.requests += 1
+                self.stats.succeeded += 1
+                self.stats.cached += 1
+                if sink is not None:
+                    sink.discard()
+                    sink.write(hit[0])
+                    sink.commit()
+                return await self._finish(LLMResult(request.id, text=hit[0], ok=True, usage=hit[1], cached=True, ttfb=0.0), on_result)
+
+        result = LLMResult(request.id, resumed_chars=sink.resumed if sink else 0)
+        async with semaphore:
+            start = time.perf_counter()
+            for attempt in range(1, self.retries + 2):
+                result.attempts = attempt
+                try:
+                    await self.request_bucket.acquire()
+                    await self.token_bucket.acquire(request.estimated_tokens)
+                    await asyncio.wait_for(self._transfer(request, sink, result, start), self.timeout)
+                    result.ok, result.error = True, ""
+                    break
+                except (RetryableError, asyncio.TimeoutError) as exc:
+                    if isinstance(exc, asyncio.TimeoutError):
+                        self.stats.timeouts += 1
+                        result.error = f"timed out after {self.timeout:.0f}s"
+                    else:
+                        result.error = str(exc)
+                    if attempt > self.retries:
+                        break
+                    self.stats.retries += 1
+                    # Full jitter keeps retries from a burst of 429s from re-synchronising
+                    delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)))
+                    retry_after = getattr(exc, "retry_after", None)
+                    await asyncio.sleep(max(delay, retry_after or 0.0))
+                except ProviderError as exc:
+                    result.error = str(exc)
+                    break
+                except Exception as exc:
+                    # Anything else (an unexpected response shape, a provider bug) fails this
+                    # request only; letting it reach gather() would abort the whole run
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    break
+            result.seconds = time.perf_counter() - start
+        if sink is not None:
+            if result.ok:
+                sink.commit()
+            else:
+                sink.close()  # keep the partial for the next run to resume
+        self.stats.requests += 1
+        self.stats.latencies.append(result.seconds)
+        if result.ttfb is not None:
+            self.stats.ttfbs.append(result.ttfb)
+        if result.ok:
+            self.stats.succeeded += 1
+            if self.cache:
+                self.cache.put(key, result.text, result.usage)
+        else:
+            self.stats.failed += 1
+        return await self._finish(result, on_result)
+
+    async def run(self, requests: Sequence[LLMRequest], on_result: ResultCallback | None = None,
+                  sinks: SinkFactory | None = None) -> List[LLMResult]:
+        """Execute all requests; results come back in request order.
+
+        ``sinks`` maps (request, digest) to a ``StreamingOutput`` that receives the response
+        as it streams and is committed atomically on success.
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Blocking HTTP runs on worker threads; size the pool to the cap rather than the CPU count
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency))
+        results = await asyncio.gather(*(self.execute(request, semaphore, on_result, sinks) for request in requests))
+        self.stats.wall_seconds += time.perf_counter() - start
+        self.stats.rate_wait_seconds = self.request_bucket.waited + self.token_bucket.waited
+        return list(results)
+
+
+def run_requests(engine: ExecutionEngine, requests: Sequence[LLMRequest],
+                 on_result: ResultCallback | None = None, sinks: SinkFactory | None = None) -> List[LLMResult]:
+    return asyncio.run(engine.run(requests, on_result, sinks))
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    """Shared CLI flags for scripts that execute prompts through the engine."""
+    parser.add_argument("--provider", default="placeholder", choices=sorted(PROVIDERS), help="LLM provider (default: offline placeholder)")
+    parser.add_argument("--model", default="", help="Model name passed to the provider")
+    parser.add_argument("--base-url", help="Provider base URL (e.g. the local stub server)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"Concurrent requests (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rps", type=float, default=0.0, help="Requests per second limit (0 = unlimited)")
+    parser.add_argument("--tpm", type=float, default=0.0, help="Estimated prompt tokens per minute limit (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help=f"Retries per request (default: {DEFAULT_RETRIES})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help=f"Per-attempt timeout in seconds (default: {DEFAULT_TIMEOUT:.0f})")
+    parser.add_argument("--max-tokens", type=int, default=4096, help="Response token limit per request")
+    parser.add_argument("--no-stream", action="store_true", help="Request whole responses instead of streaming them")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE_PATH, help="Response cache database")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the provider, bypassing the response cache")
+    parser.add_argument("--cache-ttl-days", type=float, default=DEFAULT_TTL_DAYS, help=f"Cached response lifetime (default: {DEFAULT_TTL_DAYS:.0f} days)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB, help=f"Cache size budget before LRU eviction (default: {DEFAULT_MAX_MB:.0f} MB)")
+
+
+def engine_from_args(args: argparse.Namespace) -> ExecutionEngine:
+    provider = make_provider(args.provider, base_url=args.base_url, model=args.model)
+    cache = None
+    if provider.cacheable and not args.no_cache:
+        cache = ResponseCache(args.cache, args.cache_ttl_days, int(args.cache_max_mb * 1024 * 1024))
+    return ExecutionEngine(provider, args.concurrency, args.rps, args.tpm, args.retries, args.timeout,
+                           cache=cache, stream=not args.no_stream)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM execution engine against the local stub server")
+    add_engine_arguments(parser)
+    parser.add_argument("--benchmark", type=int, default=100, help="Number of synthetic requests")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub response latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of stub responses that are HTTP 429/503")
+    parser.add_argument("--server-concurrency", type=int, default=0, help="Stub rejects requests above this concurrency with 429 (0 = no cap)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of stub streams cut off halfway")
+    return parser.parse_args()
+
+
+def main() -> int:
+    from llm_stub_server import start_stub_server
+
+    args = parse_args()
+    server, url = start_stub_server(latency=args.latency, failure_rate=args.failure_rate,
+                                    max_concurrency=args.server_concurrency, drop_rate=args.drop_rate)
+    try:
+        args.provider, args.base_url, args.no_cache = "openai", url, True
+        engine = engine_from_args(args)
+        engine.backoff = min(engine.backoff, 0.1)  # keep the offline benchmark short
+        requests = [LLMRequest(f"bench-{i}", "You are a benchmark.", f"Prompt {i} " * 50) for i in range(args.benchmark)]
+        with tempfile.TemporaryDirectory() as scratch:
+            run_requests(engine, requests, sinks=lambda request, key: StreamingOutput(Path(scratch) / f"{request.id}.md", key))
+    finally:
+        server.shutdown()
+    print(json.dumps({**engine.stats.to_dict(), "server": server.stats()}, indent=2))
+    return 0 if engine.stats.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Local OpenAI-compatible stub server for exercising the LLM engine offline.
+
+Serves ``POST /chat/completions`` with a configurable latency, a random failure rate
+(HTTP 429 or 503), and an optional concurrency cap above which requests are rejected with
+429 and ``Retry-After`` — enough to measure throughput, retries, and backpressure without
+a network or API key. ``"stream": true`` requests get server-sent events spread over the
+latency; ``--drop-rate`` cuts that fraction of streams off halfway to exercise resumption.
+
+Usage:
+    python3 analysis/timesheet_process/shared/llm_stub_server.py --port 8765 --latency 0.2 --failure-rate 0.05
+
+    # then, from a subprocess directory
+    python3 analysis/timesheet_process/shared/execute-ai-prompts.py --provider openai --base-url http://127.0.0.1:8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float, failure_rate: float, max_concurrency: int,
+                 drop_rate: float = 0.0):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.max_concurrency = max_concurrency
+        self.drop_rate = drop_rate
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.counts = {"requests": 0, "ok": 0, "rejected": 0, "failed": 0, "dropped": 0, "continued": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {**self.counts, "peak_concurrency": self.peak}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - quiet by default
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any], headers: Dict[str, str] | None = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        server = self.server
+        length = int(self.headers.get("content-length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with server.lock:
+            server.counts["requests"] += 1
+            if server.max_concurrency and server.active >= server.max_concurrency:
+                server.counts["rejected"] += 1
+                rejected = True
+            else:
+                rejected = False
+                server.active += 1
+                server.peak = max(server.peak, server.active)
+        if rejected:
+            self._send(429, {"error": {"message": "stub concurrency limit"}}, {"retry-after": "0.05"})
+            return
+        try:
+            if random.random() < server.failure_rate:
+                time.sleep(server.latency)
+                with server.lock:
+                    server.counts["failed"] += 1
+                self._send(random.choice([429, 503]), {"error": {"message": "stub injected failure"}})
+                return
+            messages = payload.get("messages", [])
+            user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+            text = f"# Stub response\n\nEcho of {len(user)} prompt characters.\n"
+            if any(m.get("role") == "assistant" for m in messages):
+                # Continuation of a cut-off stream: send only the rest
+                prefix = next(m.get("content", "") for m in messages if m.get("role") == "assistant")
+                text = text[len(prefix):] if text.startswith(prefix) else text
+                with server.lock:
+                    server.counts["continued"] += 1
+            if payload.get("stream"):
+                self._stream(text)
+                return
+            time.sleep(server.latency)
+            with server.lock:
+                server.counts["ok"] += 1
+            self._send(200, {
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(user) // 4, "completion_tokens": len(text) // 4},
+            })
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _stream(self, text: str) -> None:
+        server = self.server
+        chunks = [text[i:i + 8] for i in range(0, len(text), 8)] or [""]
+        drop_at = len(chunks) // 2 if random.random() < server.drop_rate and len(chunks) > 1 else None
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.end_headers()
+        for index, chunk in enumerate(chunks):
+            if index == drop_at:
+                with server.lock:
+                    server.counts["dropped"] += 1
+                self.close_connection = True
+                return  # connection closes without a finish event
+            time.sleep(server.latency / len(chunks))
+            event = {"choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        final = {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        with server.lock:
+            server.counts["ok"] += 1
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.05,
+                      failure_rate: float = 0.0, max_concurrency: int = 0, drop_rate: float = 0.0) -> Tuple[StubServer, str]:
+    """Start the stub on a background thread; returns the server and its base URL."""
+    server = StubServer((host, port), latency, failure_rate, max_concurrency, drop_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds to wait before answering")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 429/503")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Reject requests above this concurrency (0 = no cap)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of streams cut off halfway")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    server = StubServer((args.host, args.port), args.latency, args.failure_rate, args.max_concurrency, args.drop_rate)
+    print(f"Stub LLM server on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Cached manifest of Timesheets-Theme CMS modules.
+
+Each module directory is summarised once (label, field count, field names, file digests)
+into a JSON manifest. Later runs only re-read modules whose directory stamp changed — the
+directory mtime plus the mtimes of its top-level files, so in-place edits to ``meta.json``
+or ``fields.json`` are also picked up. The context extractor, the context index, and
+``verify_phase`` share the in-memory lookup API.
+
+Usage:
+    # Refresh the manifest and print a summary
+    python3 analysis/timesheet_process/shared/module_manifest.py
+
+    # Show specific modules
+    python3 analysis/timesheet_process/shared/module_manifest.py hjp-created-well.module
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import json_codec
+
+MANIFEST_NAME = "modules-manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ModuleEntry:
+    """Manifest record for one ``*.module`` directory."""
+
+    name: str
+    stamp: int
+    mtime: float
+    label: str = ""
+    field_count: int | str = "?"
+    field_names: List[str] = field(default_factory=list)
+    digests: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def file_count(self) -> int:
+        return len(self.digests)
+
+
+@dataclass
+class ScanStats:
+    modules: int = 0
+    rebuilt: int = 0
+    reused: int = 0
+    removed: int = 0
+
+
+def directory_stamp(path: Path) -> int:
+    """Directory mtime folded with its top-level file mtimes (stat only, no reads)."""
+    stamp = path.stat().st_mtime_ns
+    with os.scandir(path) as entries:
+        for entry in entries:
+            stamp = max(stamp, entry.stat().st_mtime_ns)
+    return stamp
+
+
+def _read_json(path: Path):
+    return json_codec.load_path(path)
+
+
+def read_module(path: Path, stamp: int) -> ModuleEntry:
+    entry = ModuleEntry(name=path.name, stamp=stamp, mtime=path.stat().st_mtime)
+    # meta.json/fields.json are parsed from the bytes already read for their digests
+    contents: Dict[str, bytes] = {}
+    for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+        relative = file_path.relative_to(path).as_posix()
+        raw = file_path.read_bytes()
+        entry.digests[relative] = hashlib.sha256(raw).hexdigest()
+        if relative in ("meta.json", "fields.json"):
+            contents[relative] = raw
+
+    if "meta.json" in contents:
+        try:
+            meta_data = json_codec.loads(contents["meta.json"])
+            entry.label = meta_data.get("label") or meta_data.get("description") or ""
+        except ValueError:
+            entry.label = "(meta.json unreadable)"
+
+    if "fields.json" in contents:
+        try:
+            fields_data = json_codec.loads(contents["fields.json"])
+        except ValueError:
+            return entry
+        entries = fields_data if isinstance(fields_data, list) else None
+        if isinstance(fields_data, dict) and isinstance(fields_data.get("fields") or [], list):
+            entries = fields_data.get("fields") or []
+        if entries is not None:
+            entry.field_count = len(entries)
+            entry.field_names = [f.get("name", "") for f in entries if isinstance(f, dict)]
+    return entry
+
+
+class ModuleManifest:
+    """In-memory module lookups backed by a persisted, incrementally rebuilt manifest."""
+
+    def __init__(self, modules_dir: Path, manifest_path: Path):
+        self.modules_dir = modules_dir
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, ModuleEntry] = {}
+        self.scan_stats = ScanStats()
+        self._lock = threading.Lock()
+        self._scanned = False
+
+    def _read_manifest(self) -> Dict[str, ModuleEntry]:
+        try:
+            data = _read_json(self.manifest_path)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("modules_dir") != str(self.modules_dir):
+            return {}
+        entries: Dict[str, ModuleEntry] = {}
+        for raw in data.get("modules", []):
+            try:
+                entry = ModuleEntry(**raw)
+            except TypeError:
+                continue
+            entries[entry.name] = entry
+        return entries
+
+    def _write_manifest(self) -> None:
+        payload = {
+            "version": MANIFEST_VERSION,
+            "modules_dir": str(self.modules_dir),
+            "modules": [asdict(self.entries[name]) for name in sorted(self.entries)],
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            tmp_path.write_text(json_codec.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            tmp_path.replace(self.manifest_path)
+        except OSError:
+            pass  # read-only data checkout; the in-memory lookup still works
+
+    def scan(self, persist: bool = True) -> ScanStats:
+        with self._lock:
+            if self._scanned:
+                return self.scan_stats
+            previous = self._read_manifest()
+            stats = ScanStats()
+            entries: Dict[str, ModuleEntry] = {}
+            if self.modules_dir.exists():
+                for path in sorted(p for p in self.modules_dir.iterdir() if p.is_dir()):
+                    stats.modules += 1
+                    stamp = directory_stamp(path)
+                    cached = previous.pop(path.name, None)
+                    if cached and cached.stamp == stamp:
+                        entries[path.name] = cached
+                        stats.reused += 1
+                    else:
+                        entries[path.name] = read_module(path, stamp)
+                        stats.rebuilt += 1
+            stats.removed = len(previous)
+            self.entries, self.scan_stats = entries, stats
+            self._scanned = True
+            if persist and (stats.rebuilt or stats.removed or not self.manifest_path.exists()):
+                self._write_manifest()
+            return stats
+
+    def get(self, name: str) -> ModuleEntry | None:
+        self.scan()
+        return self.entries.get(name)
+
+    def exists(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def names(self) -> List[str]:
+        self.scan()
+        return sorted(self.entries)
+
+    def matching(self, keywords: Iterable[str]) -> List[str]:
+        """Module names containing any of the (case-insensitive) keywords."""
+        tokens = [token.lower() for token in keywords]
+        return [name for name in self.names() if any(token in name.lower() for token in tokens)]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build and query the CMS module manifest")
+    parser.add_argument("modules", nargs="*", help="Module directory names to show")
+    parser.add_argument("--modules-dir", type=Path, help="Module exports (default: the data layout's theme modules)")
+    parser.add_argument("--manifest", type=Path, help=f"Manifest path (default: data/raw/.cache/{MANIFEST_NAME})")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    from hjps import default_layout  # hjps imports this module, so the layout is resolved here
+
+    layout = default_layout()
+    manifest = ModuleManifest(args.modules_dir or layout.modules, args.manifest or layout.cache / MANIFEST_NAME)
+    stats = manifest.scan()
+    print(f"{stats.modules} modules ({stats.rebuilt} rebuilt, {stats.reused} reused, {stats.removed} removed) → {manifest.manifest_path}")
+    missing = 0
+    for name in args.modules:
+        entry = manifest.get(name)
+        if entry is None:
+            print(f"{name}: not found")
+            missing += 1
+            continue
+        print(f"{name}: {entry.label or '(no label)'} · {entry.field_count} fields · {entry.file_count} files")
+        if entry.field_names:
+            print(f"    fields: {', '.join(n for n in entry.field_names if n)}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
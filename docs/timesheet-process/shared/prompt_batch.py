@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Offline batch submission for bulk prompt execution.
+
+``write_batch`` compiles requests into one JSONL batch request file in the provider's batch
+format, with a custom ID per request that is stable for a given prompt (a readable slug plus
+the request digest). A ``<batch>.manifest.json`` sidecar maps each custom ID to its output
+path and digest. ``ingest_results`` reads a batch results file line by line, so only the
+manifest's ID → path map is held in memory however large the results are, and writes each
+response to its target through the atomic ``StreamingOutput`` writer, storing it in the
+response cache as well.
+
+Usage:
+    # Ingest a downloaded results file against the manifest written at submit time
+    python3 analysis/timesheet_process/shared/prompt_batch.py batch-results.jsonl --manifest batch.jsonl.manifest.json --provider anthropic
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import json_codec
+from llm_engine import PROVIDERS, LLMRequest, Provider, make_provider
+from response_cache import ResponseCache
+from streaming_output import StreamingOutput
+
+CUSTOM_ID_LIMIT = 64  # provider batch APIs cap custom IDs at 64 characters of [A-Za-z0-9_-]
+SLUG_PATTERN = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def custom_id(request_id: str, key: str) -> str:
+    digest = key[:16]
+    slug = SLUG_PATTERN.sub("-", request_id).strip("-")[: CUSTOM_ID_LIMIT - len(digest) - 1]
+    return f"{slug}-{digest}" if slug else digest
+
+
+def manifest_path(batch_path: Path) -> Path:
+    return batch_path.with_name(batch_path.name + ".manifest.json")
+
+
+def write_batch(entries: Iterable[Tuple[LLMRequest, str, Path]], provider: Provider, batch_path: Path) -> Dict[str, Any]:
+    """Write (request, digest, output path) entries as a JSONL batch plus its manifest."""
+    manifest: Dict[str, Dict[str, str]] = {}
+    batch_path.parent.mkdir(parents=True, exist_ok=True)
+    with batch_path.open("w", encoding="utf-8") as handle:
+        for request, key, output in entries:
+            cid = custom_id(request.id, key)
+            if cid in manifest:
+                continue  # identical request already queued
+            handle.write(json.dumps(provider.batch_entry(request, cid), ensure_ascii=False) + "\n")
+            manifest[cid] = {"request_id": request.id, "key": key, "output": str(output)}
+    manifest_path(batch_path).write_text(
+        json.dumps({"provider": provider.name, "requests": manifest}, indent=2), encoding="utf-8"
+    )
+    return {"batch": str(batch_path), "manifest": str(manifest_path(batch_path)), "requests": len(manifest)}
+
+
+@dataclass
+class IngestStats:
+    written: int = 0
+    failed: int = 0
+    unknown: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"written": self.written, "failed": self.failed, "unknown": self.unknown, "errors": self.errors[:20]}
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json_codec.loads(line)
+
+
+def ingest_results(results_path: Path, manifest: Dict[str, Any], provider: Provider,
+                   cache: ResponseCache | None = None) -> IngestStats:
+    """Stream a batch results file and fan each response out to its manifest output path."""
+    requests = manifest.get("requests", {})
+    stats = IngestStats()
+    for entry in iter_jsonl(results_path):
+        result = provider.parse_batch_result(entry)
+        target = requests.get(result.id)
+        if target is None:
+            stats.unknown += 1
+            continue
+        if not result.ok:
+            stats.failed += 1
+            stats.errors.append(f"{target['request_id']}: {result.error}")
+            continue
+        output = StreamingOutput(Path(target["output"]), target["key"])
+        output.discard()
+        output.write(result.text)
+        output.commit()
+        if cache is not None:
+            cache.put(target["key"], result.text, result.usage)
+        stats.written += 1
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest a batch results file into its output paths")
+    parser.add_argument("results", type=Path, help="Batch results JSONL")
+    parser.add_argument("--manifest", type=Path, required=True, help="Manifest written alongside the batch request file")
+    parser.add_argument("--provider", choices=sorted(set(PROVIDERS) - {"placeholder"}), help="Defaults to the manifest's provider")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    manifest = json_codec.load_path(args.manifest)
+    provider = make_provider(args.provider or manifest.get("provider", "openai"))
+    stats = ingest_results(args.results, manifest, provider)
+    print(json.dumps(stats.to_dict(), indent=2))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
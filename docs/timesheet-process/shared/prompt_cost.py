@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Offline size and cost estimates for generated prompts.
+
+Token counts come from a regex heuristic (one token per short word or punctuation mark,
+long words split every four characters) that tracks BPE tokenizers closely enough for
+budgeting and runs without network access or tokenizer downloads. Prices and context
+limits come from ``DEFAULT_PRICES`` or a JSON file with the same shape::
+
+    {"model-name": {"input_per_mtok": 3.0, "output_per_mtok": 15.0, "context_tokens": 200000}}
+
+Usage:
+    # Estimate prompt files already written by ai-powered-agent.py
+    python3 analysis/timesheet_process/shared/prompt_cost.py phases/01-foundation/agents/project_configuration/*.md
+
+    # With a custom price table and a larger expected response
+    python3 analysis/timesheet_process/shared/prompt_cost.py prompts/*.md --prices prices.json --output-tokens 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import json_codec
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+DEFAULT_OUTPUT_TOKENS = 4000
+
+# USD per million tokens; override with --prices when rates change
+DEFAULT_PRICES: Dict[str, Dict[str, float]] = {
+    "large": {"input_per_mtok": 15.0, "output_per_mtok": 75.0, "context_tokens": 200000},
+    "standard": {"input_per_mtok": 3.0, "output_per_mtok": 15.0, "context_tokens": 200000},
+    "small": {"input_per_mtok": 0.8, "output_per_mtok": 4.0, "context_tokens": 200000},
+    "compact-context": {"input_per_mtok": 2.5, "output_per_mtok": 10.0, "context_tokens": 128000},
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count: words up to four characters are one token, longer ones one per four."""
+    return sum((len(piece) + 3) // 4 for piece in TOKEN_PATTERN.findall(text))
+
+
+@dataclass
+class PromptEstimate:
+    name: str
+    chars: int
+    tokens: int
+    schema_bytes: int = 0
+    costs: Dict[str, float] = field(default_factory=dict)
+    over_limit: List[str] = field(default_factory=list)
+
+
+def load_prices(path: Path | None) -> Dict[str, Dict[str, float]]:
+    if path is None:
+        return DEFAULT_PRICES
+    return json_codec.load_path(path)
+
+
+def estimate_prompt(name: str, text: str, prices: Dict[str, Dict[str, float]],
+                    output_tokens: int = DEFAULT_OUTPUT_TOKENS, schema_bytes: int = 0) -> PromptEstimate:
+    tokens = estimate_tokens(text)
+    estimate = PromptEstimate(name, len(text), tokens, schema_bytes)
+    for model, rates in prices.items():
+        estimate.costs[model] = (tokens * rates.get("input_per_mtok", 0.0) + output_tokens * rates.get("output_per_mtok", 0.0)) / 1_000_000
+        limit = rates.get("context_tokens")
+        if limit and tokens + output_tokens > limit:
+            estimate.over_limit.append(model)
+    return estimate
+
+
+def format_report(estimates: Iterable[PromptEstimate], prices: Dict[str, Dict[str, float]]) -> str:
+    estimates = list(estimates)
+    models = list(prices)
+    lines = [
+        "| Prompt | Chars | ~Tokens | Schema bytes | " + " | ".join(f"{model} $" for model in models) + " | Over limit |",
+        "|---|---:|---:|---:|" + "---:|" * len(models) + "---|",
+    ]
+    for item in estimates:
+        costs = " | ".join(f"{item.costs.get(model, 0.0):.4f}" for model in models)
+        flag = "⚠️ " + ", ".join(item.over_limit) if item.over_limit else ""
+        lines.append(f"| {item.name} | {item.chars:,} | {item.tokens:,} | {item.schema_bytes:,} | {costs} | {flag} |")
+    totals = " | ".join(f"**{sum(item.costs.get(model, 0.0) for item in estimates):.4f}**" for model in models)
+    lines.append(
+        f"| **Total ({len(estimates)})** | **{sum(item.chars for item in estimates):,}** | "
+        f"**{sum(item.tokens for item in estimates):,}** | **{sum(item.schema_bytes for item in estimates):,}** | {totals} | "
+        f"{sum(1 for item in estimates if item.over_limit)} flagged |"
+    )
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Estimate token counts and cost for prompt files")
+    parser.add_argument("prompts", nargs="+", type=Path)
+    parser.add_argument("--prices", type=Path, help="JSON price table (model → input_per_mtok/output_per_mtok/context_tokens)")
+    parser.add_argument("--output-tokens", type=int, default=DEFAULT_OUTPUT_TOKENS, help="Expected response tokens per prompt")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    prices = load_prices(args.prices)
+    estimates = [
+        estimate_prompt(str(path), path.read_text(encoding="utf-8"), prices, args.output_tokens)
+        for path in args.prompts
+    ]
+    print(format_report(estimates, prices))
+    return 1 if any(item.over_limit for item in estimates) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Shared-prefix prompt layout for provider-side prompt caching.
+
+Every prompt is assembled as::
+
+    system prompt ─ shared process docs ─ phase docs ─┆─ subprocess/deliverable material
+                    ▲ cache breakpoint   ▲ cache breakpoint
+
+The system prompt and prefix segments are identical, byte for byte and in a fixed order,
+for every prompt in a phase, so a provider's prompt cache serves them after the first
+request; only the suffix differs. Providers that take explicit cache breakpoints (Anthropic
+``cache_control``) get one after each prefix segment; the text form marks them with
+``CACHE_BREAKPOINT`` so the layout is visible in saved packs and batch files.
+
+Usage:
+    # Shared-prefix ratio across prompt packs
+    python3 analysis/timesheet_process/shared/prompt_layout.py phases/*/agents/*/prompt-pack.*.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import json_codec
+
+SHARED_SYSTEM_PROMPT = (
+    "You are an AI documentation specialist for the H&J Petroleum HubSpot timesheet system. "
+    "Use the shared process and phase context that follows, then the deliverable-specific "
+    "instructions at the end of the prompt."
+)
+CACHE_BREAKPOINT = "<!-- cache-breakpoint -->"
+SEGMENT_SEPARATOR = "\n\n"
+
+
+def join_prefix(system: str, prefix: Sequence[str]) -> str:
+    """System prompt plus prefix segments as one string (the cacheable part of a prompt)."""
+    return SEGMENT_SEPARATOR.join([system, *prefix])
+
+
+def render_text(system: str, prefix: Sequence[str], user: str) -> str:
+    """Whole prompt as text with a breakpoint marker after each prefix segment."""
+    parts = [system] + [f"{segment}\n{CACHE_BREAKPOINT}" for segment in prefix] + [user]
+    return SEGMENT_SEPARATOR.join(parts)
+
+
+def shared_prefix_report(prompts: Iterable[Tuple[str, str, str]]) -> Dict[str, Any]:
+    """Shared-prefix statistics for (group label, prefix text, suffix text) prompts.
+
+    ``shared_prefix_ratio`` is the fraction of all prompt characters that sit in a prefix
+    used by more than one prompt — the part a warm provider cache can serve.
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    total = 0
+    for label, prefix, suffix in prompts:
+        total += len(prefix) + len(suffix)
+        group = groups.setdefault(prefix, {"labels": set(), "prompts": 0, "prefix_chars": len(prefix)})
+        group["labels"].add(label)
+        group["prompts"] += 1
+    shared = sum(g["prefix_chars"] * g["prompts"] for g in groups.values() if g["prompts"] > 1)
+    return {
+        "prompts": sum(g["prompts"] for g in groups.values()),
+        "distinct_prefixes": len(groups),
+        "total_chars": total,
+        "shared_prefix_chars": shared,
+        "shared_prefix_ratio": round(shared / total, 3) if total else 0.0,
+        "groups": [
+            {"labels": sorted(g["labels"]), "prompts": g["prompts"], "prefix_chars": g["prefix_chars"]}
+            for g in sorted(groups.values(), key=lambda g: sorted(g["labels"]))
+        ],
+    }
+
+
+def format_prefix_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Shared prefix: {report['shared_prefix_ratio']:.1%} of {report['total_chars']:,} chars "
+        f"across {report['prompts']} prompts ({report['distinct_prefixes']} distinct prefixes)"
+    ]
+    for group in report["groups"]:
+        lines.append(f"  - {', '.join(group['labels'])}: {group['prompts']} prompt(s) share {group['prefix_chars']:,} chars")
+    return "\n".join(lines)
+
+
+def pack_prompt_parts(pack: Dict[str, Any]) -> Tuple[str, List[str], str]:
+    """(system, prefix segments, user) from a prompt pack; older packs have no prefix."""
+    prompt = pack.get("prompt", {})
+    prefix = [segment["text"] if isinstance(segment, dict) else str(segment) for segment in prompt.get("prefix", [])]
+    return prompt.get("system", ""), prefix, prompt.get("user", "")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report the shared-prefix ratio across prompt packs")
+    parser.add_argument("packs", nargs="+", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    prompts = []
+    for path in args.packs:
+        pack = json_codec.load_path(path)
+        system, prefix, user = pack_prompt_parts(pack)
+        prompts.append((pack.get("metadata", {}).get("phase", path.parent.name), join_prefix(system, prefix), user))
+    print(format_prefix_report(shared_prefix_report(prompts)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
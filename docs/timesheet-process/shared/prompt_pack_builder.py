@@ -1,14 +1,31 @@
 #!/usr/bin/env python3
-"""Build AI prompt packs for timesheet documentation deliverables."""
+"""Build AI prompt packs for timesheet documentation deliverables.
+
+Every pack in a phase starts with the same byte-identical prefix — the shared system prompt,
+then the shared process documents, then the phase documents, always in the same order — and
+only the subprocess- and deliverable-specific material follows it, so provider prompt caching
+serves the prefix after the first request of a batch. Each prefix segment ends in a cache
+breakpoint (see prompt_layout.py).
+
+Usage:
+    # Agent guide and implementation guide packs for one subprocess
+    python3 analysis/timesheet_process/shared/prompt_pack_builder.py 01_foundation project_configuration agent implementation_guide
+"""
 
 from __future__ import annotations
 
 import argparse
-import json
 import textwrap
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import json_codec
+from instrumentation import add_instrumentation_arguments, instrumented, span
+from prompt_layout import SHARED_SYSTEM_PROMPT, format_prefix_report, join_prefix, shared_prefix_report
+
+# The shared process documents sit next to shared/, wherever the process root is checked out
+PROCESS_ROOT = Path(__file__).resolve().parents[1]
 
 DELIVERABLE_TEMPLATES: Dict[str, Dict[str, Any]] = {
     "agent": {
@@ -33,7 +50,7 @@ DELIVERABLE_TEMPLATES: Dict[str, Dict[str, Any]] = {
             """
             Produce an updated `{deliverable}` for the `{phase_label}` ▸ `{subprocess_label}` subprocess.
 
-            Use the context bundle below. When citing artifacts, reference them by relative path and describe how they inform the agent's responsibilities.
+            Use the shared and phase context provided above together with the subprocess context below. When citing artifacts, reference them by relative path and describe how they inform the agent's responsibilities.
 
             ### Deliverable Requirements
             - Target path: `{target_path}`
@@ -44,7 +61,7 @@ DELIVERABLE_TEMPLATES: Dict[str, Dict[str, Any]] = {
             - Acceptance tests:
             {acceptance_block}
 
-            ### Context Bundle
+            ### Subprocess Context
             {context_block}
 
             ### Output Expectations
@@ -68,13 +85,13 @@ DELIVERABLE_TEMPLATES: Dict[str, Dict[str, Any]] = {
             "Highlight open engineering risks or follow-up actions."
         ],
         "acceptance_tests": [
-            "Every workflow or module mentioned maps to a file in the context bundle.",
+            "Every workflow or module mentioned maps to a file in the provided context.",
             "Troubleshooting tips reference actual logs or scripts when applicable."
         ],
         "system_prompt": "You are an engineering technical writer producing backend implementation guidance for the timesheet system.",
         "user_prompt_template": textwrap.dedent(
             """
-            Create an updated `{deliverable}` for `{phase_label}` ▸ `{subprocess_label}`.
+            Create an updated `{deliverable}` for `{phase_label}` ▸ `{subprocess_label}`, drawing on the shared and phase context provided above.
 
             ### Deliverable Requirements
             - Target path: `{target_path}`
@@ -85,7 +102,7 @@ DELIVERABLE_TEMPLATES: Dict[str, Dict[str, Any]] = {
             - Acceptance tests:
             {acceptance_block}
 
-            ### Context Bundle
+            ### Subprocess Context
             {context_block}
 
             ### Output Expectations
@@ -163,7 +180,13 @@ def summarize_title(path: Path) -> str:
     return first_line or path.name
 
 
-def add_context_item(items: List[Dict[str, Any]], path: Path, repo_root: Path, explicit_role: Optional[str] = None) -> None:
+def add_context_item(
+    items: List[Dict[str, Any]],
+    path: Path,
+    repo_root: Path,
+    explicit_role: Optional[str] = None,
+    scope: str = "subprocess",
+) -> None:
     if not path.exists():
         return
     role = explicit_role or infer_role(path)
@@ -172,6 +195,7 @@ def add_context_item(items: List[Dict[str, Any]], path: Path, repo_root: Path, e
     items.append(
         {
             "id": item_id,
+            "scope": scope,
             "role": role,
             "path": str(path.relative_to(repo_root)),
             "modified": iso_timestamp(path.stat().st_mtime),
@@ -181,11 +205,10 @@ def add_context_item(items: List[Dict[str, Any]], path: Path, repo_root: Path, e
     )
 
 
-def gather_context_bundle(phase_path: Path, subprocess_path: Path, repo_root: Path) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-
+def context_bundle_paths(phase_path: Path, subprocess_path: Path) -> List[Tuple[Path, str, Optional[str]]]:
+    """(path, scope, explicit role) for every document a subprocess's packs may cite, in bundle order."""
     # Shared process documents
-    process_root = repo_root / "analysis" / "timesheet_process"
+    process_root = PROCESS_ROOT
     shared_root = process_root / "shared"
     shared_docs = [
         process_root / "PROCESS-FLOW-COMPLETE.md",
@@ -194,13 +217,12 @@ def gather_context_bundle(phase_path: Path, subprocess_path: Path, repo_root: Pa
         process_root / "CONTEXT-RESET-SUMMARY.md",
         shared_root / "context-index.json",
     ]
-    for doc in shared_docs:
-        add_context_item(items, doc, repo_root)
+    paths: List[Tuple[Path, str, Optional[str]]] = [(doc, "shared", None) for doc in shared_docs]
 
     # Phase & subprocess specific docs
-    add_context_item(items, phase_path / "overview.md", repo_root)
-    add_context_item(items, subprocess_path / "overview.md", repo_root)
-    add_context_item(items, subprocess_path / "agent-status.json", repo_root, explicit_role="logs")
+    paths.append((phase_path / "overview.md", "phase", None))
+    paths.append((subprocess_path / "overview.md", "subprocess", None))
+    paths.append((subprocess_path / "agent-status.json", "subprocess", "logs"))
 
     # Key subdirectories within subprocess
     for rel_dir in ["backend", "frontend", "properties", "workflows", "issues", "assets", "cross-references"]:
@@ -209,9 +231,15 @@ def gather_context_bundle(phase_path: Path, subprocess_path: Path, repo_root: Pa
             continue
         # include summary file if present (prefer Markdown or JSON)
         for suffix in (".md", ".json", ".txt"):
-            for path in sorted(candidate.glob(f"*{suffix}")):
-                add_context_item(items, path, repo_root)
+            paths.extend((path, "subprocess", None) for path in sorted(candidate.glob(f"*{suffix}")))
+
+    return paths
 
+
+def gather_context_bundle(phase_path: Path, subprocess_path: Path, repo_root: Path) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    for path, scope, role in context_bundle_paths(phase_path, subprocess_path):
+        add_context_item(items, path, repo_root, explicit_role=role, scope=scope)
     return items
 
 
@@ -238,6 +266,25 @@ def context_to_block(context_items: List[Dict[str, Any]]) -> str:
     return "\n".join(blocks)
 
 
+def prefix_segments(context_items: List[Dict[str, Any]], phase_label: str) -> List[Dict[str, Any]]:
+    """Shared and phase context as cacheable prompt segments, in a fixed order.
+
+    Item text deliberately leaves out modification times and anything pack-specific so the
+    segments stay byte-identical across every pack in the phase.
+    """
+    headings = {"shared": "Shared Process Context", "phase": f"Phase Context: {phase_label}"}
+    segments: List[Dict[str, Any]] = []
+    for scope, heading in headings.items():
+        scoped = [item for item in context_items if item.get("scope") == scope]
+        if scoped:
+            segments.append({
+                "name": scope,
+                "text": f"### {heading}\n{context_to_block(scoped)}",
+                "cache_breakpoint": True,
+            })
+    return segments
+
+
 def build_prompt_pack(
     template_key: str,
     phase: str,
@@ -259,7 +306,9 @@ def build_prompt_pack(
 
     checklist_block = checklist_to_block(template.get("checklist", []))
     acceptance_block = checklist_to_block(template.get("acceptance_tests", []))
-    context_block = context_to_block(context_items)
+    prefix = prefix_segments(context_items, phase_label)
+    subprocess_items = [item for item in context_items if item.get("scope", "subprocess") == "subprocess"]
+    context_block = context_to_block(subprocess_items) or "- (no subprocess-specific artifacts found)"
 
     prompt_user = template["user_prompt_template"].format(
         deliverable=template["filename"],
@@ -292,8 +341,9 @@ def build_prompt_pack(
             "acceptance_tests": template.get("acceptance_tests", []),
         },
         "prompt": {
-            "system": template["system_prompt"],
-            "user": prompt_user.strip(),
+            "system": SHARED_SYSTEM_PROMPT,
+            "prefix": prefix,
+            "user": f"Role: {template['system_prompt']}\n\n{prompt_user.strip()}",
         },
         "outputs": {
             "format": "markdown",
@@ -312,7 +362,8 @@ def build_prompt_pack(
 def load_context_index(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Context index not found at {path}. Run context_index.py first.")
-    data = json.loads(path.read_text(encoding="utf-8"))
+    with span("parse"):
+        data = json_codec.load_path(path)
     data["_source_path"] = str(path.relative_to(Path.cwd())) if path.is_absolute() else str(path)
     return data
 
@@ -336,11 +387,58 @@ def resolve_repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
-def parse_args() -> argparse.Namespace:
+def write_prompt_packs(
+    phase: str,
+    subprocess: str,
+    deliverables: Sequence[str],
+    context_index: Dict[str, Any],
+    repo_root: Path,
+    phase_path: Path,
+    subprocess_path: Path,
+    pretty: bool = False,
+    output_path: Optional[Path] = None,
+) -> List[Tuple[Path, Dict[str, Any]]]:
+    """Build and write one pack per deliverable; the subprocess context is gathered once for all of them."""
+    with span("scan"):
+        context_items = gather_context_bundle(phase_path, subprocess_path, repo_root)
+    written = []
+    for deliverable in deliverables:
+        with span("render"):
+            prompt_pack = build_prompt_pack(
+                template_key=deliverable,
+                phase=phase,
+                subprocess=subprocess,
+                context_index=context_index,
+                context_items=context_items,
+                repo_root=repo_root,
+                phase_path=phase_path,
+                subprocess_path=subprocess_path,
+            )
+            text = json_codec.dumps(prompt_pack, indent=2 if pretty else None,
+                                    separators=None if pretty else json_codec.COMPACT, ensure_ascii=False)
+        target = output_path or subprocess_path / f"prompt-pack.{deliverable}.json"
+        with span("write"):
+            target.write_text(text, encoding="utf-8")
+        written.append((target, prompt_pack))
+    return written
+
+
+def prefix_report_entry(phase: str, prompt_pack: Dict[str, Any]) -> Tuple[str, str, str]:
+    """(phase, prefix text, user text) as ``shared_prefix_report`` expects them."""
+    prompt = prompt_pack["prompt"]
+    return phase, join_prefix(prompt["system"], [segment["text"] for segment in prompt["prefix"]]), prompt["user"]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate AI prompt packs using the shared context index.")
     parser.add_argument("phase", help="Phase identifier (e.g., 01_foundation)")
     parser.add_argument("subprocess", help="Subprocess slug (e.g., project_configuration)")
-    parser.add_argument("deliverable", choices=sorted(DELIVERABLE_TEMPLATES.keys()), help="Deliverable template key")
+    parser.add_argument(
+        "deliverables",
+        nargs="+",
+        choices=sorted(DELIVERABLE_TEMPLATES.keys()),
+        help="Deliverable template key(s); packs built together share one prompt prefix",
+    )
     parser.add_argument(
         "--context-index",
         dest="context_index_path",
@@ -353,52 +451,42 @@ def parse_args() -> argparse.Namespace:
         dest="output_path",
         type=Path,
         default=None,
-        help="Optional output path for the prompt pack (defaults to subprocess directory)",
+        help="Optional output path for the prompt pack (single deliverable only; defaults to subprocess directory)",
     )
     parser.add_argument(
         "--pretty",
         action="store_true",
         help="Pretty-print JSON output",
     )
-    return parser.parse_args()
+    add_instrumentation_arguments(parser)
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     repo_root = resolve_repo_root()
     paths = determine_paths(args.phase, args.subprocess, repo_root)
 
-    context_index = load_context_index(args.context_index_path)
-    context_items = gather_context_bundle(paths["phase_path"], paths["subprocess_path"], repo_root)
-
-    prompt_pack = build_prompt_pack(
-        template_key=args.deliverable,
-        phase=args.phase,
-        subprocess=args.subprocess,
-        context_index=context_index,
-        context_items=context_items,
-        repo_root=repo_root,
-        phase_path=paths["phase_path"],
-        subprocess_path=paths["subprocess_path"],
-    )
-
-    default_output = paths["subprocess_path"] / f"prompt-pack.{args.deliverable}.json"
-    output_path = args.output_path or default_output
-
-    output_path.write_text(
-        json.dumps(prompt_pack, indent=2 if args.pretty else None, ensure_ascii=False),
-        encoding="utf-8",
-    )
-    print(f"Prompt pack written to {output_path.relative_to(repo_root)}")
+    if args.output_path and len(args.deliverables) > 1:
+        raise SystemExit("--output can only be used with a single deliverable")
+
+    with instrumented(args, "prompt_pack_builder"):
+        context_index = load_context_index(args.context_index_path)
+        written = write_prompt_packs(
+            args.phase,
+            args.subprocess,
+            args.deliverables,
+            context_index,
+            repo_root,
+            paths["phase_path"],
+            paths["subprocess_path"],
+            pretty=args.pretty,
+            output_path=args.output_path,
+        )
+    for output_path, _ in written:
+        print(f"Prompt pack written to {output_path.relative_to(repo_root)}")
+    print(format_prefix_report(shared_prefix_report([prefix_report_entry(args.phase, pack) for _, pack in written])))
 
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
-
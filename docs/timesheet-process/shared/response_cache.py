@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Persistent prompt → response cache for LLM execution.
+
+Responses are stored in SQLite keyed by a SHA-256 digest of the provider, model, system
+prompt, user prompt, and generation parameters, so a byte-identical prompt is answered from
+disk without a network round trip. Entries expire after a TTL and the store is trimmed to a
+byte budget by evicting the least recently used responses first.
+
+Usage:
+    # Show cache size and entry count
+    python3 analysis/timesheet_process/shared/response_cache.py
+
+    # Drop expired entries and trim to 100 MB
+    python3 analysis/timesheet_process/shared/response_cache.py --prune --max-mb 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from hjps import default_layout
+
+DEFAULT_CACHE_PATH = default_layout().cache / "llm-responses.sqlite"
+DEFAULT_TTL_DAYS = 30.0
+DEFAULT_MAX_MB = 500.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    usage TEXT NOT NULL DEFAULT '{}',
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed);
+"""
+
+
+def cache_key(provider: str, model: str, system: str, user: str, parameters: Dict[str, Any]) -> str:
+    """Digest of everything that determines a response."""
+    material = json.dumps(
+        {"provider": provider, "model": model, "system": system, "user": user, "parameters": parameters},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheCounters:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {**asdict(self), "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL expiry and size-bounded LRU eviction."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl_days: float = DEFAULT_TTL_DAYS,
+                 max_bytes: int = int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_bytes = max_bytes
+        self.counters = CacheCounters()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(SCHEMA)
+        self._db.execute("PRAGMA journal_mode=WAL")
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        row = self._db.execute("SELECT text, usage, created FROM responses WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None:
+            self.counters.misses += 1
+            return None
+        if self.ttl_seconds and now - row[2] > self.ttl_seconds:
+            with self._db:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.counters.expired += 1
+            self.counters.misses += 1
+            return None
+        with self._db:
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self.counters.hits += 1
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, text: str, usage: Dict[str, Any] | None = None) -> None:
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, text, usage, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, json.dumps(usage or {}), size, now, now),
+            )
+        self.counters.stores += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        with self._db:
+            for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                self.counters.evictions += 1
+
+    def prune(self) -> int:
+        """Delete expired entries, then trim to the byte budget; returns entries removed."""
+        before = self.entries()
+        if self.ttl_seconds:
+            with self._db:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self._evict()
+        return before - self.entries()
+
+    def entries(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "entries": self.entries(),
+            "bytes": self.total_bytes(),
+            **self.counters.to_dict(),
+        }
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect or prune the LLM response cache")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE_PATH)
+    parser.add_argument("--ttl-days", type=float, default=DEFAULT_TTL_DAYS)
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB)
+    parser.add_argument("--prune", action="store_true", help="Remove expired entries and trim to --max-mb")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cache = ResponseCache(args.cache, args.ttl_days, int(args.max_mb * 1024 * 1024))
+    if args.prune:
+        print(f"Removed {cache.prune()} entries")
+    print(json.dumps(cache.summary(), indent=2))
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
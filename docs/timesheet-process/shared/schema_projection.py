@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Project HubSpot object schemas down to the properties a prompt actually needs.
+
+A projection keeps the requested key properties, their direct dependencies (properties a
+key property's calculation formula references, and calculated properties that reference a
+key property), the schema's required and display properties, and the association list.
+Enumeration options are collapsed to the first few values plus a count, and everything is
+rendered as compact markdown tables instead of the raw JSON export. Projections are cached
+per (object, property set) so repeated prompts for the same subprocess reuse them.
+
+Usage:
+    # Compare full vs projected size for one schema
+    python3 analysis/timesheet_process/shared/schema_projection.py \
+        data/raw/ai-context/ai-context-export/data-model/hj_projects_schema.json \
+        --properties hj_project_name hj_approver_email
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+import json_codec
+from extract_project_configuration_context import ASSOCIATION_OBJECT_MAP, schema_properties
+
+MAX_OPTIONS = 5
+MAX_DESCRIPTION = 80
+NAME_TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+@dataclass
+class Projection:
+    """Selected properties and associations for one object, plus why each property is in."""
+
+    object_name: str
+    properties: List[Dict[str, Any]]
+    reasons: Dict[str, str]
+    required: FrozenSet[str]
+    associations: List[Dict[str, Any]]
+    missing: List[str] = field(default_factory=list)
+    total_properties: int = 0
+
+    def render(self) -> str:
+        lines = [
+            f"#### {self.object_name} ({len(self.properties)} of {self.total_properties} properties)",
+            "",
+            "| Property | Type | Req | Why | Options / Notes |",
+            "|---|---|---|---|---|",
+        ]
+        for prop in self.properties:
+            name = prop.get("name", "")
+            ptype = f"{prop.get('type', '')}/{prop.get('fieldType', '')}".strip("/")
+            req = "✅" if name in self.required else ""
+            lines.append(f"| `{name}` | {ptype} | {req} | {self.reasons.get(name, '')} | {_notes(prop)} |")
+        if len(lines) == 4:
+            lines.append("| _(none)_ | | | | |")
+        if self.associations:
+            lines += ["", "| Association | Target | ID | Cardinality |", "|---|---|---|---|"]
+            for assoc in self.associations:
+                target = ASSOCIATION_OBJECT_MAP.get(assoc.get("toObjectTypeId"), assoc.get("toObjectTypeId", ""))
+                lines.append(f"| `{assoc.get('name', '')}` | {target} | {assoc.get('id', '')} | {assoc.get('cardinality', '')} |")
+        return "\n".join(lines)
+
+
+def _notes(prop: Dict[str, Any]) -> str:
+    notes: List[str] = []
+    options = prop.get("options") or []
+    if options:
+        values = [str(option.get("value", option.get("label", ""))) for option in options[:MAX_OPTIONS]]
+        extra = len(options) - len(values)
+        notes.append(" · ".join(values) + (f" (+{extra} more)" if extra > 0 else ""))
+    if prop.get("calculationFormula"):
+        notes.append(f"= {prop['calculationFormula']}")
+    if prop.get("hasUniqueValue"):
+        notes.append("unique")
+    if prop.get("referencedObjectType"):
+        notes.append(f"→ {prop['referencedObjectType']}")
+    description = (prop.get("description") or "").replace("\n", " ").replace("|", "/").strip()
+    if description:
+        notes.append(description if len(description) <= MAX_DESCRIPTION else description[:MAX_DESCRIPTION - 1] + "…")
+    return "; ".join(notes)
+
+
+def _formula_refs(prop: Dict[str, Any], names: Iterable[str]) -> set[str]:
+    formula = prop.get("calculationFormula") or ""
+    return set(NAME_TOKEN.findall(formula)) & set(names) if formula else set()
+
+
+def project_schema(object_name: str, schema: Dict[str, Any], key_properties: Iterable[str]) -> Projection:
+    """Key properties (exact or ``hj_``-prefixed match) plus dependencies, required and display properties."""
+    props = schema_properties(schema)
+    by_name = {prop.get("name", ""): prop for prop in props}
+    required = frozenset(schema.get("requiredProperties") or [])
+
+    reasons: Dict[str, str] = {}
+    missing: List[str] = []
+    for key in key_properties:
+        name = key if key in by_name else f"hj_{key}" if f"hj_{key}" in by_name else None
+        if name is None:
+            missing.append(key)
+        else:
+            reasons.setdefault(name, "key")
+    keys = set(reasons)
+
+    for name in sorted(keys):
+        for ref in sorted(_formula_refs(by_name[name], by_name)):
+            reasons.setdefault(ref, f"used by `{name}`")
+    for prop in props:
+        refs = _formula_refs(prop, keys)
+        if refs:
+            reasons.setdefault(prop.get("name", ""), f"derived from `{sorted(refs)[0]}`")
+
+    display = [schema.get("primaryDisplayProperty"), *(schema.get("secondaryDisplayProperties") or [])]
+    for name in [*sorted(required), *display]:
+        if name in by_name:
+            reasons.setdefault(name, "required" if name in required else "display")
+
+    ordered = [by_name[name] for name in sorted(reasons, key=lambda n: (reasons[n] != "key", n))]
+    associations = sorted(schema.get("associations") or [], key=lambda a: str(a.get("id", "")))
+    return Projection(object_name, ordered, reasons, required, associations, missing, len(props))
+
+
+class SchemaProjector:
+    """Thread-safe cache of rendered projections keyed by (object, property set)."""
+
+    def __init__(self) -> None:
+        self._cache: Dict[Tuple[str, FrozenSet[str]], Tuple[str, FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.full_chars = 0
+        self.projected_chars = 0
+
+    def project(self, object_name: str, schema: Dict[str, Any],
+                key_properties: Iterable[str]) -> Tuple[str, FrozenSet[str]]:
+        """Rendered table and the key properties it could not find, cached per (object, property set)."""
+        key = (object_name, frozenset(key_properties))
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                return self._cache[key]
+        projection = project_schema(object_name, schema, sorted(key[1]))
+        value = (projection.render(), frozenset(projection.missing))
+        with self._lock:
+            if key not in self._cache:
+                self.misses += 1
+                self.full_chars += len(json_codec.dumps(schema, indent=2))
+                self.projected_chars += len(value[0])
+            return self._cache.setdefault(key, value)
+
+    def render(self, object_name: str, schema: Dict[str, Any], key_properties: Iterable[str]) -> str:
+        return self.project(object_name, schema, key_properties)[0]
+
+    def render_all(self, schemas: Dict[str, Dict[str, Any]], key_properties: Iterable[str]) -> str:
+        """Every object's table, then the key properties no schema defines."""
+        keys = list(key_properties)
+        results = [self.project(obj, schema, keys) for obj, schema in schemas.items()]
+        sections = [text for text, _ in results]
+        unmatched = set(keys).intersection(*(missing for _, missing in results)) if results else set()
+        if unmatched:
+            sections.append("Key properties not found in any schema: " + ", ".join(f"`{name}`" for name in sorted(unmatched)))
+        return "\n\n".join(sections)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "full_schema_chars": self.full_chars,
+            "projected_chars": self.projected_chars,
+            "reduction": round(self.full_chars / self.projected_chars, 1) if self.projected_chars else None,
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render a compact schema projection and report the size reduction")
+    parser.add_argument("schema", type=Path, help="Schema export (e.g. hj_projects_schema.json)")
+    parser.add_argument("--properties", nargs="*", default=[], help="Key properties to keep")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    schema = json_codec.load_path(args.schema)
+    projector = SchemaProjector()
+    print(projector.render(args.schema.stem.replace("_schema", ""), schema, args.properties))
+    summary = projector.summary()
+    print(f"\n{summary['full_schema_chars']:,} → {summary['projected_chars']:,} chars ({summary['reduction']}× smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Incremental, atomic, resumable output files for streamed LLM responses.
+
+Chunks are appended to ``<target>.partial`` and flushed as they arrive, so the first bytes
+of a deliverable reach disk immediately; ``commit()`` renames the partial over the target
+in one step, so readers never see a half-written file. A ``<target>.partial.json`` sidecar
+records the request digest: if a run is interrupted, the next run with the same request
+picks the partial text back up (and asks the model to continue from it) instead of
+starting over. A partial left by a different request is discarded.
+
+Usage:
+    # List partial outputs left by interrupted runs under a directory
+    python3 analysis/timesheet_process/shared/streaming_output.py phases/01-foundation/agents
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO, Optional
+
+PARTIAL_SUFFIX = ".partial"
+
+
+class StreamingOutput:
+    """Append-and-rename writer for one deliverable."""
+
+    def __init__(self, target: Path, key: str):
+        self.target = Path(target)
+        self.key = key
+        self.partial = self.target.with_name(self.target.name + PARTIAL_SUFFIX)
+        self.meta = self.target.with_name(self.target.name + PARTIAL_SUFFIX + ".json")
+        self.resumed = 0
+        self._chunks: list[str] = []
+        self._handle: Optional[IO[str]] = None
+        self._load_partial()
+
+    def _load_partial(self) -> None:
+        if not self.partial.exists():
+            return
+        try:
+            meta = json.loads(self.meta.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            meta = {}
+        if meta.get("key") == self.key:
+            text = self.partial.read_text(encoding="utf-8")
+            self._chunks.append(text)
+            self.resumed = len(text)
+        else:
+            self.discard()
+
+    @property
+    def text(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def write(self, chunk: str) -> None:
+        if self._handle is None:
+            self.target.parent.mkdir(parents=True, exist_ok=True)
+            self.meta.write_text(json.dumps({"key": self.key, "started": time.time()}), encoding="utf-8")
+            self._handle = self.partial.open("a", encoding="utf-8")
+        self._handle.write(chunk)
+        self._handle.flush()
+        self._chunks.append(chunk)
+
+    def commit(self) -> None:
+        """Atomically replace the target with the completed output."""
+        if self._handle is None:
+            self.write("")
+        self.close()
+        os.replace(self.partial, self.target)
+        self.meta.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Stop writing but keep the partial so a later run can resume it."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self) -> None:
+        self.close()
+        self._chunks = []
+        self.resumed = 0
+        self.partial.unlink(missing_ok=True)
+        self.meta.unlink(missing_ok=True)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List resumable partial outputs")
+    parser.add_argument("root", type=Path, nargs="?", default=Path("."))
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    partials = sorted(args.root.rglob(f"*{PARTIAL_SUFFIX}"))
+    for partial in partials:
+        print(f"{partial} ({partial.stat().st_size:,} bytes)")
+    print(f"{len(partials)} partial output(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""A failure skips every transitive dependent, and every node ends completed or failed."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import dependency_graph  # noqa: E402
+
+# root → child → grandchild fails at the root; "side" depends on nothing that fails
+DEPS = {
+    "root": [],
+    "child": ["root"],
+    "grandchild": ["child"],
+    "side": [],
+    "join": ["side", "grandchild"],
+}
+
+
+def build(node: str) -> str:
+    if node == "root":
+        raise RuntimeError("boom")
+    return node.upper()
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_failure_skips_dependents_two_levels_deep(jobs: int) -> None:
+    ran = []
+    run = dependency_graph.run_graph(DEPS, build, jobs, on_result=lambda node, value: ran.append(node))
+    assert run.results == {"side": "SIDE"}
+    assert ran == ["side"]
+    assert run.failed == {
+        "root": "RuntimeError: boom",
+        "child": "skipped: dependency failed",
+        "grandchild": "skipped: dependency failed",
+        "join": "skipped: dependency failed",
+    }
+    assert set(run.results) | set(run.failed) == set(DEPS)
+
+
+def test_dependencies_run_first_and_outside_nodes_are_ignored() -> None:
+    order = []
+    run = dependency_graph.run_graph({"b": ["a", "elsewhere"], "a": []}, order.append, jobs=2)
+    assert order == ["a", "b"]
+    assert not run.failed
+
+
+def test_cycle_is_named() -> None:
+    with pytest.raises(ValueError, match="Dependency cycle: a -> b -> a"):
+        dependency_graph.topological_order({"a": ["b"], "b": ["a"], "c": []})
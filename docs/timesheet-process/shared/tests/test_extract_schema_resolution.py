@@ -0,0 +1,32 @@
+"""Extracts render the schema export SchemaCollection.find resolves, not whichever alias sorts first."""
+
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import extract_project_configuration_context as extract  # noqa: E402
+from hjps import SchemaCollection  # noqa: E402
+
+
+def write_schema(directory: Path, name: str, prop: str) -> None:
+    schema = {"name": "hj_projects", "labels": {"singular": "Project"}, "properties": [{"name": prop, "type": "string"}]}
+    (directory / name).write_text(json.dumps(schema), encoding="utf-8")
+
+
+def test_canonical_export_wins_over_legacy_file(tmp_path: Path) -> None:
+    write_schema(tmp_path, "hj_projects-schema-2-26103074.json", "hj_canonical_property")
+    write_schema(tmp_path, "hj_projects_schema.json", "hj_legacy_property")
+    schemas = SchemaCollection(tmp_path)
+    assert schemas.find("hj_projects") == "hj_projects-schema-2-26103074.json"
+
+    with ThreadPoolExecutor(2) as executor:
+        indexes = extract.SharedIndexes(schemas=extract.load_schema_index(schemas, executor), schema_exports=schemas,
+                                        workflows=None, modules=None, load_seconds={})
+    rendered = "\n".join(extract.build_object_sections("hj_projects", indexes))
+    assert "hj_canonical_property" in rendered
+    assert "hj_legacy_property" not in rendered
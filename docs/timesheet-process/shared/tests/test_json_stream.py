@@ -0,0 +1,52 @@
+"""Streaming extraction must agree with json.load wherever the chunk boundaries fall."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import json_stream  # noqa: E402
+
+DOCUMENT = json.dumps({
+    "id": 7,
+    "ratio": 123.456,
+    "tiny": -1.5e-3,
+    "big": 2E+10,
+    "name": "quote \" backslash \\ unicode é",
+    "flags": [True, False, None],
+    "skipped": {"nested": [1.25, {"deep": "x"}], "n": 10},
+    "actions": [
+        {"type": "SET", "value": 0.5, "filters": [{"operator": "EQ", "value": 1e3}]},
+        {"type": "DELAY", "value": -0, "filters": []},
+        {"type": "BRANCH", "value": 12.0},
+    ],
+})
+PATTERNS = ["id", "ratio", "tiny", "big", "name", "flags", "actions[].type", "actions[].value", "actions[].filters[].value"]
+
+
+def expected(pattern: str):
+    data = json.loads(DOCUMENT, parse_float=Decimal)
+    return list(json_stream._walk_loaded(data, json_stream.pattern_to_prefix(pattern).split(".")))
+
+
+@pytest.mark.parametrize("backend", json_stream.available_backends())
+@pytest.mark.parametrize("chunk_size", list(range(1, 17)) + [64, 4096])
+def test_extract_matches_json_load(backend: str, chunk_size: int) -> None:
+    found = {pattern: [] for pattern in PATTERNS}
+    for pattern, value in json_stream.extract(io.StringIO(DOCUMENT), PATTERNS, backend=backend, chunk_size=chunk_size):
+        found[pattern].append(value)
+    assert found == {pattern: expected(pattern) for pattern in PATTERNS}
+
+
+def test_number_split_after_decimal_point(tmp_path: Path) -> None:
+    # The default chunk ends right after "123." so the number continues in the next read
+    path = tmp_path / "export.json"
+    path.write_text('{"x":' + " " * 65527 + '123.456,"id":7}', encoding="utf-8")
+    assert json_stream.extract_fields(path, ["id", "x"], backend="python") == {"id": 7, "x": Decimal("123.456")}
@@ -0,0 +1,148 @@
+"""The execution engine against the local stub: retries, Retry-After, timeouts, resumed streams, cache, commit."""
+
+from __future__ import annotations
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import llm_engine  # noqa: E402
+from llm_stub_server import StubServer, start_stub_server  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from streaming_output import StreamingOutput  # noqa: E402
+
+PROMPT = "Describe the approval workflow. " * 4
+
+
+def stub_text(user: str = PROMPT) -> str:
+    """What the stub answers for ``user`` (see llm_stub_server.StubHandler)."""
+    return f"# Stub response\n\nEcho of {len(user)} prompt characters.\n"
+
+
+@pytest.fixture
+def stub(request: pytest.FixtureRequest) -> Iterator[Tuple[StubServer, str]]:
+    random.seed(7)
+    server, url = start_stub_server(**{"latency": 0.01, **getattr(request, "param", {})})
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+def make_engine(url: str, **options) -> llm_engine.ExecutionEngine:
+    options = {"concurrency": 4, "retries": 4, "timeout": 5.0, "backoff": 0.01, **options}
+    return llm_engine.ExecutionEngine(llm_engine.OpenAICompatibleProvider(url), **options)
+
+
+def run(engine: llm_engine.ExecutionEngine, requests: Sequence[llm_engine.LLMRequest],
+        directory: Path | None = None) -> List[llm_engine.LLMResult]:
+    sinks = (lambda request, key: StreamingOutput(directory / f"{request.id}.md", key)) if directory else None
+    return llm_engine.run_requests(engine, requests, sinks=sinks)
+
+
+def requests(count: int = 1) -> List[llm_engine.LLMRequest]:
+    return [llm_engine.LLMRequest(f"req-{i}", "You are a test.", PROMPT) for i in range(count)]
+
+
+@pytest.mark.parametrize("stub", [{"failure_rate": 0.4}], indirect=True)
+def test_injected_failures_are_retried(stub, tmp_path: Path) -> None:
+    server, url = stub
+    engine = make_engine(url, retries=12)
+    results = run(engine, requests(12), tmp_path)
+    assert all(result.ok and result.text == stub_text() for result in results)
+    # Every injected 429/503 costs exactly one extra attempt
+    assert server.stats()["failed"] == engine.stats.retries == sum(result.attempts - 1 for result in results) > 0
+    assert {path.name for path in tmp_path.iterdir()} == {f"req-{i}.md" for i in range(12)}
+
+
+@pytest.mark.parametrize("stub", [{"drop_rate": 1.0}], indirect=True)
+def test_dropped_stream_continues_where_it_stopped(stub, tmp_path: Path) -> None:
+    server, url = stub
+    [result] = run(make_engine(url), requests(), tmp_path)
+    # 6 chunks cut after 3, then 3 after 1, then 2 after 1; the last 5 characters fit one chunk
+    assert result.ok and result.attempts == 4
+    assert result.text == stub_text()
+    assert (tmp_path / "req-0.md").read_text(encoding="utf-8") == stub_text()
+    assert server.stats()["dropped"] == server.stats()["continued"] == 3
+    assert list(tmp_path.glob("*.partial*")) == []
+
+
+@pytest.mark.parametrize("stub", [{"drop_rate": 1.0}], indirect=True)
+def test_failed_stream_keeps_partial_for_the_next_run(stub, tmp_path: Path) -> None:
+    _, url = stub
+    [failed] = run(make_engine(url, retries=1), requests(), tmp_path)
+    target = tmp_path / "req-0.md"
+    partial = tmp_path / "req-0.md.partial"
+    assert not failed.ok and failed.attempts == 2
+    assert not target.exists()
+    received = partial.read_text(encoding="utf-8")
+    assert received and stub_text().startswith(received)
+
+    [resumed] = run(make_engine(url), requests(), tmp_path)
+    assert resumed.ok and resumed.resumed_chars == len(received)
+    assert target.read_text(encoding="utf-8") == stub_text()
+    assert list(tmp_path.glob("*.partial*")) == []
+
+
+def test_partial_from_another_request_is_discarded(tmp_path: Path) -> None:
+    sink = StreamingOutput(tmp_path / "out.md", "old-key")
+    sink.write("stale text")
+    sink.close()
+    fresh = StreamingOutput(tmp_path / "out.md", "new-key")
+    assert fresh.text == "" and fresh.resumed == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("stub", [{"max_concurrency": 1, "latency": 0.05}], indirect=True)
+def test_rate_limited_requests_honour_retry_after(stub) -> None:
+    server, url = stub
+    engine = make_engine(url, concurrency=3, retries=20)
+    results = run(engine, requests(3))
+    assert all(result.ok for result in results)
+    assert server.stats()["rejected"] == engine.stats.retries > 0
+    assert server.stats()["peak_concurrency"] == 1
+
+
+def test_parse_retry_after() -> None:
+    assert llm_engine.parse_retry_after("1.5") == 1.5
+    assert llm_engine.parse_retry_after("-3") == 0.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < llm_engine.parse_retry_after(later) <= 30
+    assert llm_engine.parse_retry_after("soon") is None
+    assert llm_engine.parse_retry_after(None) is None
+
+
+@pytest.mark.parametrize("stub", [{"latency": 1.0}], indirect=True)
+def test_slow_responses_time_out_and_fail(stub) -> None:
+    _, url = stub
+    engine = make_engine(url, retries=1, timeout=0.1, stream=False)
+    [result] = run(engine, requests())
+    assert not result.ok and result.attempts == 2
+    assert "timed out" in result.error
+
+
+def test_cache_hit_skips_the_provider(stub, tmp_path: Path) -> None:
+    server, url = stub
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    try:
+        [first] = run(make_engine(url, cache=cache), requests(), tmp_path / "first")
+        [second] = run(make_engine(url, cache=cache), requests(), tmp_path / "second")
+    finally:
+        cache.close()
+    assert not first.cached and second.cached and second.attempts == 0
+    assert second.text == first.text == stub_text()
+    assert (tmp_path / "second" / "req-0.md").read_text(encoding="utf-8") == stub_text()
+    assert server.stats()["requests"] == 1
+
+
+def test_providers_must_implement_the_interface() -> None:
+    with pytest.raises(TypeError):
+        llm_engine.HTTPProvider("http://127.0.0.1")  # type: ignore[abstract]
+    with pytest.raises(TypeError):
+        llm_engine.Provider()  # type: ignore[abstract]
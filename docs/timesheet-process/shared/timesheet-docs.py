@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Single entry point for the timesheet documentation tools.
+
+``index``, ``extract``, ``packs`` and ``verify`` run the individual tools with their own
+arguments; ``pipeline`` runs the whole refresh in one process (see docs_pipeline.py) and
+``build`` rebuilds only the stale artifacts (see docs_build.py).
+
+Usage:
+    # Everything: context index, extracts, prompt packs, verification logs
+    python3 analysis/timesheet_process/shared/timesheet-docs.py pipeline
+
+    # Only what changed since the last build, with the reasons
+    python3 analysis/timesheet_process/shared/timesheet-docs.py build --why
+
+    # Single tools, same arguments as the standalone scripts
+    python3 analysis/timesheet_process/shared/timesheet-docs.py index --pretty
+    python3 analysis/timesheet_process/shared/timesheet-docs.py extract --phase approval
+    python3 analysis/timesheet_process/shared/timesheet-docs.py packs 01_foundation project_configuration agent
+    python3 analysis/timesheet_process/shared/timesheet-docs.py verify --phase foundation --deep
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+SHARED_DIR = Path(__file__).resolve().parent
+for directory in (SHARED_DIR, SHARED_DIR / "verification"):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+# Subcommand → module whose main(argv) implements it; imported only when used
+COMMANDS: Dict[str, str] = {
+    "index": "context_index",
+    "extract": "extract_project_configuration_context",
+    "packs": "prompt_pack_builder",
+    "verify": "verify_phase",
+    "pipeline": "docs_pipeline",
+    "build": "docs_build",
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="timesheet-docs",
+        description="Timesheet documentation tools",
+        epilog="Run '<command> --help' for the options of each command.",
+    )
+    parser.add_argument("command", choices=COMMANDS, help="Tool to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the tool")
+    args = parser.parse_args(argv)
+
+    module = importlib.import_module(COMMANDS[args.command])
+    sys.argv[0] = f"timesheet-docs {args.command}"
+    return module.main(args.args) or 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
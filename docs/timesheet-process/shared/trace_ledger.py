@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Shared JSONL execution trace ledger for the documentation pipeline.
+
+Each tool appends one record per stage (prompt building, output writing, LLM requests,
+batch compile/ingest, …) with start/end timestamps, bytes in and out, prompt tokens, and
+cache hits. Records are buffered in memory and appended in one write under an exclusive
+file lock, so parallel workers and concurrent processes can share a ledger without
+interleaving lines. Unlike the per-directory status JSON files, the ledger is never
+overwritten, which keeps it usable for replay and audits; the summarizer reports p50/p95
+latency per stage over all or part of it.
+
+Records from one invocation share a ``run`` ID; set ``TIMESHEET_TRACE_RUN`` to group the
+records of several tools under one ID.
+
+Usage:
+    # p50/p95 stage latency over the whole ledger
+    python3 analysis/timesheet_process/shared/trace_ledger.py
+
+    # Only the most recent run, as JSON
+    python3 analysis/timesheet_process/shared/trace_ledger.py --last-run --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import json_codec
+from hjps import REPO_ROOT
+
+try:  # POSIX advisory locks; elsewhere appends rely on a single O_APPEND write per flush
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_LEDGER_PATH = REPO_ROOT / "data" / "traces" / "pipeline-ledger.jsonl"
+DEFAULT_FLUSH_EVERY = 64
+RUN_ENV = "TIMESHEET_TRACE_RUN"
+
+
+def new_run_id() -> str:
+    return os.environ.get(RUN_ENV) or f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+
+def iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds")
+
+
+class TraceLedger:
+    """Buffered, lock-protected JSONL appender for stage records."""
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_PATH, tool: str = "", run_id: Optional[str] = None,
+                 flush_every: int = DEFAULT_FLUSH_EVERY):
+        self.path = Path(path)
+        self.tool = tool
+        self.run_id = run_id or new_run_id()
+        self.flush_every = max(1, flush_every)
+        self.records = 0
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, started: float, ended: float, *, subject: str = "", bytes_in: int = 0,
+               bytes_out: int = 0, prompt_tokens: int = 0, cache_hits: int = 0, status: str = "ok",
+               **extra: Any) -> Dict[str, Any]:
+        """Queue one stage record; ``started``/``ended`` are epoch seconds (``time.time()``)."""
+        entry = {
+            "run": self.run_id,
+            "tool": self.tool,
+            "stage": stage,
+            "subject": subject,
+            "start": iso(started),
+            "end": iso(ended),
+            "seconds": round(ended - started, 6),
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "prompt_tokens": prompt_tokens,
+            "cache_hits": cache_hits,
+            "status": status,
+            "pid": os.getpid(),
+            **extra,
+        }
+        line = json_codec.dumps(entry, ensure_ascii=False, separators=json_codec.COMPACT, default=str) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            self.records += 1
+            full = len(self._buffer) >= self.flush_every
+        if full:
+            self.flush()
+        return entry
+
+    @contextmanager
+    def span(self, stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block as one stage; fill in byte/token/cache fields on the yielded dict."""
+        fields = dict(fields)
+        started = time.time()
+        try:
+            yield fields
+        except BaseException as exc:
+            fields.setdefault("status", "error")
+            fields.setdefault("error", f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            self.record(stage, started, time.time(), **fields)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._buffer:
+                return
+            data = "".join(self._buffer).encode("utf-8")
+            self._buffer = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, data)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "TraceLedger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def add_trace_arguments(parser: argparse.ArgumentParser) -> None:
+    """Ledger flags shared by the pipeline tools."""
+    group = parser.add_argument_group("trace ledger")
+    group.add_argument("--trace-ledger", type=Path, default=DEFAULT_LEDGER_PATH, help="JSONL ledger stage records are appended to")
+    group.add_argument("--no-trace", action="store_true", help="Do not append to the trace ledger")
+
+
+def ledger_from_args(args: argparse.Namespace, tool: str) -> Optional[TraceLedger]:
+    return None if args.no_trace else TraceLedger(args.trace_ledger, tool)
+
+
+def read_ledger(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records in append order; a torn trailing line from a killed writer is skipped."""
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                yield json_codec.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3) if ordered else 0.0
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-stage (``tool/stage``) count, p50/p95/max latency, and byte/token/cache totals."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for entry in records:
+        key = f"{entry.get('tool') or '?'}/{entry.get('stage', '?')}"
+        stage = stages.setdefault(key, {"latencies": [], "bytes_in": 0, "bytes_out": 0, "prompt_tokens": 0,
+                                        "cache_hits": 0, "failed": 0, "runs": set()})
+        stage["latencies"].append(float(entry.get("seconds", 0.0)))
+        for name in ("bytes_in", "bytes_out", "prompt_tokens", "cache_hits"):
+            stage[name] += int(entry.get(name) or 0)
+        stage["failed"] += entry.get("status", "ok") != "ok"
+        stage["runs"].add(entry.get("run"))
+    return {
+        key: {
+            "count": len(stage["latencies"]),
+            "runs": len(stage["runs"]),
+            "p50_seconds": percentile(stage["latencies"], 0.5),
+            "p95_seconds": percentile(stage["latencies"], 0.95),
+            "max_seconds": round(max(stage["latencies"]), 3),
+            "total_seconds": round(sum(stage["latencies"]), 3),
+            "bytes_in": stage["bytes_in"],
+            "bytes_out": stage["bytes_out"],
+            "prompt_tokens": stage["prompt_tokens"],
+            "cache_hits": stage["cache_hits"],
+            "failed": stage["failed"],
+        }
+        for key, stage in sorted(stages.items())
+    }
+
+
+def format_summary(summary: Dict[str, Dict[str, Any]]) -> str:
+    lines = [
+        "| Stage | Count | p50 s | p95 s | Max s | Bytes in | Bytes out | Prompt tokens | Cache hits | Failed |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for key, stage in summary.items():
+        lines.append(
+            f"| {key} | {stage['count']} | {stage['p50_seconds']:.3f} | {stage['p95_seconds']:.3f} | "
+            f"{stage['max_seconds']:.3f} | {stage['bytes_in']:,} | {stage['bytes_out']:,} | "
+            f"{stage['prompt_tokens']:,} | {stage['cache_hits']:,} | {stage['failed']} |"
+        )
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Summarize p50/p95 stage latency over the trace ledger")
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_LEDGER_PATH)
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--run", help="Only records from this run ID")
+    selection.add_argument("--last-run", action="store_true", help="Only records from the most recently started run")
+    parser.add_argument("--tool", help="Only records from this tool")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    records = list(read_ledger(args.ledger))
+    run = args.run
+    if args.last_run and records:
+        run = max(records, key=lambda entry: entry.get("start", ""))["run"]
+    records = [
+        entry for entry in records
+        if (run is None or entry.get("run") == run) and (args.tool is None or entry.get("tool") == args.tool)
+    ]
+    if not records:
+        print(f"No trace records in {args.ledger}")
+        return 1
+    summary = summarize(records)
+    if args.json:
+        print(json_codec.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary))
+        print(f"\n{len(records)} records{f' from run {run}' if run else ''} in {args.ledger}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
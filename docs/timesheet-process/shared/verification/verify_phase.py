@@ -11,22 +11,63 @@ Usage examples:
 
     # Verify another phase with custom paths
     analysis/timesheet_process/shared/verification/verify_phase.py         --trace analysis/timesheet_process/phases/02-timesheet-creation/docs/TRACE.md         --phase-dir analysis/timesheet_process/phases/02-timesheet-creation
+
+    # Also check workflow contents (properties, branch filters, associations)
+    analysis/timesheet_process/shared/verification/verify_phase.py --phase foundation --deep
+
+    # Attach cProfile output of the checks next to the Markdown/JSON/JUnit results;
+    # --trace-timings / --mem add span timings and allocations (see shared/instrumentation.py)
+    analysis/timesheet_process/shared/verification/verify_phase.py --phase foundation --profile --trace-timings
+
+    # Limit the shared I/O thread pool (default scales with CPU count; 1 runs inline)
+    analysis/timesheet_process/shared/verification/verify_phase.py --phase foundation --jobs 4
+
+Runs are incremental: when the input fingerprint (trace, asset inventories,
+property mappings, referenced exports) matches the last run recorded in
+``verification-state.json``, the previous result is reused and no new log is
+written. Pass ``--force`` to re-verify and write fresh logs regardless.
 """
 from __future__ import annotations
 
 import argparse
+import cProfile
+import hashlib
 import json
+import os
 import re
+import shutil
 import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple, TypeVar
+
+SHARED_DIR = Path(__file__).resolve().parents[1]
+if str(SHARED_DIR) not in sys.path:
+    sys.path.insert(0, str(SHARED_DIR))
+
+import instrumentation  # noqa: E402
+import json_codec  # noqa: E402  (shared helpers resolved via SHARED_DIR)
+from export_repository import ExportRepository  # noqa: E402
+from hjps import (  # noqa: E402
+    REPO_ROOT,
+    FormCollection,
+    ModuleCollection,
+    SchemaCollection,
+    WorkflowCollection,
+    default_layout,
+)
 
-PROJ_ROOT = Path(__file__).resolve().parents[4]
-DEFAULT_WORKFLOW_DIR = PROJ_ROOT / "data/raw/workflows"
-DEFAULT_SCHEMA_DIR = PROJ_ROOT / "data/raw/ai-context/ai-context-export/data-model"
-DEFAULT_CMS_MODULE_DIR = PROJ_ROOT / "data/raw/hubspot-cms-assets/Timesheets-Theme/modules"
-DEFAULT_CMS_FORMS_PATH = PROJ_ROOT / "data/raw/hubspot-cms-api/forms/cms_forms_data.json"
+PROJ_ROOT = REPO_ROOT
+DEFAULT_WORKFLOW_DIR = default_layout().workflows
+DEFAULT_SCHEMA_DIR = default_layout().schemas
+DEFAULT_CMS_MODULE_DIR = default_layout().modules
+DEFAULT_CMS_FORMS_PATH = default_layout().cms_forms
 
 PHASES = {
     "foundation": {
@@ -54,14 +95,181 @@ PHASES = {
 
 
 
-# Simple cache for schema files so we do not reload repeatedly
+# Standard HubSpot object type IDs; custom objects carry theirs in the schema filename
+STANDARD_OBJECT_TYPES = {
+    "0-1": ("contacts", "contact"),
+    "0-2": ("companies", "company"),
+    "0-3": ("deals", "deal"),
+    "0-5": ("tickets", "ticket"),
+}
+FLOW_TYPE_OBJECTS = {
+    "CONTACT_FLOW": "0-1",
+    "COMPANY_FLOW": "0-2",
+    "DEAL_FLOW": "0-3",
+    "TICKET_FLOW": "0-5",
+}
+# v4 flow action type IDs that write a single property
+SET_PROPERTY_ACTION_TYPE_IDS = {"0-5"}
+NESTED_ACTION_KEYS = ("actions", "acceptActions", "rejectActions")
+BRANCH_KEYS = ("branches", "listBranches", "staticBranches", "defaultBranch")
+ASSOCIATION_ID_KEYS = ("associationTypeId", "association_type_id")
+
+
+STATE_FILENAME = "verification-state.json"
+# Bump when the fingerprint layout changes so old state files are ignored
+FINGERPRINT_VERSION = 3
+# Shared modules the checks run through (relative to SHARED_DIR); a fix in any of them re-verifies
+CHECK_SOURCES = ("json_codec.py", "json_stream.py", "export_repository.py", "module_manifest.py",
+                 "workflow_repository.py", "hjps/*.py")
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# Property names per object key; the schema documents themselves are memoized by hjps
 _SCHEMA_CACHE: Dict[str, Set[str]] = {}
-_SCHEMA_PATH_CACHE: Dict[str, Path | None] = {}
 
 
-def load_json(path: Path) -> dict:
-    with path.open(encoding="utf-8") as f:
-        return json.load(f)
+@dataclass
+class CheckStats:
+    """I/O counters and wall time for a single verification check.
+
+    ``seconds`` is wall time: each load fan-out is timed once, plus the check itself.
+    ``thread_seconds`` sums the individual file loads across pool threads, so it exceeds
+    ``seconds`` when they overlap.
+    """
+
+    seconds: float = 0.0
+    thread_seconds: float = 0.0
+    files_read: int = 0
+    bytes_parsed: int = 0
+    cache_hits: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_file(self, size: int) -> None:
+        with self._lock:
+            self.files_read += 1
+            self.bytes_parsed += size
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def add_seconds(self, seconds: float) -> None:
+        with self._lock:
+            self.seconds += seconds
+
+    def add_thread_seconds(self, seconds: float) -> None:
+        with self._lock:
+            self.thread_seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seconds": round(self.seconds, 6),
+            "thread_seconds": round(self.thread_seconds, 6),
+            "files_read": self.files_read,
+            "bytes_parsed": self.bytes_parsed,
+            "cache_hits": self.cache_hits,
+        }
+
+
+@dataclass
+class CheckResult:
+    name: str
+    title: str
+    success_message: str
+    issues: List[str]
+    stats: CheckStats
+
+
+@dataclass
+class PhaseInputs:
+    """Phase documents and export lookups loaded once and shared by every check."""
+
+    workflow_ids: Set[str]
+    exports: Dict[str, Path | None]
+    inventories: List[dict]
+    mappings: List[Tuple[Path, Dict[str, Set[str]]]]
+    modules_present: Dict[str, bool]
+    stats: Dict[str, CheckStats]
+
+
+# Markdown section title and success message per check, in log order
+CHECK_SECTIONS: Dict[str, Tuple[str, str]] = {
+    "workflows": ("Workflow Check", "All referenced workflows found."),
+    "workflow_content": (
+        "Workflow Content Check",
+        "All workflow properties, branch filters, and association types found in schema exports.",
+    ),
+    "cms_assets": ("CMS Asset Check", "All referenced modules/forms located in exports."),
+    "properties": ("Property Schema Check", "All properties from property-mapping files found in schema exports."),
+}
+
+
+def load_json(path: Path, stats: CheckStats | None = None) -> dict:
+    raw = path.read_bytes()
+    if stats is not None:
+        stats.record_file(len(raw))
+    return json_codec.loads(raw)
+
+
+def load_export(repository: ExportRepository, name: str, stats: CheckStats | None = None) -> Any:
+    """Parse an export through its shared repository, charging the parse (or memo hit) to ``stats``."""
+    cached = repository.is_cached(name)
+    value = repository.load(name)
+    if stats is not None:
+        if cached:
+            stats.record_cache_hit()
+        else:
+            stats.record_file(repository.size(name))
+    return value
+
+
+def run_check(name: str, func: Callable[..., List[str]], *args: Any, stats: CheckStats | None = None,
+              **kwargs: Any) -> CheckResult:
+    """Run a check and add its wall time to ``stats`` (which may already hold its load time)."""
+    stats = stats or CheckStats()
+    start = time.perf_counter()
+    issues = list(func(*args, stats=stats, **kwargs))
+    stats.add_seconds(time.perf_counter() - start)
+    title, success_message = CHECK_SECTIONS[name]
+    return CheckResult(name, title, success_message, issues, stats)
+
+
+def parallel_map(executor: Executor | None, func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """Map ``func`` over ``items`` on the shared pool, keeping input order; inline without a pool."""
+    if executor is None:
+        return [func(item) for item in items]
+    return list(executor.map(func, items))
+
+
+def timed(stats: CheckStats | None, func: Callable[..., R], *args: Any) -> R:
+    """Call ``func`` and charge its duration to ``stats.thread_seconds`` (summed across threads)."""
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        if stats is not None:
+            stats.add_thread_seconds(time.perf_counter() - start)
+
+
+@contextmanager
+def wall_clock(stats: CheckStats | None) -> Iterator[None]:
+    """Charge the wall time of the block (typically a whole load fan-out) to ``stats.seconds``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.add_seconds(time.perf_counter() - start)
+
+
+def display_path(path: Path) -> str:
+    try:
+        return str(path.relative_to(PROJ_ROOT))
+    except ValueError:
+        return str(path)
 
 
 def gather_trace_workflow_ids(trace_path: Path) -> Set[str]:
@@ -84,43 +292,342 @@ def gather_trace_workflow_ids(trace_path: Path) -> Set[str]:
     return workflow_ids
 
 
-def check_workflows(workflow_ids: Iterable[str], workflow_dir: Path) -> List[str]:
+def find_workflow_export(wf_id: str, workflow_dir: Path) -> Path | None:
+    """First matching export name, answered from one shared directory listing."""
+    files = WorkflowCollection.shared(workflow_dir).files()
+    candidates = [
+        f"v4-flow-{wf_id}.json",
+        f"v4-workflow-{wf_id}.json",
+        f"workflow-{wf_id}-v4.json",
+        f"workflow-{wf_id}.json",
+    ]
+    for name in candidates:
+        if name in files:
+            return workflow_dir / name
+    return None
+
+
+def resolve_workflow_exports(workflow_ids: Iterable[str], workflow_dir: Path, stats: CheckStats | None = None,
+                             executor: Executor | None = None) -> Dict[str, Path | None]:
+    ids = sorted(set(workflow_ids))
+    paths = parallel_map(executor, lambda wf_id: timed(stats, find_workflow_export, wf_id, workflow_dir), ids)
+    return dict(zip(ids, paths))
+
+
+def check_workflows(workflow_ids: Iterable[str], workflow_dir: Path, stats: CheckStats | None = None,
+                    exports: Dict[str, Path | None] | None = None) -> List[str]:
+    if exports is None:
+        exports = resolve_workflow_exports(workflow_ids, workflow_dir)
     discrepancies: List[str] = []
     for wf_id in sorted(set(workflow_ids)):
-        candidates = [
-            workflow_dir / f"v4-flow-{wf_id}.json",
-            workflow_dir / f"v4-workflow-{wf_id}.json",
-            workflow_dir / f"workflow-{wf_id}-v4.json",
-            workflow_dir / f"workflow-{wf_id}.json",
-        ]
-        if not any(path.exists() for path in candidates):
+        if exports.get(wf_id) is None:
             discrepancies.append(f"Workflow {wf_id} missing export file.")
     return discrepancies
 
 
-def load_asset_inventories(phase_dir: Path) -> List[dict]:
-    inventories: List[dict] = []
-    for path in phase_dir.glob("**/assets/asset-inventory.json"):
-        try:
-            inventories.append(load_json(path))
-        except Exception as exc:  # pragma: no cover - logging only
-            inventories.append({"__error__": f"Failed to load {path}: {exc}"})
-    return inventories
+@dataclass
+class SchemaIndex:
+    """Property and association catalogues keyed by HubSpot object type ID."""
+
+    properties: Dict[str, Set[str]] = field(default_factory=dict)
+    associations: Dict[str, Set[str]] = field(default_factory=dict)
+    aliases: Dict[str, str] = field(default_factory=dict)
+    names: Dict[str, str] = field(default_factory=dict)
+
+    def resolve(self, object_type: str | None) -> str | None:
+        if not object_type:
+            return None
+        key = str(object_type).strip()
+        if key in self.properties:
+            return key
+        return self.aliases.get(key.lower())
+
+    def label(self, object_type_id: str) -> str:
+        name = self.names.get(object_type_id)
+        return f"{name} ({object_type_id})" if name else object_type_id
+
+
+def schema_property_names(schema_json: dict) -> Set[str]:
+    props: Set[str] = set()
+    for prop in schema_json.get("properties", []):
+        name = prop.get("name")
+        if name:
+            props.add(name)
+    for prop in schema_json.get("schema", {}).get("results", []):
+        name = prop.get("name")
+        if name:
+            props.add(name)
+    return props
+
+
+def _schema_object_type(path: Path, schema_json: dict) -> Tuple[str | None, str, Set[str]]:
+    """Return the object type ID, display name and lowercase aliases for a schema export."""
+    stem = path.stem.lower()
+    base = re.split(r"[_-]schema", stem, maxsplit=1)[0]
+    aliases = {base, base.rstrip("s")}
+    name = schema_json.get("name")
+    if isinstance(name, str) and name:
+        aliases.update({name.lower(), name.lower().rstrip("s")})
+
+    object_type_id = schema_json.get("objectTypeId")
+    if not object_type_id:
+        match = re.search(r"(\d+-\d+)", stem)
+        object_type_id = match.group(1) if match else None
+    if not object_type_id:
+        for type_id, names in STANDARD_OBJECT_TYPES.items():
+            if base in names:
+                object_type_id = type_id
+                break
+    if object_type_id in STANDARD_OBJECT_TYPES:
+        aliases.update(STANDARD_OBJECT_TYPES[object_type_id])
+    return object_type_id, base, {alias for alias in aliases if alias}
+
+
+def _load_schema_file(path: Path, stats: CheckStats | None) -> dict | None:
+    try:
+        schema_json = timed(stats, load_export, SchemaCollection.shared(path.parent).repository, path.name, stats)
+    except (OSError, ValueError):
+        return None
+    return schema_json if isinstance(schema_json, dict) else None
+
+
+def build_schema_index(schema_dir: Path, stats: CheckStats | None = None,
+                       executor: Executor | None = None) -> SchemaIndex:
+    """Load every schema export once and index properties/associations into hash sets."""
+    index = SchemaIndex()
+    if not schema_dir.exists():
+        return index
+    paths = SchemaCollection.shared(schema_dir).paths()
+    documents = parallel_map(executor, lambda path: _load_schema_file(path, stats), paths)
+    for path, schema_json in zip(paths, documents):
+        if schema_json is None:
+            continue
+        object_type_id, name, aliases = _schema_object_type(path, schema_json)
+        if not object_type_id:
+            continue
+        index.names.setdefault(object_type_id, name)
+        index.properties.setdefault(object_type_id, set()).update(schema_property_names(schema_json))
+        for alias in aliases:
+            index.aliases.setdefault(alias, object_type_id)
+        index.aliases.setdefault(object_type_id.lower(), object_type_id)
+        for assoc in schema_json.get("associations", []):
+            assoc_id = assoc.get("id") if isinstance(assoc, dict) else None
+            if assoc_id is None:
+                continue
+            endpoints = {object_type_id, assoc.get("fromObjectTypeId"), assoc.get("toObjectTypeId")}
+            for endpoint in filter(None, endpoints):
+                index.associations.setdefault(endpoint, set()).add(str(assoc_id))
+    return index
+
 
+_END = object()  # end-of-list sentinel; a JSON null is a (skipped) list element, not the end
 
-def check_cms_assets(inventories: Iterable[dict], module_dir: Path, forms_path: Path) -> List[str]:
+
+def iter_workflow_actions(actions: Iterable[Any]) -> Iterator[dict]:
+    """Yield every action, including actions nested under branches, exactly once."""
+    stack = [iter(actions)]
+    while stack:
+        action = next(stack[-1], _END)
+        if action is _END:
+            stack.pop()
+            continue
+        if not isinstance(action, dict):
+            continue
+        yield action
+        nested: List[Any] = []
+        for key in NESTED_ACTION_KEYS:
+            if isinstance(action.get(key), list):
+                nested.extend(action[key])
+        for key in BRANCH_KEYS:
+            branches = action.get(key)
+            for branch in branches if isinstance(branches, list) else [branches]:
+                if isinstance(branch, dict) and isinstance(branch.get("actions"), list):
+                    nested.extend(branch["actions"])
+        if nested:
+            stack.append(iter(nested))
+
+
+def _walk_action_fields(action: dict) -> Iterator[Tuple[str | None, dict]]:
+    """Yield (object type override, dict) pairs for an action, skipping nested actions.
+
+    Association filter branches carry the ``objectTypeId`` of the associated record,
+    so filters beneath them are checked against that object's schema instead.
+    """
+    stack: List[Tuple[str | None, Any]] = [(None, action)]
+    while stack:
+        scope, node = stack.pop()
+        if isinstance(node, list):
+            stack.extend((scope, item) for item in reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        if node is not action and node.get("objectTypeId") and node.get("filterBranchType") == "ASSOCIATION":
+            scope = str(node["objectTypeId"])
+        yield scope, node
+        for key, value in reversed(list(node.items())):
+            if key in NESTED_ACTION_KEYS:
+                continue
+            if isinstance(value, (dict, list)):
+                stack.append((scope, value))
+
+
+def action_references(action: dict) -> Tuple[List[str], List[Tuple[str | None, str]], List[str]]:
+    """Return (set-property names, (object override, filter property) pairs, association type IDs)."""
+    set_props: List[str] = []
+    atype = action.get("type")
+    fields = action.get("fields") if isinstance(action.get("fields"), dict) else {}
+    if atype == "SET_PROPERTY" or str(action.get("actionTypeId")) in SET_PROPERTY_ACTION_TYPE_IDS:
+        name = action.get("propertyName") or fields.get("property_name")
+        if name:
+            set_props.append(str(name))
+
+    filter_props: List[Tuple[str | None, str]] = []
+    association_ids: List[str] = []
+    for scope, node in _walk_action_fields(action):
+        if node is not action and any(key in node for key in ("operation", "operator", "filterType")):
+            prop = node.get("property") or node.get("propertyName")
+            if isinstance(prop, str) and prop:
+                filter_props.append((scope, prop))
+        for key in ASSOCIATION_ID_KEYS:
+            value = node.get(key)
+            if value not in (None, "") and str(value).isdigit():
+                association_ids.append(str(value))
+        spec = node.get("associationSpec")
+        if isinstance(spec, dict) and str(spec.get("typeId", "")).isdigit():
+            association_ids.append(str(spec["typeId"]))
+    return set_props, filter_props, association_ids
+
+
+def workflow_object_type(workflow: dict) -> str | None:
+    for key in ("objectTypeId", "objectType"):
+        value = workflow.get(key)
+        if value:
+            return str(value)
+    return FLOW_TYPE_OBJECTS.get(str(workflow.get("type", "")).upper())
+
+
+def check_workflow_content(wf_id: str, workflow: dict, index: SchemaIndex) -> List[str]:
+    """Check one workflow export's property and association references against the schema index."""
     discrepancies: List[str] = []
-    form_names: Set[str] = set()
-    if forms_path.exists():
-        forms_json = load_json(forms_path)
-        results = forms_json.get("results", [])
-        for entry in results:
-            if isinstance(entry, dict):
-                name = entry.get("name")
-                if name:
-                    form_names.add(name)
-    else:
+    object_type_id = index.resolve(workflow_object_type(workflow))
+    if object_type_id is None:
+        return [f"Workflow {wf_id}: no schema export for object type '{workflow_object_type(workflow)}'; content not verified."]
+
+    own_props = index.properties.get(object_type_id, set())
+    own_assocs = index.associations.get(object_type_id, set())
+    label = index.label(object_type_id)
+    for position, action in enumerate(iter_workflow_actions(workflow.get("actions", [])), start=1):
+        action_id = action.get("actionId") or action.get("actionGuid") or action.get("id") or f"#{position}"
+        prefix = f"Workflow {wf_id} action {action_id}"
+        set_props, filter_props, association_ids = action_references(action)
+        for prop in set_props:
+            if prop not in own_props:
+                discrepancies.append(f"{prefix}: SET_PROPERTY `{prop}` not found in {label} schema")
+        for scope, prop in filter_props:
+            target_id = index.resolve(scope) if scope else object_type_id
+            if target_id is None:
+                discrepancies.append(f"{prefix}: branch filter `{prop}` targets object '{scope}' with no schema export")
+            elif prop not in index.properties.get(target_id, set()):
+                discrepancies.append(f"{prefix}: branch filter `{prop}` not found in {index.label(target_id)} schema")
+        for assoc_id in association_ids:
+            if assoc_id not in own_assocs:
+                discrepancies.append(f"{prefix}: association type {assoc_id} not defined for {label}")
+    return discrepancies
+
+
+def _load_workflow_export(path: Path | None, stats: CheckStats | None) -> dict | Exception | None:
+    if path is None:
+        return None
+    try:
+        return timed(stats, load_export, WorkflowCollection.shared(path.parent).exports, path.name, stats)
+    except (OSError, ValueError) as exc:
+        return exc
+
+
+def load_workflow_exports(exports: Dict[str, Path | None], stats: CheckStats | None = None,
+                          executor: Executor | None = None) -> Dict[str, dict | Exception | None]:
+    ids = sorted(exports)
+    documents = parallel_map(executor, lambda wf_id: _load_workflow_export(exports[wf_id], stats), ids)
+    return dict(zip(ids, documents))
+
+
+def check_workflows_deep(workflow_ids: Iterable[str], workflow_dir: Path, schema_dir: Path,
+                         stats: CheckStats | None = None, index: SchemaIndex | None = None,
+                         exports: Dict[str, Path | None] | None = None,
+                         workflows: Dict[str, dict | Exception | None] | None = None) -> List[str]:
+    if index is None:
+        index = build_schema_index(schema_dir, stats)
+    if not index.properties:
+        return [f"No schema exports indexed from {schema_dir}; workflow content not verified."]
+    if exports is None:
+        exports = resolve_workflow_exports(workflow_ids, workflow_dir)
+    if workflows is None:
+        workflows = load_workflow_exports(exports, stats)
+    discrepancies: List[str] = []
+    for wf_id in sorted(set(workflow_ids)):
+        workflow = workflows.get(wf_id)
+        if workflow is None:
+            continue  # reported by check_workflows
+        if isinstance(workflow, Exception):
+            discrepancies.append(f"Workflow {wf_id}: failed to parse {exports[wf_id].name}: {workflow}")
+            continue
+        discrepancies.extend(check_workflow_content(wf_id, workflow, index))
+    return discrepancies
+
+
+def _load_inventory(path: Path, stats: CheckStats | None) -> dict:
+    try:
+        return timed(stats, load_json, path, stats)
+    except Exception as exc:  # pragma: no cover - logging only
+        return {"__error__": f"Failed to load {path}: {exc}"}
+
+
+def load_asset_inventories(phase_dir: Path, stats: CheckStats | None = None,
+                           executor: Executor | None = None) -> List[dict]:
+    paths = sorted(phase_dir.glob("**/assets/asset-inventory.json"))
+    return parallel_map(executor, lambda path: _load_inventory(path, stats), paths)
+
+
+def inventory_module_names(inventories: Iterable[dict]) -> List[str]:
+    names: Set[str] = set()
+    for inventory in inventories:
+        if "__error__" in inventory:
+            continue
+        for module in inventory.get("modules", []):
+            name = module.get("name")
+            if name:
+                names.add(name)
+    return sorted(names)
+
+
+def resolve_modules(names: Sequence[str], module_dir: Path, stats: CheckStats | None = None) -> Dict[str, bool]:
+    """Answer module presence from the shared module manifest (one directory scan)."""
+    manifest = ModuleCollection.shared(module_dir).manifest
+    timed(stats, manifest.scan)
+    return {name: manifest.exists(name) for name in names}
+
+
+def load_form_names(forms_path: Path, stats: CheckStats | None = None) -> Set[str] | None:
+    """Stream form names out of the CMS forms export; None when the export is missing."""
+    if not forms_path.exists():
+        return None
+    if stats is not None:
+        stats.record_file(forms_path.stat().st_size)
+    return FormCollection.shared(default_layout().forms).cms_form_names(forms_path)
+
+
+def check_cms_assets(inventories: Iterable[dict], module_dir: Path, forms_path: Path,
+                     stats: CheckStats | None = None, form_names: Set[str] | None = None,
+                     modules_present: Dict[str, bool] | None = None) -> List[str]:
+    discrepancies: List[str] = []
+    if form_names is None:
+        form_names = load_form_names(forms_path, stats)
+    if form_names is None:
         discrepancies.append("CMS forms export missing; cannot validate forms.")
+        form_names = set()
+    inventories = list(inventories)
+    if modules_present is None:
+        modules_present = resolve_modules(inventory_module_names(inventories), module_dir, stats)
 
     for inventory in inventories:
         if "__error__" in inventory:
@@ -130,7 +637,7 @@ def check_cms_assets(inventories: Iterable[dict], module_dir: Path, forms_path:
             name = module.get("name")
             if not name:
                 continue
-            if not (module_dir / name).exists():
+            if not modules_present.get(name):
                 discrepancies.append(f"CMS module missing: {name}")
         for form in inventory.get("forms", []):
             name = form.get("name")
@@ -142,73 +649,54 @@ def check_cms_assets(inventories: Iterable[dict], module_dir: Path, forms_path:
 
 
 def find_schema_path(obj_key: str, schema_dir: Path) -> Path | None:
-    key = obj_key.lower()
-    if key in _SCHEMA_PATH_CACHE:
-        return _SCHEMA_PATH_CACHE[key]
-
-    known_map = {
-        "deal": "deals_schema.json",
-        "deals": "deals_schema.json",
-        "company": "companies_schema.json",
-        "contact": "contacts_schema.json",
-        "contacts": "contacts_schema.json",
-        "hj_projects": "hj_projects-schema-2-26103074.json",
-        "hj_consultants": "hj_consultants-schema-2-26103040.json",
-        "hj_wells": "hj_wells-schema-2-26102958.json",
-        "hj_approvals": "hj_approvals-schema-2-26103010.json",
-    }
-    if key in known_map:
-        candidate = schema_dir / known_map[key]
-        _SCHEMA_PATH_CACHE[key] = candidate if candidate.exists() else None
-        return _SCHEMA_PATH_CACHE[key]
-
-    # Fallback: search for filenames containing the key
-    for path in schema_dir.glob("*.json"):
-        name = path.name.lower()
-        if key in name or f"{key}_schema" in name or key.rstrip('s') in name:
-            _SCHEMA_PATH_CACHE[key] = path
-            return path
-
-    _SCHEMA_PATH_CACHE[key] = None
-    return None
+    """Canonical schema export for an object key (see ``hjps.PREFERRED_SCHEMA_FILES``)."""
+    name = SchemaCollection.shared(schema_dir).find(obj_key)
+    return schema_dir / name if name else None
 
 
-def get_schema_properties(obj_key: str, schema_dir: Path) -> Set[str]:
+def get_schema_properties(obj_key: str, schema_dir: Path, stats: CheckStats | None = None) -> Set[str]:
     obj_key = obj_key.lower()
     if obj_key in _SCHEMA_CACHE:
+        if stats is not None:
+            stats.record_cache_hit()
         return _SCHEMA_CACHE[obj_key]
 
     schema_path = find_schema_path(obj_key, schema_dir)
     props: Set[str] = set()
-    if schema_path and schema_path.exists():
-        schema_json = load_json(schema_path)
-        for prop in schema_json.get("properties", []):
-            name = prop.get("name")
-            if name:
-                props.add(name)
-        for prop in schema_json.get("schema", {}).get("results", []):
-            name = prop.get("name")
-            if name:
-                props.add(name)
+    if schema_path is not None:
+        try:
+            schema_json = load_export(SchemaCollection.shared(schema_dir).repository, schema_path.name, stats)
+        except (OSError, ValueError):
+            schema_json = None
+        props = schema_property_names(schema_json) if isinstance(schema_json, dict) else set()
     _SCHEMA_CACHE[obj_key] = props
     return props
 
 
-def extract_properties_from_mapping(path: Path) -> Dict[str, Set[str]]:
+def extract_properties_from_mapping(path: Path, stats: CheckStats | None = None) -> Dict[str, Set[str]]:
     mapping: Dict[str, Set[str]] = {}
-    data = load_json(path)
+    data = load_json(path, stats)
     if isinstance(data, dict) and "objects" in data:
         for obj, props in data["objects"].items():
             mapping.setdefault(obj, set()).update(props.keys())
     return mapping
 
 
-def check_properties(phase_dir: Path, schema_dir: Path) -> List[str]:
+def load_property_mappings(phase_dir: Path, stats: CheckStats | None = None,
+                           executor: Executor | None = None) -> List[Tuple[Path, Dict[str, Set[str]]]]:
+    paths = sorted(phase_dir.glob("**/properties/property-mapping.json"))
+    mappings = parallel_map(executor, lambda path: timed(stats, extract_properties_from_mapping, path, stats), paths)
+    return list(zip(paths, mappings))
+
+
+def check_properties(phase_dir: Path, schema_dir: Path, stats: CheckStats | None = None,
+                     mappings: List[Tuple[Path, Dict[str, Set[str]]]] | None = None) -> List[str]:
+    if mappings is None:
+        mappings = load_property_mappings(phase_dir, stats)
     discrepancies: List[str] = []
-    for mapping_path in phase_dir.glob("**/properties/property-mapping.json"):
-        mapping = extract_properties_from_mapping(mapping_path)
+    for mapping_path, mapping in mappings:
         for obj_key, props in mapping.items():
-            schema_props = get_schema_properties(obj_key, schema_dir)
+            schema_props = get_schema_properties(obj_key, schema_dir, stats)
             if not schema_props:
                 discrepancies.append(
                     f"No schema export found for object '{obj_key}' referenced in {mapping_path}"
@@ -222,47 +710,174 @@ def check_properties(phase_dir: Path, schema_dir: Path) -> List[str]:
     return discrepancies
 
 
-def write_log(log_dir: Path, workflow_ids: Iterable[str], workflow_issues: Iterable[str],
-              cms_issues: Iterable[str], property_issues: Iterable[str]) -> Path:
-    log_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
-    log_path = log_dir / f"phase-verification-{timestamp}.md"
+def write_log(log_path: Path, timestamp: str, workflow_ids: Iterable[str], results: Iterable[CheckResult]) -> Path:
+    """Stream the Markdown log to disk one section at a time."""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
     workflow_ids_sorted = ", ".join(sorted(set(workflow_ids))) or "None"
+    results = list(results)
 
-    lines = [f"# Phase Verification Log ({timestamp})\n"]
-    lines.append("## Workflow Check\n")
-    lines.append(f"Workflows referenced in trace: {workflow_ids_sorted}\n")
-    if workflow_issues:
-        lines.append("### Issues\n")
-        lines.extend(f"- {issue}\n" for issue in workflow_issues)
-    else:
-        lines.append("All referenced workflows found.\n")
+    with log_path.open("w", encoding="utf-8") as handle:
+        handle.write(f"# Phase Verification Log ({timestamp})\n")
+        for position, result in enumerate(results):
+            separator = "" if position == 0 else "\n"
+            handle.write(f"{separator}## {result.title}\n")
+            if result.name == "workflows":
+                handle.write(f"Workflows referenced in trace: {workflow_ids_sorted}\n")
+            if result.issues:
+                handle.write("### Issues\n")
+                for issue in result.issues:
+                    handle.write(f"- {issue}\n")
+            else:
+                handle.write(f"{result.success_message}\n")
 
-    lines.append("\n## CMS Asset Check\n")
-    if cms_issues:
-        lines.append("### Issues\n")
-        lines.extend(f"- {issue}\n" for issue in cms_issues)
-    else:
-        lines.append("All referenced modules/forms located in exports.\n")
+        handle.write("\n## Check Timings\n")
+        handle.write("| Check | Seconds | Thread seconds | Files read | Bytes parsed | Cache hits |\n")
+        handle.write("|---|---|---|---|---|---|\n")
+        for result in results:
+            stats = result.stats
+            handle.write(
+                f"| {result.title} | {stats.seconds:.3f} | {stats.thread_seconds:.3f} | {stats.files_read} "
+                f"| {stats.bytes_parsed} | {stats.cache_hits} |\n"
+            )
 
-    lines.append("\n## Property Schema Check\n")
-    if property_issues:
-        lines.append("### Issues\n")
-        lines.extend(f"- {issue}\n" for issue in property_issues)
-    else:
-        lines.append("All properties from property-mapping files found in schema exports.\n")
+        handle.write("\n---\n")
+        if any(result.issues for result in results):
+            handle.write("Verification completed with discrepancies. See issues above.\n")
+        else:
+            handle.write("Verification completed successfully.\n")
+    return log_path
 
-    lines.append("\n---\n")
-    if workflow_issues or cms_issues or property_issues:
-        lines.append("Verification completed with discrepancies. See issues above.\n")
-    else:
-        lines.append("Verification completed successfully.\n")
 
-    log_path.write_text("".join(lines), encoding="utf-8")
-    return log_path
+def write_json_report(path: Path, timestamp: str, config: Dict[str, Any], workflow_ids: Iterable[str],
+                      results: Iterable[CheckResult], total_seconds: float, profile: Dict[str, Any] | None) -> Path:
+    results = list(results)
+    report: Dict[str, Any] = {
+        "timestamp": timestamp,
+        "trace": display_path(config["trace"]),
+        "phase_dir": display_path(config["phase_dir"]),
+        "workflow_ids": sorted(set(workflow_ids)),
+        "status": "failed" if any(result.issues for result in results) else "passed",
+        "total_seconds": round(total_seconds, 6),
+        "checks": [
+            {"name": result.name, "title": result.title, "issues": result.issues, **result.stats.to_dict()}
+            for result in results
+        ],
+    }
+    if profile:
+        report["profile"] = profile
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write(json_codec.dumps(report, indent=2))
+        handle.write("\n")
+    return path
+
+
+def write_junit_report(path: Path, timestamp: str, results: Iterable[CheckResult], total_seconds: float) -> Path:
+    results = list(results)
+    suite = ET.Element(
+        "testsuite",
+        name="phase-verification",
+        tests=str(len(results)),
+        failures=str(sum(1 for result in results if result.issues)),
+        errors="0",
+        time=f"{total_seconds:.3f}",
+        timestamp=timestamp,
+    )
+    for result in results:
+        case = ET.SubElement(
+            suite, "testcase", classname="verify_phase", name=result.name, time=f"{result.stats.seconds:.3f}"
+        )
+        if result.issues:
+            failure = ET.SubElement(case, "failure", message=f"{len(result.issues)} discrepancies", type="discrepancy")
+            failure.text = "\n".join(result.issues)
+        stats = result.stats
+        ET.SubElement(case, "system-out").text = (
+            f"thread_seconds={stats.thread_seconds:.3f} files_read={stats.files_read} "
+            f"bytes_parsed={stats.bytes_parsed} cache_hits={stats.cache_hits}"
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+    return path
 
 
-def parse_args() -> argparse.Namespace:
+def _hash_stat(hasher: Any, path: Path) -> None:
+    """Fold a file's size and mtime into the fingerprint (used for large exports)."""
+    try:
+        stat = path.stat()
+    except OSError:
+        hasher.update(f"{path}|missing\n".encode())
+        return
+    hasher.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+
+
+def check_sources() -> List[Path]:
+    """This script and the shared modules whose code decides the verdict."""
+    paths = [Path(__file__).resolve()]
+    for pattern in CHECK_SOURCES:
+        paths.extend(sorted(SHARED_DIR.glob(pattern)))
+    return paths
+
+
+def compute_input_fingerprint(args: argparse.Namespace, trace_path: Path, inputs: PhaseInputs) -> str:
+    """Digest every input the checks read, reusing the already-loaded phase documents."""
+    hasher = hashlib.sha256()
+    hasher.update(f"v{FINGERPRINT_VERSION}|deep={args.deep}\n".encode())
+    for path in check_sources():
+        hasher.update(f"{path.relative_to(SHARED_DIR)}|{hashlib.sha256(path.read_bytes()).hexdigest()}\n".encode())
+    hasher.update(hashlib.sha256(trace_path.read_bytes()).hexdigest().encode())
+
+    # Inventories and mapping keys are hashed from their parsed form, so they are not re-read
+    hasher.update(json.dumps(inputs.inventories, sort_keys=True).encode())
+    for path, mapping in inputs.mappings:
+        hasher.update(f"{path}|{json.dumps({k: sorted(v) for k, v in mapping.items()}, sort_keys=True)}\n".encode())
+
+    for wf_id, export in sorted(inputs.exports.items()):
+        hasher.update(f"workflow {wf_id}\n".encode())
+        if export is not None:
+            _hash_stat(hasher, export)
+    _hash_stat(hasher, args.cms_forms)
+    if args.schema_dir.exists():
+        for path in sorted(args.schema_dir.glob("*.json")):
+            _hash_stat(hasher, path)
+
+    # Module checks only test for directory presence, so fold in which names resolve
+    for name, present in sorted(inputs.modules_present.items()):
+        hasher.update(f"module {name}|{present}\n".encode())
+    return hasher.hexdigest()
+
+
+def result_digest(results: Iterable[CheckResult]) -> str:
+    payload = [[result.name, result.issues] for result in results]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+def load_state(log_dir: Path) -> Dict[str, Any]:
+    path = log_dir / STATE_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        state = json_codec.load_path(path)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(log_dir: Path, state: Dict[str, Any]) -> None:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    (log_dir / STATE_FILENAME).write_text(json_codec.dumps(state, indent=2) + "\n", encoding="utf-8")
+
+
+def _copy_previous_output(state: Dict[str, Any], key: str, destination: Path | None) -> None:
+    """Mirror the reused JSON/JUnit file to an explicitly requested path."""
+    if destination is None or not state.get(key):
+        return
+    source = PROJ_ROOT / state[key] if not Path(state[key]).is_absolute() else Path(state[key])
+    if source.exists() and source.resolve() != destination.resolve():
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, destination)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Verify phase documentation against HubSpot exports")
     parser.add_argument("--phase", choices=PHASES.keys(), help="Predefined phase to verify")
     parser.add_argument("--trace", type=Path, help="Path to trace markdown file")
@@ -272,11 +887,103 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--schema-dir", type=Path, default=DEFAULT_SCHEMA_DIR)
     parser.add_argument("--cms-modules-dir", type=Path, default=DEFAULT_CMS_MODULE_DIR)
     parser.add_argument("--cms-forms", type=Path, default=DEFAULT_CMS_FORMS_PATH)
-    return parser.parse_args()
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Parse referenced workflow exports and check properties, branch filters and association types against schemas",
+    )
+    parser.add_argument("--json", dest="json_path", type=Path, help="JSON results path (default: beside the Markdown log)")
+    parser.add_argument("--junit", dest="junit_path", type=Path, help="JUnit XML results path (default: beside the Markdown log)")
+    parser.add_argument("--force", action="store_true", help="Re-verify and write fresh logs even when inputs are unchanged")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Worker threads for file loads and checks (default: {DEFAULT_JOBS}; 1 runs everything inline)",
+    )
+    instrumentation.add_instrumentation_arguments(
+        parser, profile_help="Write cProfile stats for the checks and attach a summary to the JSON results")
+    return parser.parse_args(argv)
+
+
+def load_phase_inputs(args: argparse.Namespace, phase_dir: Path, workflow_ids: Set[str],
+                      executor: Executor | None) -> PhaseInputs:
+    """Fan out the per-file loads every check (and the fingerprint) depends on."""
+    stats = {name: CheckStats() for name in CHECK_SECTIONS}
+    with wall_clock(stats["workflows"]):
+        exports = resolve_workflow_exports(workflow_ids, args.workflow_dir, stats["workflows"], executor)
+    with wall_clock(stats["properties"]):
+        mappings = load_property_mappings(phase_dir, stats["properties"], executor)
+    with wall_clock(stats["cms_assets"]):
+        inventories = load_asset_inventories(phase_dir, stats["cms_assets"], executor)
+        modules_present = resolve_modules(inventory_module_names(inventories), args.cms_modules_dir, stats["cms_assets"])
+    return PhaseInputs(
+        workflow_ids=workflow_ids,
+        exports=exports,
+        inventories=inventories,
+        mappings=mappings,
+        modules_present=modules_present,
+        stats=stats,
+    )
+
+
+class _Done(Future):
+    """An already-resolved future used when running without a pool."""
 
+    def __init__(self, value: Any):
+        super().__init__()
+        self.set_result(value)
 
-def main() -> int:
-    args = parse_args()
+
+def _submit(executor: Executor | None, func: Callable[..., R], *args: Any, **kwargs: Any) -> "Future[R]":
+    """Submit to the pool, or run inline when there is none.
+
+    Only the main thread calls this; pool tasks never wait on other pool tasks, so a
+    small ``--jobs`` cannot deadlock.
+    """
+    if executor is None:
+        return _Done(func(*args, **kwargs))
+    return executor.submit(func, *args, **kwargs)
+
+
+def _load_forms(forms_path: Path, stats: CheckStats) -> Set[str] | None:
+    with wall_clock(stats):
+        return timed(stats, load_form_names, forms_path, stats)
+
+
+def run_checks(args: argparse.Namespace, phase_dir: Path, inputs: PhaseInputs,
+               executor: Executor | None = None) -> List[CheckResult]:
+    stats = inputs.stats
+    # Remaining per-file loads; the module-level schema cache is warmed so check_properties only hits it
+    forms_future = _submit(executor, _load_forms, args.cms_forms, stats["cms_assets"])
+    objects = sorted({obj.lower() for _, mapping in inputs.mappings for obj in mapping})
+    with wall_clock(stats["properties"]):
+        parallel_map(executor, lambda obj: timed(stats["properties"], get_schema_properties, obj, args.schema_dir,
+                                                 stats["properties"]), objects)
+    index = workflows = None
+    if args.deep:
+        with wall_clock(stats["workflow_content"]):
+            index = build_schema_index(args.schema_dir, stats["workflow_content"], executor)
+            workflows = load_workflow_exports(inputs.exports, stats["workflow_content"], executor)
+    form_names = forms_future.result()
+
+    # Checks only touch preloaded data; results are gathered in CHECK_SECTIONS order
+    futures = [_submit(executor, run_check, "workflows", check_workflows, inputs.workflow_ids, args.workflow_dir,
+                       stats=stats["workflows"], exports=inputs.exports)]
+    if args.deep:
+        futures.append(_submit(executor, run_check, "workflow_content", check_workflows_deep, inputs.workflow_ids,
+                               args.workflow_dir, args.schema_dir, stats=stats["workflow_content"], index=index,
+                               exports=inputs.exports, workflows=workflows))
+    futures.append(_submit(executor, run_check, "cms_assets", check_cms_assets, inputs.inventories, args.cms_modules_dir,
+                           args.cms_forms, stats=stats["cms_assets"], form_names=form_names,
+                           modules_present=inputs.modules_present))
+    futures.append(_submit(executor, run_check, "properties", check_properties, phase_dir, args.schema_dir,
+                           stats=stats["properties"], mappings=inputs.mappings))
+    return [future.result() for future in futures]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
 
     config: dict = {}
     if args.phase:
@@ -288,35 +995,100 @@ def main() -> int:
     if args.log_dir:
         config["log_dir"] = PROJ_ROOT / args.log_dir if not args.log_dir.is_absolute() else args.log_dir
 
-    trace_path = config.get("trace")
-    phase_dir = config.get("phase_dir")
-    log_dir = config.get("log_dir") or (phase_dir / "verification/logs" if phase_dir else PROJ_ROOT)
-
-    if not trace_path or not phase_dir:
+    if not config.get("trace") or not config.get("phase_dir"):
         print("Trace path and phase directory must be specified (either via --phase or explicit arguments)", file=sys.stderr)
         return 2
+    # The checks-only profile is taken (and attached to the report) by verify itself
+    with instrumentation.instrumented(args, "verify_phase", profile=False):
+        return verify(args, config)
+
 
-    workflow_ids = gather_trace_workflow_ids(trace_path)
+def verify(args: argparse.Namespace, config: Dict[str, Any]) -> int:
+    """Verify one phase (``trace``/``phase_dir``/``log_dir`` in ``config``); returns the exit code."""
+    trace_path = config["trace"]
+    phase_dir = config["phase_dir"]
+    log_dir = config.get("log_dir") or phase_dir / "verification/logs"
+
+    with instrumentation.span("scan"):
+        workflow_ids = gather_trace_workflow_ids(trace_path)
     if args.phase in {"approval", "billing"} and not workflow_ids:
         print("Warning: no workflow IDs detected in trace; ensure the JSON source includes workflow references.")
     if args.phase in {"approval", "billing"} and not workflow_ids:
         print("No workflow ids found in trace -- ensure trace is populated before running verification.")
 
-    workflow_issues = check_workflows(workflow_ids, args.workflow_dir)
-    cms_issues = check_cms_assets(load_asset_inventories(phase_dir), args.cms_modules_dir, args.cms_forms)
-    property_issues = check_properties(phase_dir, args.schema_dir)
-
-    log_path = write_log(log_dir, workflow_ids, workflow_issues, cms_issues, property_issues)
-    print(f"Verification log written to {log_path.relative_to(PROJ_ROOT)}")
-    if workflow_issues or cms_issues or property_issues:
-        print("Discrepancies detected. See log for details.")
-        return 1
-    return 0
+    # --profile needs a real run to measure, so it bypasses reuse like --force. The profile is
+    # kept to the checks and taken inline, so it reads the same whatever --jobs is.
+    fresh = args.force or args.profile
+    jobs = 1 if args.profile else max(1, args.jobs)
+    executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="verify") if jobs > 1 else None
+    try:
+        start = time.perf_counter()
+        with instrumentation.span("parse"):
+            inputs = load_phase_inputs(args, phase_dir, workflow_ids, executor)
+            state = load_state(log_dir)
+            fingerprint = compute_input_fingerprint(args, trace_path, inputs)
+        if not fresh and state.get("fingerprint") == fingerprint and "exit_code" in state:
+            _copy_previous_output(state, "json", args.json_path)
+            _copy_previous_output(state, "junit", args.junit_path)
+            print(f"Inputs unchanged since {state.get('timestamp')}; reusing {state.get('log')}")
+            return int(state["exit_code"])
 
+        timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+        stem = log_dir / f"phase-verification-{timestamp}"
+        profiler = cProfile.Profile() if args.profile else None
+        if profiler:
+            profiler.enable()
+        try:
+            with instrumentation.span("check"):
+                results = run_checks(args, phase_dir, inputs, executor)
+        finally:
+            if profiler:
+                profiler.disable()
+        total_seconds = time.perf_counter() - start
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    exit_code = 1 if any(result.issues for result in results) else 0
+    digest = result_digest(results)
 
-if __name__ == "__main__":
-    raise SystemExit(main())
+    for result in results:
+        print(f"  {result.name}: {result.stats.seconds:.3f}s, {result.stats.files_read} files, {len(result.issues)} issues")
 
+    if not fresh and state.get("result") == digest and state.get("log"):
+        _copy_previous_output(state, "json", args.json_path)
+        _copy_previous_output(state, "junit", args.junit_path)
+        state.update({"fingerprint": fingerprint, "checked_at": timestamp})
+        save_state(log_dir, state)
+        print(f"Inputs changed but results match {state['log']}; no new log written.")
+    else:
+        profile = instrumentation.write_profile([profiler], stem.with_suffix(".pstats")) if profiler else None
+        if profile:
+            instrumentation.attach("profile", profile)
+        with instrumentation.span("write"):
+            log_path = write_log(stem.with_suffix(".md"), timestamp, workflow_ids, results)
+            json_path = write_json_report(
+                args.json_path or stem.with_suffix(".json"), timestamp, config, workflow_ids, results, total_seconds, profile
+            )
+            junit_path = write_junit_report(args.junit_path or stem.with_suffix(".junit.xml"), timestamp, results, total_seconds)
+        save_state(log_dir, {
+            "fingerprint": fingerprint,
+            "result": digest,
+            "exit_code": exit_code,
+            "timestamp": timestamp,
+            "checked_at": timestamp,
+            "log": display_path(log_path),
+            "json": display_path(json_path),
+            "junit": display_path(junit_path),
+        })
+        print(f"Verification log written to {display_path(log_path)}")
+        print(f"Results written to {display_path(json_path)} and {display_path(junit_path)}")
+        if profile:
+            print(f"Profile written to {profile['pstats']}")
 
+    if exit_code:
+        print("Discrepancies detected. See log for details.")
+    return exit_code
 
 
+if __name__ == "__main__":
+    raise SystemExit(main())
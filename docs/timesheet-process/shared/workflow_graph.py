@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""Action graph model for HubSpot workflow exports.
+
+Legacy exports nest actions under ``LIST_BRANCH``/``acceptActions``/``rejectActions`` and
+run each action list top to bottom; v4 flows keep a flat ``actions`` list linked by
+``connection.nextActionId`` and branch connections. Both are parsed once into nodes and
+labelled edges. Per-node summaries (longest path, worst-case delay, emails on the way) are
+memoized in one post-order pass, so statistics and outlines stay linear in the action count
+and cycles are cut at back edges.
+
+Usage:
+    python3 analysis/timesheet_process/shared/workflow_graph.py data/raw/workflows/workflow-567500453.json --depth 4
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import json_codec
+
+NESTED_ACTION_KEYS = (("acceptActions", "yes"), ("rejectActions", "no"), ("actions", "then"))
+BRANCH_KEYS = ("branches", "listBranches", "staticBranches")
+# v4 action type IDs with a known legacy equivalent
+V4_ACTION_TYPES = {
+    "0-1": "DELAY",
+    "0-3": "TASK",
+    "0-4": "SEND_EMAIL",
+    "0-5": "SET_PROPERTY",
+}
+EMAIL_TYPES = {"SEND_EMAIL", "EMAIL", "EMAIL_NOTIFICATION"}
+TIME_UNIT_MS = {"SECONDS": 1000, "MINUTES": 60_000, "HOURS": 3_600_000, "DAYS": 86_400_000, "WEEKS": 604_800_000}
+
+
+@dataclass
+class ActionNode:
+    key: str
+    action_id: str
+    kind: str
+    label: str
+    detail: str = ""
+    delay_ms: int = 0
+    emails: int = 0
+
+
+@dataclass
+class Summary:
+    """Memoized totals for the subgraph reachable from a node, taking the worst branch."""
+
+    longest: int = 0
+    delay_ms: int = 0
+    emails: int = 0
+
+
+@dataclass
+class GraphStats:
+    actions: int = 0
+    edges: int = 0
+    branches: int = 0
+    max_fan_out: int = 0
+    longest_path: int = 0
+    total_delay_ms: int = 0
+    max_path_delay_ms: int = 0
+    emails_sent: int = 0
+    max_path_emails: int = 0
+    cycles: int = 0
+    unreachable: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"{self.actions} actions · longest path {self.longest_path} · {self.branches} branch points "
+            f"(max fan-out {self.max_fan_out}) · delays {format_delay(self.total_delay_ms)} total / "
+            f"{format_delay(self.max_path_delay_ms)} worst path · {self.emails_sent} email sends"
+            + (f" · {self.cycles} cycle edge(s)" if self.cycles else "")
+            + (f" · {self.unreachable} unreachable" if self.unreachable else "")
+        )
+
+
+def format_delay(ms: int) -> str:
+    if not ms:
+        return "0"
+    for unit, size in (("d", 86_400_000), ("h", 3_600_000), ("m", 60_000), ("s", 1000)):
+        if ms >= size:
+            return f"{ms / size:g}{unit}"
+    return f"{ms}ms"
+
+
+def _as_int(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def describe_action(action: Dict[str, Any]) -> Tuple[str, str, int, int]:
+    """Return (kind, detail, delay ms, emails) for one legacy or v4 action."""
+    fields = action.get("fields") if isinstance(action.get("fields"), dict) else {}
+    kind = action.get("type") or V4_ACTION_TYPES.get(str(action.get("actionTypeId")), "") or str(action.get("actionTypeId", "?"))
+    if kind == "SINGLE_CONNECTION" and action.get("actionTypeId"):
+        kind = V4_ACTION_TYPES.get(str(action["actionTypeId"]), str(action["actionTypeId"]))
+    details: List[str] = []
+    delay = emails = 0
+    if kind in EMAIL_TYPES:
+        email_id = action.get("emailId") or action.get("email") or fields.get("content_id")
+        if email_id:
+            details.append(f"emailId={email_id}")
+        if action.get("recipientType"):
+            details.append(f"recipient={action['recipientType']}")
+        emails = 1
+    elif kind == "SET_PROPERTY":
+        details.append(f"property={action.get('propertyName') or fields.get('property_name')}")
+        value = action.get("propertyValue", fields.get("value"))
+        if isinstance(value, dict):
+            value = value.get("staticValue", value)
+        details.append(f"value={value}")
+    elif kind in {"DELAY", "DELAY_UNTIL"}:
+        delay = _as_int(action.get("delayMillis") or action.get("delayMilliseconds"))
+        if not delay and fields.get("delta") is not None:
+            delay = _as_int(fields["delta"]) * TIME_UNIT_MS.get(str(fields.get("time_unit", "")).upper(), 0)
+        details.append(f"delay={delay}ms")
+    elif kind == "WEBHOOK":
+        details.append(action.get("webhookUrl", ""))
+    return kind, ", ".join(filter(None, details)), delay, emails
+
+
+def _next_id(connection: Any) -> str | None:
+    if isinstance(connection, dict):
+        target = connection.get("nextActionId") or (connection.get("connection") or {}).get("nextActionId")
+        return str(target) if target is not None else None
+    return None
+
+
+def _branch_label(branch: Dict[str, Any], index: int) -> str:
+    return str(branch.get("branchName") or branch.get("branchValue") or branch.get("name") or f"branch {index + 1}")
+
+
+class WorkflowGraph:
+    """Nodes and labelled edges for one workflow export."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, ActionNode] = {}
+        self.edges: Dict[str, List[Tuple[str, str]]] = {}
+        self.roots: List[str] = []
+        self._summaries: Dict[str, Summary] | None = None
+        self._back_edges = 0
+
+    # -- construction -----------------------------------------------------
+
+    @classmethod
+    def from_workflow(cls, workflow: Dict[str, Any]) -> "WorkflowGraph":
+        graph = cls()
+        actions = [a for a in workflow.get("actions") or [] if isinstance(a, dict)]
+        linked = "startActionId" in workflow or any(
+            "connection" in a or "actionTypeId" in a for a in actions
+        )
+        if linked:
+            graph._add_linked(actions, workflow.get("startActionId"))
+        else:
+            graph.roots = graph._add_sequence(actions)[:1]
+        return graph
+
+    def _new_node(self, action: Dict[str, Any]) -> str:
+        key = f"n{len(self.nodes)}"
+        action_id = str(action.get("actionId") or action.get("actionGuid") or action.get("id") or key)
+        kind, detail, delay, emails = describe_action(action)
+        label = action.get("name") or kind
+        self.nodes[key] = ActionNode(key, action_id, kind, str(label), detail, delay, emails)
+        self.edges[key] = []
+        return key
+
+    def _add_sequence(self, actions: Iterable[Any]) -> List[str]:
+        """Add a legacy action list (run in order) and its nested lists; return the top-level keys."""
+        keys: List[str] = []
+        # Explicit stack of (parent key, edge label, action list) keeps deep nesting off the C stack
+        pending: List[Tuple[str | None, str, List[Any]]] = [(None, "", list(actions))]
+        while pending:
+            parent, label, items = pending.pop()
+            previous = parent
+            edge_label = label
+            for action in items:
+                if not isinstance(action, dict):
+                    continue
+                key = self._new_node(action)
+                if parent is None:
+                    keys.append(key)
+                if previous is not None:
+                    self.edges[previous].append((edge_label, key))
+                previous, edge_label = key, ""
+                nested: List[Tuple[str | None, str, List[Any]]] = []
+                for nested_key, nested_label in NESTED_ACTION_KEYS:
+                    if isinstance(action.get(nested_key), list):
+                        nested.append((key, nested_label, action[nested_key]))
+                for branch_key in BRANCH_KEYS:
+                    branches = action.get(branch_key)
+                    for index, branch in enumerate(branches if isinstance(branches, list) else []):
+                        if isinstance(branch, dict) and isinstance(branch.get("actions"), list):
+                            nested.append((key, _branch_label(branch, index), branch["actions"]))
+                default = action.get("defaultBranch")
+                if isinstance(default, dict) and isinstance(default.get("actions"), list):
+                    nested.append((key, "default", default["actions"]))
+                # Reversed so branches pop (and get their edges) in export order
+                pending.extend(reversed(nested))
+        return keys
+
+    def _add_linked(self, actions: List[Dict[str, Any]], start: Any) -> None:
+        by_id: Dict[str, str] = {}
+        for action in actions:
+            key = self._new_node(action)
+            by_id.setdefault(self.nodes[key].action_id, key)
+
+        targeted: set[str] = set()
+        for key, action in zip(list(self.nodes), actions):
+            links: List[Tuple[str, str | None]] = [("", _next_id(action.get("connection")))]
+            for branch_key in BRANCH_KEYS:
+                branches = action.get(branch_key)
+                for index, branch in enumerate(branches if isinstance(branches, list) else []):
+                    if isinstance(branch, dict):
+                        links.append((_branch_label(branch, index), _next_id(branch.get("connection") or branch)))
+            if isinstance(action.get("defaultBranch"), dict):
+                links.append((action.get("defaultBranchName") or "default", _next_id(action["defaultBranch"])))
+            for label, target_id in links:
+                target = by_id.get(target_id) if target_id else None
+                if target is not None:
+                    self.edges[key].append((label, target))
+                    targeted.add(target)
+
+        if start is not None and str(start) in by_id:
+            self.roots = [by_id[str(start)]]
+        else:
+            self.roots = [key for key in self.nodes if key not in targeted][:1] or list(self.nodes)[:1]
+
+    # -- analysis ---------------------------------------------------------
+
+    def summaries(self) -> Dict[str, Summary]:
+        """Post-order DP over every node; back edges (cycles) are ignored and counted."""
+        if self._summaries is not None:
+            return self._summaries
+        done: Dict[str, Summary] = {}
+        on_stack: set[str] = set()
+        back_edges = 0
+        for root in [*self.roots, *self.nodes]:
+            if root in done:
+                continue
+            stack: List[Tuple[str, int]] = [(root, 0)]
+            on_stack.add(root)
+            while stack:
+                key, index = stack[-1]
+                children = self.edges[key]
+                if index < len(children):
+                    stack[-1] = (key, index + 1)
+                    child = children[index][1]
+                    if child in on_stack:
+                        back_edges += 1
+                    elif child not in done:
+                        on_stack.add(child)
+                        stack.append((child, 0))
+                    continue
+                stack.pop()
+                on_stack.discard(key)
+                node = self.nodes[key]
+                best = Summary()
+                for _, child in children:
+                    below = done.get(child)
+                    if below is None:
+                        continue  # back edge
+                    best.longest = max(best.longest, below.longest)
+                    best.delay_ms = max(best.delay_ms, below.delay_ms)
+                    best.emails = max(best.emails, below.emails)
+                done[key] = Summary(best.longest + 1, best.delay_ms + node.delay_ms, best.emails + node.emails)
+        self._summaries, self._back_edges = done, back_edges
+        return done
+
+    def stats(self) -> GraphStats:
+        summaries = self.summaries()
+        reachable = self._reachable()
+        stats = GraphStats(
+            actions=len(self.nodes),
+            edges=sum(len(children) for children in self.edges.values()),
+            cycles=self._back_edges,
+            unreachable=len(self.nodes) - len(reachable),
+        )
+        for key, node in self.nodes.items():
+            fan_out = len(self.edges[key])
+            if fan_out > 1:
+                stats.branches += 1
+            stats.max_fan_out = max(stats.max_fan_out, fan_out)
+            stats.total_delay_ms += node.delay_ms
+            stats.emails_sent += node.emails
+        for root in self.roots:
+            summary = summaries[root]
+            stats.longest_path = max(stats.longest_path, summary.longest)
+            stats.max_path_delay_ms = max(stats.max_path_delay_ms, summary.delay_ms)
+            stats.max_path_emails = max(stats.max_path_emails, summary.emails)
+        return stats
+
+    def _reachable(self) -> set[str]:
+        seen = set(self.roots)
+        stack = list(self.roots)
+        while stack:
+            for _, child in self.edges[stack.pop()]:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    # -- rendering --------------------------------------------------------
+
+    def outline(self, max_depth: int = 8, indent: str = "  ") -> List[str]:
+        """Markdown bullet outline; each node is expanded once, repeats link back by action ID."""
+        summaries = self.summaries()
+        lines: List[str] = []
+        expanded: set[str] = set()
+        # Legacy lists are chains, so a chain step stays at its parent's depth
+        stack: List[Tuple[str, int, str]] = [(root, 0, "") for root in reversed(self.roots)]
+        while stack:
+            key, depth, label = stack.pop()
+            node = self.nodes[key]
+            pad = indent * depth
+            prefix = f"[{label}] " if label else ""
+            if key in expanded:
+                lines.append(f"{pad}- {prefix}↩ `{node.action_id}` (already shown)")
+                continue
+            if depth >= max_depth:
+                lines.append(f"{pad}- {prefix}… `{node.action_id}` and up to {summaries[key].longest - 1} more step(s)")
+                continue
+            expanded.add(key)
+            detail = f" → {node.detail}" if node.detail else ""
+            lines.append(f"{pad}- {prefix}`{node.action_id}` · {node.label} ({node.kind}){detail}")
+            children = self.edges[key]
+            branching = len(children) > 1 or any(edge_label for edge_label, _ in children)
+            if branching:
+                # Labelled branches first, then the unlabelled continuation as "next"
+                ordered = [edge for edge in children if edge[0]] + [("next", child) for edge_label, child in children if not edge_label]
+                for edge_label, child in reversed(ordered):
+                    stack.append((child, depth + 1, edge_label))
+            else:
+                for _, child in reversed(children):
+                    stack.append((child, depth, ""))
+        return lines
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Print the action outline and statistics for a workflow export")
+    parser.add_argument("export", type=Path, help="Workflow export JSON")
+    parser.add_argument("--depth", type=int, default=8, help="Maximum branch depth to expand")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    workflow = json_codec.load_path(args.export)
+    graph = WorkflowGraph.from_workflow(workflow)
+    print(f"{workflow.get('name', args.export.stem)}: {graph.stats().describe()}")
+    print("\n".join(graph.outline(args.depth)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Manifest-backed lookup of HubSpot workflow exports by workflow ID.
+
+The export directory is scanned once; each file's name and top-level metadata (id, name,
+objectType, type, action count) are recorded in a JSON manifest that is reused until the
+file's size or mtime changes. IDs resolve through an exact lookup ordered by export kind
+(``workflow-`` before ``v4-flow-``), and full workflow JSON is only parsed on ``load``.
+
+Usage:
+    # Rebuild the manifest and print a summary
+    python3 analysis/timesheet_process/shared/workflow_repository.py
+
+    # Show the metadata and candidate files for specific workflows
+    python3 analysis/timesheet_process/shared/workflow_repository.py 567500453 1680618036
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import json_codec
+
+MANIFEST_VERSION = 1
+
+# Lower rank wins: legacy workflow- exports carry the enriched action metadata
+KIND_PREFIXES = (("workflow", "workflow-"), ("v4-flow", "v4-flow-"), ("v4-workflow", "v4-workflow-"))
+KIND_RANK = {"workflow": 0, "v4-flow": 1, "v4-workflow": 2, "other": 3}
+ID_PATTERN = re.compile(r"(?<!\d)(\d{6,})(?!\d)")
+
+
+@dataclass
+class WorkflowEntry:
+    """Manifest record for one export file."""
+
+    file: str
+    kind: str
+    ids: List[str]
+    size: int
+    mtime_ns: int
+    name: str | None = None
+    object_type: str | None = None
+    type: str | None = None
+    action_count: int = 0
+    error: str | None = None
+
+
+@dataclass
+class ScanStats:
+    files: int = 0
+    parsed: int = 0
+    reused: int = 0
+    removed: int = 0
+
+
+def export_kind(filename: str) -> str:
+    for kind, prefix in KIND_PREFIXES:
+        if filename.startswith(prefix):
+            return kind
+    return "other"
+
+
+def read_json(path: Path) -> Any:
+    return json_codec.load_path(path)
+
+
+def read_entry(path: Path, loader: Callable[[Path], Any] = read_json) -> WorkflowEntry:
+    """Parse one export and keep only the metadata the manifest needs."""
+    stat = path.stat()
+    ids = ID_PATTERN.findall(path.stem)
+    entry = WorkflowEntry(file=path.name, kind=export_kind(path.name), ids=ids, size=stat.st_size,
+                          mtime_ns=stat.st_mtime_ns)
+    try:
+        data = loader(path)
+    except (OSError, ValueError) as exc:
+        entry.error = str(exc)
+        return entry
+    if not isinstance(data, dict):
+        entry.error = "top-level JSON is not an object"
+        return entry
+    if not ids and data.get("id") is not None:
+        # Fall back to the embedded ID only when the filename carries none
+        entry.ids = [str(data["id"])]
+    entry.name = data.get("name")
+    entry.object_type = data.get("objectType") or data.get("objectTypeId")
+    entry.type = data.get("type")
+    actions = data.get("actions")
+    entry.action_count = len(actions) if isinstance(actions, list) else 0
+    return entry
+
+
+class WorkflowRepository:
+    """Exact workflow-ID lookups over a scanned, persisted export manifest."""
+
+    def __init__(self, workflow_dir: Path, manifest_path: Path | None = None,
+                 loader: Callable[[Path], Any] = read_json):
+        self.workflow_dir = workflow_dir
+        self.loader = loader
+        self.manifest_path = manifest_path or workflow_dir.parent / ".cache" / f"{workflow_dir.name}-manifest.json"
+        self.entries: Dict[str, WorkflowEntry] = {}
+        self.by_id: Dict[str, List[str]] = {}
+        self.scan_stats = ScanStats()
+        self._documents: Dict[str, Dict[str, Any] | None] = {}
+        self._lock = threading.Lock()
+        self._scanned = False
+
+    # -- manifest -----------------------------------------------------------
+
+    def _read_manifest(self) -> Dict[str, WorkflowEntry]:
+        try:
+            data = json_codec.load_path(self.manifest_path)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("workflow_dir") != str(self.workflow_dir):
+            return {}
+        entries: Dict[str, WorkflowEntry] = {}
+        for raw in data.get("files", []):
+            try:
+                entry = WorkflowEntry(**raw)
+            except TypeError:
+                continue
+            entries[entry.file] = entry
+        return entries
+
+    def _write_manifest(self) -> None:
+        payload = {
+            "version": MANIFEST_VERSION,
+            "workflow_dir": str(self.workflow_dir),
+            "files": [asdict(self.entries[name]) for name in sorted(self.entries)],
+            "index": self.by_id,
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            tmp_path.write_text(json_codec.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            tmp_path.replace(self.manifest_path)
+        except OSError:
+            pass  # read-only data checkout; the in-memory index still works
+
+    def scan(self, persist: bool = True) -> ScanStats:
+        """Scan the export directory once, reusing manifest entries whose size/mtime match."""
+        with self._lock:
+            if self._scanned:
+                return self.scan_stats
+            previous = self._read_manifest()
+            stats = ScanStats()
+            entries: Dict[str, WorkflowEntry] = {}
+            paths = sorted(self.workflow_dir.glob("*.json")) if self.workflow_dir.exists() else []
+            for path in paths:
+                stats.files += 1
+                cached = previous.pop(path.name, None)
+                stat = path.stat()
+                if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                    entries[path.name] = cached
+                    stats.reused += 1
+                else:
+                    entries[path.name] = read_entry(path, self.loader)
+                    stats.parsed += 1
+            stats.removed = len(previous)
+
+            by_id: Dict[str, List[str]] = {}
+            for entry in entries.values():
+                for wf_id in entry.ids:
+                    by_id.setdefault(wf_id, []).append(entry.file)
+            for wf_id, files in by_id.items():
+                files.sort(key=lambda name: (KIND_RANK[entries[name].kind], name))
+
+            self.entries, self.by_id, self.scan_stats = entries, by_id, stats
+            self._scanned = True
+            if persist and (stats.parsed or stats.removed or not self.manifest_path.exists()):
+                self._write_manifest()
+            return stats
+
+    # -- lookups ------------------------------------------------------------
+
+    def candidates(self, workflow_id: str) -> List[WorkflowEntry]:
+        self.scan()
+        return [self.entries[name] for name in self.by_id.get(str(workflow_id), [])]
+
+    def entry(self, workflow_id: str) -> WorkflowEntry | None:
+        matches = self.candidates(workflow_id)
+        return matches[0] if matches else None
+
+    def path(self, workflow_id: str) -> Path | None:
+        entry = self.entry(workflow_id)
+        return self.workflow_dir / entry.file if entry else None
+
+    def load(self, workflow_id: str) -> Dict[str, Any] | None:
+        """Parse the preferred export on first use and memoize it."""
+        entry = self.entry(workflow_id)
+        if entry is None or entry.error:
+            return None
+        return self.load_file(entry.file)
+
+    def is_loaded(self, filename: str) -> bool:
+        with self._lock:
+            return filename in self._documents
+
+    def load_file(self, filename: str) -> Dict[str, Any] | None:
+        """Parse one export file by name on first use and memoize it."""
+        with self._lock:
+            if filename in self._documents:
+                return self._documents[filename]
+        try:
+            data = self.loader(self.workflow_dir / filename)
+        except (OSError, ValueError):
+            data = None
+        with self._lock:
+            return self._documents.setdefault(filename, data if isinstance(data, dict) else None)
+
+    def ids(self) -> List[str]:
+        self.scan()
+        return sorted(self.by_id)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build and query the workflow export manifest")
+    parser.add_argument("workflow_ids", nargs="*", help="Workflow IDs to resolve")
+    parser.add_argument("--workflow-dir", type=Path, help="Workflow exports (default: the data layout's workflows)")
+    parser.add_argument("--manifest", type=Path, help="Manifest path (default: <data/raw>/.cache/workflows-manifest.json)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    from hjps import default_layout  # hjps imports this module, so the layout is resolved here
+
+    repo = WorkflowRepository(args.workflow_dir or default_layout().workflows, args.manifest)
+    stats = repo.scan()
+    print(f"{stats.files} exports ({stats.parsed} parsed, {stats.reused} reused, {stats.removed} removed) → {repo.manifest_path}")
+    missing = 0
+    for wf_id in args.workflow_ids:
+        matches = repo.candidates(wf_id)
+        if not matches:
+            print(f"{wf_id}: not found")
+            missing += 1
+            continue
+        best = matches[0]
+        print(f"{wf_id}: {best.file} · {best.name} · {best.object_type} ({best.type}) · {best.action_count} actions")
+        for other in matches[1:]:
+            print(f"    also {other.file}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())